@@ -0,0 +1,79 @@
+"""
+Compares the wall-clock time of ``quantize()`` under each job handler.
+
+Usage::
+
+    python benchmarks/job_handlers.py [--events N] [--repeats N] [--workers N]
+"""
+
+import argparse
+import random
+import time
+
+import abjad
+
+import nauert
+
+
+def make_q_event_sequence(event_count, seed=0):
+    """
+    Makes q-event sequence of ``event_count`` random durations.
+    """
+    random_ = random.Random(seed)
+    durations = [
+        random_.choice([90, 100, 125, 150, 200, 250, 333, 400, 500])
+        for _ in range(event_count)
+    ]
+    return nauert.QEventSequence.from_millisecond_durations(durations)
+
+
+def time_job_handler(q_event_sequence, job_handler, repeats, compact_q_grids):
+    """
+    Gets best time of ``repeats`` calls to ``quantize()`` and the LilyPond
+    string of the result.
+    """
+    best, string = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        voice = nauert.quantize(
+            q_event_sequence,
+            job_handler=job_handler,
+            compact_q_grids=compact_q_grids,
+        )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        string = abjad.lilypond(voice)
+    return best, string
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--compact-q-grids", action="store_true")
+    arguments = parser.parse_args()
+    q_event_sequence = make_q_event_sequence(arguments.events)
+    pooled_job_handler = nauert.PooledJobHandler(arguments.workers)
+    job_handlers = [
+        nauert.SerialJobHandler(),
+        nauert.ParallelJobHandler(),
+        pooled_job_handler,
+        nauert.ThreadedJobHandler(arguments.workers),
+    ]
+    strings = set()
+    with pooled_job_handler:
+        for job_handler in job_handlers:
+            best, string = time_job_handler(
+                q_event_sequence,
+                job_handler,
+                arguments.repeats,
+                arguments.compact_q_grids,
+            )
+            strings.add(string)
+            print(f"{type(job_handler).__name__:<20} {best:8.3f} s")
+    assert len(strings) == 1, "job handlers disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Times each stage of the quantization pipeline and measures its peak memory.
+
+Usage::
+
+    python benchmarks/pipeline.py [--events N,N,...] [--schemas NAME,...]
+        [--benchmarks NAME,...] [--repeats N] [--output PATH]
+
+Writes one JSON object per benchmark, schema and event count, one per line,
+so that results can be appended to a file and compared across releases. Each
+object holds the best wall-clock time of ``--repeats`` runs in seconds and
+the peak memory allocated by one further run, traced with ``tracemalloc``, in
+bytes. Setup is excluded from both.
+
+The default event counts stay below a minute on a laptop; pass
+``--events 10,100,1000,10000,100000`` for the full range.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import abjad
+
+import nauert
+
+SCHEMAS = {
+    "beatwise": nauert.BeatwiseQSchema,
+    "measurewise": nauert.MeasurewiseQSchema,
+}
+
+
+def make_q_event_sequence(event_count, seed=0):
+    """
+    Makes q-event sequence of ``event_count`` random pitched and silent
+    q-events.
+
+    Durations include very short values, so that some beats hold several
+    q-events on one leaf and exercise the grace handlers.
+    """
+    random_ = random.Random(seed)
+    pairs = []
+    for _ in range(event_count):
+        duration = random_.choice([20, 90, 100, 125, 150, 200, 250, 333, 400, 500])
+        pitch = None if random_.random() < 0.1 else random_.randrange(-12, 24)
+        pairs.append((duration, pitch))
+    return nauert.QEventSequence.from_millisecond_pitch_pairs(pairs)
+
+
+def make_q_target(q_event_sequence, schema):
+    """
+    Makes q-target of ``schema`` spanning ``q_event_sequence``.
+    """
+    return SCHEMAS[schema]()(q_event_sequence.duration_in_ms)
+
+
+def make_jobs(q_event_sequence, schema):
+    """
+    Makes q-target and its quantization jobs.
+    """
+    q_target = make_q_target(q_event_sequence, schema)
+    jobs = q_target._make_jobs(q_event_sequence, nauert.DistanceHeuristic())
+    return q_target, jobs
+
+
+def make_searched_q_target(q_event_sequence, schema):
+    """
+    Makes q-target whose beats hold the q-grids found by their jobs.
+    """
+    q_target, jobs = make_jobs(q_event_sequence, schema)
+    for job in jobs:
+        job()
+        q_target.beats[job.job_id]._q_grids = job.q_grids
+    return q_target
+
+
+def make_selected_q_target(q_event_sequence, schema):
+    """
+    Makes q-target ready to be notated.
+    """
+    q_target = make_searched_q_target(q_event_sequence, schema)
+    nauert.DistanceHeuristic()(q_target.beats)
+    q_target._shift_downbeat_q_events_to_next_q_grid()
+    q_target._regroup_q_grid_with_unnecessary_divisions()
+    return q_target
+
+
+def setup_fit_q_events(q_event_sequence, schema):
+    _, jobs = make_jobs(q_event_sequence, schema)
+
+    def run():
+        for job in jobs:
+            nauert.QGrid().fit_q_events(job.q_event_proxies)
+
+    return run
+
+
+def setup_search_tree(q_event_sequence, schema):
+    _, jobs = make_jobs(q_event_sequence, schema)
+    pairs = []
+    for job in jobs:
+        q_grid = nauert.QGrid()
+        q_grid.fit_q_events(job.q_event_proxies)
+        pairs.append((job.search_tree, q_grid))
+
+    def run():
+        for search_tree, q_grid in pairs:
+            search_tree(q_grid)
+
+    return run
+
+
+def setup_quantization_job(q_event_sequence, schema):
+    _, jobs = make_jobs(q_event_sequence, schema)
+
+    def run():
+        for job in jobs:
+            job()
+
+    return run
+
+
+def setup_distance_heuristic(q_event_sequence, schema):
+    q_target = make_searched_q_target(q_event_sequence, schema)
+    heuristic = nauert.DistanceHeuristic()
+
+    def run():
+        heuristic(q_target.beats)
+
+    return run
+
+
+def setup_notate(q_event_sequence, schema):
+    q_target = make_selected_q_target(q_event_sequence, schema)
+    grace_handler = nauert.ConcatenatingGraceHandler()
+    attack_point_optimizer = nauert.NullAttackPointOptimizer()
+
+    def run():
+        q_target._notate(
+            grace_handler=grace_handler,
+            attack_point_optimizer=attack_point_optimizer,
+        )
+
+    return run
+
+
+def make_attack_point_optimizer_setup(class_):
+    def setup(q_event_sequence, schema):
+        if schema == "beatwise" and issubclass(
+            class_, nauert.MeasurewiseAttackPointOptimizer
+        ):
+            return None
+        q_target = make_selected_q_target(q_event_sequence, schema)
+        voice = q_target._notate(
+            grace_handler=nauert.ConcatenatingGraceHandler(),
+            attack_point_optimizer=nauert.NullAttackPointOptimizer(),
+        )
+        attack_point_optimizer = class_()
+
+        def run():
+            if schema == "beatwise":
+                attack_point_optimizer(voice)
+                return
+            for measure, item in zip(voice, q_target.items, strict=True):
+                q_target._optimize_measure(measure, item, attack_point_optimizer)
+
+        return run
+
+    return setup
+
+
+def make_grace_handler_setup(class_):
+    def setup(q_event_sequence, schema):
+        q_target = make_selected_q_target(q_event_sequence, schema)
+        groups = []
+        for beat in q_target.beats:
+            for leaf in beat.q_grid.leaves[:-1]:
+                if leaf.q_event_proxies:
+                    groups.append([_.q_event for _ in leaf.q_event_proxies])
+        grace_handler = class_()
+
+        def run():
+            for q_events in groups:
+                grace_handler(q_events)
+
+        return run
+
+    return setup
+
+
+BENCHMARKS = {
+    "QGrid.fit_q_events": setup_fit_q_events,
+    "SearchTree.__call__": setup_search_tree,
+    "QuantizationJob.__call__": setup_quantization_job,
+    "DistanceHeuristic": setup_distance_heuristic,
+    "QTarget._notate": setup_notate,
+}
+for _class in (
+    nauert.MeasurewiseAttackPointOptimizer,
+    nauert.NaiveAttackPointOptimizer,
+    nauert.NullAttackPointOptimizer,
+):
+    BENCHMARKS[_class.__name__] = make_attack_point_optimizer_setup(_class)
+for _class in (
+    nauert.CollapsingGraceHandler,
+    nauert.ConcatenatingGraceHandler,
+    nauert.DiscardingGraceHandler,
+):
+    BENCHMARKS[_class.__name__] = make_grace_handler_setup(_class)
+
+
+def measure(setup, q_event_sequence, schema, repeats):
+    """
+    Gets best time of ``repeats`` runs and peak memory of one traced run, or
+    none when the benchmark does not apply to ``schema``.
+    """
+    best = None
+    for _ in range(repeats):
+        run = setup(q_event_sequence, schema)
+        if run is None:
+            return None
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    run = setup(q_event_sequence, schema)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--events", default="10,100,1000")
+    parser.add_argument("--schemas", default=",".join(SCHEMAS))
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    arguments = parser.parse_args()
+    event_counts = [int(_) for _ in arguments.events.split(",")]
+    schemas = arguments.schemas.split(",")
+    names = arguments.benchmarks.split(",")
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name!r}")
+    for schema in schemas:
+        if schema not in SCHEMAS:
+            parser.error(f"unknown schema: {schema!r}")
+    file = sys.stdout if arguments.output is None else open(arguments.output, "a")
+    environment = {
+        "abjad": abjad.__version__,
+        "nauert": nauert.__version__,
+        "python": platform.python_version(),
+    }
+    try:
+        for event_count in event_counts:
+            q_event_sequence = make_q_event_sequence(event_count, arguments.seed)
+            for schema in schemas:
+                for name in names:
+                    result = measure(
+                        BENCHMARKS[name], q_event_sequence, schema, arguments.repeats
+                    )
+                    if result is None:
+                        continue
+                    seconds, peak_bytes = result
+                    record = {
+                        "benchmark": name,
+                        "schema": schema,
+                        "events": event_count,
+                        "seconds": seconds,
+                        "peak_bytes": peak_bytes,
+                        **environment,
+                    }
+                    print(json.dumps(record), file=file, flush=True)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+
+if __name__ == "__main__":
+    main()
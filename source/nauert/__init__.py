@@ -16,22 +16,27 @@ from .gracehandlers import (
     GraceHandler,
 )
 from .heuristics import DistanceHeuristic, Heuristic
+from .incrementalquantizer import IncrementalQuantizer
+from .jobcaches import JobCache, MemoryJobCache, SqliteJobCache
 from .jobhandlers import (
     JobHandler,
     ParallelJobHandler,
     ParallelJobHandlerWorker,
+    PooledJobHandler,
     SerialJobHandler,
+    ThreadedJobHandler,
 )
 from .qeventproxy import QEventProxy
 from .qevents import PitchedQEvent, QEvent, SilentQEvent, TerminalQEvent
 from .qeventsequence import QEventSequence
-from .qgrid import QGrid, QGridContainer, QGridLeaf
+from .qgrid import CompactQGrid, QGrid, QGridContainer, QGridLeaf
 from .qschemaitems import BeatwiseQSchemaItem, MeasurewiseQSchemaItem, QSchemaItem
 from .qschemas import BeatwiseQSchema, MeasurewiseQSchema, QSchema
 from .qtargetitems import QTargetBeat, QTargetMeasure
 from .qtargets import BeatwiseQTarget, MeasurewiseQTarget, QTarget
 from .quantizationjob import QuantizationJob
-from .quantizer import quantize
+from .quantizationreport import QuantizationReport
+from .quantizer import quantize, quantize_async
 from .searchtrees import SearchTree, UnweightedSearchTree, WeightedSearchTree
 
 __all__ = [
@@ -42,21 +47,26 @@ __all__ = [
     "BeatwiseQSchemaItem",
     "BeatwiseQTarget",
     "CollapsingGraceHandler",
+    "CompactQGrid",
     "ConcatenatingGraceHandler",
     "DiscardingGraceHandler",
     "DistanceHeuristic",
     "GraceHandler",
     "Heuristic",
+    "IncrementalQuantizer",
+    "JobCache",
     "JobHandler",
     "MeasurewiseAttackPointOptimizer",
     "MeasurewiseQSchema",
     "MeasurewiseQSchemaItem",
     "MeasurewiseQTarget",
+    "MemoryJobCache",
     "NaiveAttackPointOptimizer",
     "NullAttackPointOptimizer",
     "ParallelJobHandler",
     "ParallelJobHandlerWorker",
     "PitchedQEvent",
+    "PooledJobHandler",
     "QEvent",
     "QEventProxy",
     "QEventSequence",
@@ -69,11 +79,15 @@ __all__ = [
     "QTargetBeat",
     "QTargetMeasure",
     "QuantizationJob",
+    "QuantizationReport",
     "SearchTree",
     "SerialJobHandler",
     "SilentQEvent",
+    "SqliteJobCache",
     "TerminalQEvent",
+    "ThreadedJobHandler",
     "UnweightedSearchTree",
     "WeightedSearchTree",
     "quantize",
+    "quantize_async",
 ]
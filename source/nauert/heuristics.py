@@ -1,8 +1,87 @@
 import abc
+import math
+import typing
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
 
 from . import qgrid as _qgrid
 from . import qtargetitems as _qtargetitems
 
+_MAXIMUM_INTEGER = 2**62
+
+
+def _rank_q_grids(
+    q_grids: typing.Sequence[_qgrid.QGrid | _qgrid.CompactQGrid],
+) -> list[int] | None:
+    """
+    Gets indices of ``q_grids`` sorted by distance, then by number of offsets,
+    then by index.
+
+    Scores all q-grids in one batch: the offsets of the proxies and of the
+    leaves holding them are scaled to integers over a single common
+    denominator, so that summed distances compare exactly. Returns none when
+    NumPy is unavailable, when the q-grids hold different numbers of proxies
+    or when the scaled sums could overflow 64-bit integers.
+    """
+    if numpy is None:
+        return None
+    tables = [_._get_distance_table() for _ in q_grids]
+    proxy_count = len(tables[0][2])
+    if not proxy_count or any(len(_[2]) != proxy_count for _ in tables):
+        return None
+    ratios = {}
+    for _, _, q_event_proxies, _ in tables:
+        for q_event_proxy in q_event_proxies:
+            if id(q_event_proxy) not in ratios:
+                ratio = q_event_proxy.offset().fraction.as_integer_ratio()
+                ratios[id(q_event_proxy)] = ratio
+    denominators = [_[1] for _ in tables]
+    common_denominator = math.lcm(*denominators, *(_[1] for _ in ratios.values()))
+    if _MAXIMUM_INTEGER // proxy_count <= common_denominator:
+        return None
+    scaled_offsets = {
+        key: numerator * (common_denominator // denominator)
+        for key, (numerator, denominator) in ratios.items()
+    }
+    offset_counts = [len(_[0]) for _ in tables]
+    width = max(offset_counts)
+    leaf_matrix = numpy.array(
+        [
+            numerators + (denominator,) * (width - len(numerators))
+            for numerators, denominator, _, _ in tables
+        ],
+        dtype=numpy.int64,
+    )
+    factors = numpy.array(
+        [common_denominator // _ for _ in denominators], dtype=numpy.int64
+    )
+    leaf_matrix *= factors[:, None]
+    proxy_matrix = numpy.array(
+        [[scaled_offsets[id(_)] for _ in table[2]] for table in tables],
+        dtype=numpy.int64,
+    )
+    index_matrix = numpy.array([_[3] for _ in tables], dtype=numpy.intp)
+    leaf_offsets = numpy.take_along_axis(leaf_matrix, index_matrix, axis=1)
+    totals = numpy.abs(proxy_matrix - leaf_offsets).sum(axis=1)
+    return numpy.lexsort((numpy.array(offset_counts), totals)).tolist()
+
+
+def _get_retaining_q_grid_key(
+    heuristic: "Heuristic", option: str = "retained_q_grid_count"
+) -> typing.Callable:
+    # Gets the key by which heuristic ranks single QGrids, for jobs which
+    # retain, or job handlers which return, only the best QGrids. Heuristics
+    # which only rank all of a beat's QGrids together define no such key.
+    q_grid_key = getattr(heuristic, "_get_q_grid_key", None)
+    if q_grid_key is None:
+        message = f"{type(heuristic).__name__} does not rank individual QGrids"
+        message += f" and cannot be used with {option}."
+        raise ValueError(message)
+    return q_grid_key
+
 
 class Heuristic(abc.ABC):
     """
@@ -56,6 +135,9 @@ class DistanceHeuristic(Heuristic):
     The ``QGrid`` with the smallest distance and fewest number of leaves will
     be selected.
 
+    Set ``vectorized=True`` to score all of a beat's ``QGrids`` in a single
+    NumPy batch when NumPy is installed, as with ``pip install nauert[numpy]``.
+
     ..  container:: example
 
         >>> durations = [1000] * 8
@@ -94,20 +176,54 @@ class DistanceHeuristic(Heuristic):
 
     ### CLASS VARIABLES ###
 
-    __slots__ = ()
+    __slots__ = ("_vectorized",)
+
+    ### INITIALIZER ###
+
+    def __init__(self, vectorized: bool = False) -> None:
+        self._vectorized = bool(vectorized)
 
     ### PRIVATE METHODS ###
 
+    def _get_q_grid_key(self, q_grid):
+        return (q_grid.distance, len(q_grid.offsets))
+
     def _process(
         self, q_target_beats: tuple[_qtargetitems.QTargetBeat, ...]
     ) -> tuple[_qtargetitems.QTargetBeat, ...]:
         for q_target_beat in q_target_beats:
             q_grids = q_target_beat.q_grids
             if q_grids:
-                sorted_q_grids = sorted(
-                    q_grids, key=lambda x: (x.distance, len(x.leaves))
-                )
-                q_target_beat._q_grid = sorted_q_grids[0]
+                indices = None
+                if self._vectorized and 1 < len(q_grids):
+                    indices = _rank_q_grids(q_grids)
+                if indices is None:
+                    sorted_q_grids = sorted(q_grids, key=self._get_q_grid_key)
+                    q_target_beat._q_grid = sorted_q_grids[0]
+                else:
+                    q_target_beat._q_grid = q_grids[indices[0]]
             else:
                 q_target_beat._q_grid = _qgrid.QGrid()
         return q_target_beats
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def vectorized(self) -> bool:
+        """
+        Is true when distance heuristic scores all q-grids of a beat in one
+        NumPy batch.
+
+        ..  container:: example
+
+            >>> nauert.DistanceHeuristic().vectorized
+            False
+
+            >>> nauert.DistanceHeuristic(vectorized=True).vectorized
+            True
+
+        Vectorized scoring is exact and selects the same q-grid as the default
+        scoring. It falls back to the default scoring when NumPy is not
+        installed.
+        """
+        return self._vectorized
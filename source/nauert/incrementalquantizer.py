@@ -0,0 +1,402 @@
+import bisect
+import typing
+
+import abjad
+
+from . import attackpointoptimizers as _attackpointoptimizers
+from . import gracehandlers as _gracehandlers
+from . import heuristics as _heuristics
+from . import jobcaches as _jobcaches
+from . import jobhandlers as _jobhandlers
+from . import qevents as _qevents
+from . import qschemas as _qschemas
+from . import qtargetitems as _qtargetitems
+from . import qtargets as _qtargets
+
+
+def _get_offset(q_event):
+    return q_event.offset()
+
+
+class IncrementalQuantizer:
+    r"""
+    Incremental quantizer.
+
+    Quantizes ``QEvents`` as they arrive, instead of requiring a complete
+    ``QEventSequence``, and emits notation one measure at a time.
+
+    ..  container:: example
+
+        >>> q_event_sequence = nauert.QEventSequence.from_millisecond_pitch_pairs(
+        ...     [(1500, 0), (500, 2), (1000, 4), (3000, 5), (2000, 7), (4000, 9)]
+        ... )
+        >>> quantizer = nauert.IncrementalQuantizer()
+        >>> measures = []
+        >>> for q_event in q_event_sequence:
+        ...     new_measures = quantizer.push(q_event)
+        ...     print(q_event.offset().fraction, len(new_measures))
+        ...     measures.extend(new_measures)
+        ...
+        0 0
+        1500 0
+        2000 0
+        3000 0
+        6000 0
+        8000 1
+        12000 2
+
+        A measure is finalized once ``QEvents`` arrive beyond its end plus
+        ``look_ahead_in_ms``, and emitted once the following measure has been
+        finalized too, as the first note of the following measure may tie
+        back into it. The ``TerminalQEvent`` flushes the remaining measures.
+
+        Emitted measures concatenate to the output of ``quantize``:
+
+        >>> voice = abjad.Voice(measures)
+        >>> string = abjad.lilypond(voice)
+        >>> print(string)
+        \new Voice
+        {
+            {
+                %%% \time 4/4 %%%
+                \tempo 4=60
+                c'4.
+                d'8
+                e'4
+                f'4
+                ~
+            }
+            {
+                f'2
+                g'2
+            }
+            {
+                a'1
+            }
+        }
+
+        >>> string == abjad.lilypond(nauert.quantize(q_event_sequence))
+        True
+
+    ..  container:: example
+
+        Calling the quantizer on an iterable of ``QEvents`` returns a
+        generator of measures:
+
+        >>> quantizer = nauert.IncrementalQuantizer(look_ahead_in_ms=500)
+        >>> for measure in quantizer(q_event_sequence):
+        ...     print(abjad.lilypond(measure))
+        ...
+        {
+            %%% \time 4/4 %%%
+            \tempo 4=60
+            c'4.
+            d'8
+            e'4
+            f'4
+            ~
+        }
+        {
+            f'2
+            g'2
+        }
+        {
+            a'1
+        }
+
+    Only the ``QEvents`` of measures not yet finalized and the last two
+    measures of notation are held, so that memory is bounded by
+    ``look_ahead_in_ms`` rather than by the length of the performance.
+    ``QEvents`` may arrive out of order, but not earlier than the end of a
+    measure which has already been finalized. The stream must end with a
+    ``TerminalQEvent`` for its last measures to be emitted.
+
+    Only ``MeasurewiseQSchemas`` are supported. Other keyword arguments are as
+    for ``quantize``.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = (
+        "_attach_tempos",
+        "_attack_point_optimizer",
+        "_best_first",
+        "_compact_q_grids",
+        "_finalized_offset_in_ms",
+        "_grace_handler",
+        "_heuristic",
+        "_job_cache",
+        "_job_handler",
+        "_latest_offset_in_ms",
+        "_look_ahead_in_ms",
+        "_max_expansion_depth",
+        "_max_q_grid_count",
+        "_measure",
+        "_next_q_target_measure",
+        "_previous_beat",
+        "_previous_q_target_measure",
+        "_q_events",
+        "_q_schema",
+        "_q_target",
+        "_q_target_measures",
+        "_retained_q_grid_count",
+        "_terminal_q_event",
+        "_time_limit",
+        "_voice",
+    )
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        q_schema: _qschemas.MeasurewiseQSchema | None = None,
+        grace_handler: _gracehandlers.GraceHandler | None = None,
+        heuristic: _heuristics.Heuristic | None = None,
+        job_handler: _jobhandlers.JobHandler | None = None,
+        attack_point_optimizer: (
+            _attackpointoptimizers.AttackPointOptimizer | None
+        ) = None,
+        attach_tempos: bool = True,
+        look_ahead_in_ms: int | abjad.Fraction = 0,
+        compact_q_grids: bool = False,
+        best_first: bool = False,
+        retained_q_grid_count: int | None = None,
+        max_q_grid_count: int | None = None,
+        max_expansion_depth: int | None = None,
+        time_limit: float | None = None,
+        job_cache: _jobcaches.JobCache | None = None,
+    ) -> None:
+        if q_schema is None:
+            q_schema = _qschemas.MeasurewiseQSchema()
+        assert isinstance(q_schema, _qschemas.MeasurewiseQSchema), repr(q_schema)
+        if grace_handler is None:
+            grace_handler = _gracehandlers.ConcatenatingGraceHandler()
+        assert isinstance(grace_handler, _gracehandlers.GraceHandler)
+        if heuristic is None:
+            heuristic = _heuristics.DistanceHeuristic()
+        assert isinstance(heuristic, _heuristics.Heuristic)
+        if retained_q_grid_count is not None:
+            _heuristics._get_retaining_q_grid_key(heuristic)
+        if job_handler is None:
+            job_handler = _jobhandlers.SerialJobHandler()
+        assert isinstance(job_handler, _jobhandlers.JobHandler)
+        if job_handler.returned_q_grid_count is not None:
+            _heuristics._get_retaining_q_grid_key(heuristic, "returned_q_grid_count")
+        if job_cache is not None:
+            assert isinstance(job_cache, _jobcaches.JobCache)
+        if attack_point_optimizer is None:
+            attack_point_optimizer = _attackpointoptimizers.NaiveAttackPointOptimizer()
+        assert isinstance(
+            attack_point_optimizer, _attackpointoptimizers.AttackPointOptimizer
+        )
+        look_ahead_in_ms = abjad.Fraction(look_ahead_in_ms)
+        assert 0 <= look_ahead_in_ms, repr(look_ahead_in_ms)
+        self._attach_tempos = bool(attach_tempos)
+        self._attack_point_optimizer = attack_point_optimizer
+        self._best_first = bool(best_first)
+        self._compact_q_grids = bool(compact_q_grids)
+        self._grace_handler = grace_handler
+        self._heuristic = heuristic
+        self._job_cache = job_cache
+        self._job_handler = job_handler
+        self._look_ahead_in_ms = abjad.Duration(*look_ahead_in_ms.as_integer_ratio())
+        self._max_expansion_depth = max_expansion_depth
+        self._max_q_grid_count = max_q_grid_count
+        self._q_schema = q_schema
+        self._q_target = _qtargets.MeasurewiseQTarget()
+        self._q_target_measures = q_schema.iterate_target_items()
+        self._retained_q_grid_count = retained_q_grid_count
+        self._time_limit = time_limit
+        self._finalized_offset_in_ms = abjad.Offset(abjad.Fraction(0))
+        self._latest_offset_in_ms = abjad.Offset(abjad.Fraction(0))
+        self._measure: tuple[abjad.Container, _qtargetitems.QTargetMeasure] | None = (
+            None
+        )
+        self._next_q_target_measure: _qtargetitems.QTargetMeasure | None = None
+        self._previous_beat: _qtargetitems.QTargetBeat | None = None
+        self._previous_q_target_measure: _qtargetitems.QTargetMeasure | None = None
+        self._q_events: list[_qevents.QEvent] = []
+        self._terminal_q_event: _qevents.TerminalQEvent | None = None
+        self._voice = abjad.Voice()
+
+    ### SPECIAL METHODS ###
+
+    def __call__(
+        self, q_events: typing.Iterable[_qevents.QEvent]
+    ) -> typing.Iterator[abjad.Container]:
+        """
+        Pushes each of ``q_events`` and yields measures as they are emitted.
+        """
+        for q_event in q_events:
+            yield from self.push(q_event)
+
+    def __repr__(self) -> str:
+        """
+        Gets repr.
+        """
+        return f"{type(self).__name__}(q_schema={self.q_schema!r})"
+
+    ### PRIVATE METHODS ###
+
+    def _emit_measure(self, is_last: bool = False) -> abjad.Container:
+        assert self._measure is not None
+        measure, q_target_measure = self._measure
+        self._q_target._optimize_measure(
+            measure, q_target_measure, self._attack_point_optimizer
+        )
+        if is_last:
+            assert self._previous_beat is not None
+            q_grid = self._previous_beat.q_grid
+            assert q_grid is not None
+            orphaned_q_event_proxies = [
+                proxy
+                for proxy in q_grid.next_downbeat.q_event_proxies
+                if not isinstance(proxy.q_event, _qevents.TerminalQEvent)
+            ]
+            handle_orphaned_q_events = getattr(
+                self._grace_handler, "handle_orphaned_q_event_proxies", None
+            )
+            if callable(handle_orphaned_q_events) and orphaned_q_event_proxies:
+                last_leaf = abjad.get.leaf(measure, -1)
+                handle_orphaned_q_events(last_leaf, orphaned_q_event_proxies)
+        assert self._voice[0] is measure
+        del self._voice[0]
+        self._measure = None
+        return measure
+
+    def _finalize_measure(self, is_last: bool = False) -> list[abjad.Container]:
+        q_target_measure = self._get_next_q_target_measure()
+        self._next_q_target_measure = None
+        end_offset_in_ms = (
+            q_target_measure.offset_in_ms + q_target_measure.duration_in_ms
+        )
+        # parcel QEvents out to each beat
+        if is_last:
+            count = len(self._q_events)
+        else:
+            count = bisect.bisect_left(
+                self._q_events, end_offset_in_ms, key=_get_offset
+            )
+        q_events, self._q_events = self._q_events[:count], self._q_events[count:]
+        beats = q_target_measure.beats
+        offsets = [beat.offset_in_ms for beat in beats]
+        for q_event in q_events:
+            index = bisect.bisect(offsets, q_event.offset()) - 1
+            beats[index].q_events.append(q_event)
+        # generate QuantizationJobs and process with the JobHandler
+        q_grid_key = None
+        if self._retained_q_grid_count is not None:
+            q_grid_key = _heuristics._get_retaining_q_grid_key(self._heuristic)
+        elif self._job_handler.returned_q_grid_count is not None:
+            q_grid_key = _heuristics._get_retaining_q_grid_key(
+                self._heuristic, "returned_q_grid_count"
+            )
+        jobs = [
+            beat(
+                i,
+                compact_q_grids=self._compact_q_grids,
+                best_first=self._best_first,
+                retained_q_grid_count=self._retained_q_grid_count,
+                max_q_grid_count=self._max_q_grid_count,
+                max_expansion_depth=self._max_expansion_depth,
+                time_limit=self._time_limit,
+                q_grid_key=q_grid_key,
+            )
+            for i, beat in enumerate(beats)
+        ]
+        jobs = [job for job in jobs if job]
+        if jobs and self._job_cache is not None:
+            jobs = self._job_cache(jobs, self._job_handler)
+        elif jobs:
+            jobs = self._job_handler(jobs)
+        for job in jobs:
+            beats[job.job_id]._q_grids = job.q_grids
+        self._heuristic(beats)
+        # shift QEvents attached to each QGrid's "next downbeat"
+        # over to the next QGrid's first leaf, across the barline too
+        if self._previous_beat is not None:
+            beats = (self._previous_beat,) + beats
+        for one, two in abjad.sequence.nwise(beats):
+            one_q_events = one.q_grid.next_downbeat.q_event_proxies
+            two_q_events = two.q_grid.leaves[0].q_event_proxies
+            while one_q_events:
+                two_q_events.insert(0, one_q_events.pop())
+        for beat in q_target_measure.beats:
+            beat.q_grid.regroup_leaves_with_unencessary_divisions()
+        # notate, then emit the previous measure, which can no longer change
+        measure = self._q_target._make_measure(
+            q_target_measure,
+            self._previous_q_target_measure,
+            attach_tempos=self._attach_tempos,
+        )
+        self._voice.append(measure)
+        self._q_target._notate_leaves(grace_handler=self._grace_handler, voice=measure)
+        measures = []
+        if self._measure is not None:
+            measures.append(self._emit_measure())
+        self._measure = (measure, q_target_measure)
+        self._previous_beat = q_target_measure.beats[-1]
+        self._previous_q_target_measure = q_target_measure
+        self._finalized_offset_in_ms = end_offset_in_ms
+        if is_last:
+            measures.append(self._emit_measure(is_last=True))
+        return measures
+
+    def _get_next_q_target_measure(self) -> _qtargetitems.QTargetMeasure:
+        if self._next_q_target_measure is None:
+            q_target_measure = next(self._q_target_measures)
+            assert isinstance(q_target_measure, _qtargetitems.QTargetMeasure)
+            self._next_q_target_measure = q_target_measure
+        return self._next_q_target_measure
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def look_ahead_in_ms(self) -> abjad.Duration:
+        """
+        Gets time past the end of a measure after which the measure is
+        finalized.
+        """
+        return self._look_ahead_in_ms
+
+    @property
+    def q_schema(self) -> _qschemas.MeasurewiseQSchema:
+        """
+        Gets q-schema of incremental quantizer.
+        """
+        return self._q_schema
+
+    ### PUBLIC METHODS ###
+
+    def push(self, q_event: _qevents.QEvent) -> list[abjad.Container]:
+        """
+        Pushes ``q_event`` and returns the measures which it allows to be
+        emitted.
+        """
+        assert isinstance(q_event, _qevents.QEvent), repr(q_event)
+        assert self._terminal_q_event is None, "stream has already terminated."
+        offset = q_event.offset()
+        assert not offset < self._finalized_offset_in_ms, repr(q_event)
+        bisect.insort(self._q_events, q_event, key=_get_offset)
+        measures = []
+        if isinstance(q_event, _qevents.TerminalQEvent):
+            self._terminal_q_event = q_event
+            while self._finalized_offset_in_ms < offset:
+                q_target_measure = self._get_next_q_target_measure()
+                end_offset_in_ms = (
+                    q_target_measure.offset_in_ms + q_target_measure.duration_in_ms
+                )
+                is_last = not end_offset_in_ms < offset
+                measures.extend(self._finalize_measure(is_last=is_last))
+            return measures
+        if self._latest_offset_in_ms < offset:
+            self._latest_offset_in_ms = offset
+        while True:
+            q_target_measure = self._get_next_q_target_measure()
+            end_offset_in_ms = (
+                q_target_measure.offset_in_ms + q_target_measure.duration_in_ms
+            )
+            if self._latest_offset_in_ms < end_offset_in_ms + self._look_ahead_in_ms:
+                break
+            measures.extend(self._finalize_measure())
+        return measures
@@ -0,0 +1,553 @@
+import abc
+import collections
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import typing
+
+from . import _version
+from . import jobhandlers as _jobhandlers
+from . import quantizationjob as _quantizationjob
+
+
+class JobCache(abc.ABC):
+    """
+    Abstract job cache.
+
+    ``JobCaches`` memoize the ``QGrids`` found by ``QuantizationJob``
+    instances. Jobs with the same search tree, the same options and the same
+    ``QEventProxy`` offsets, in the same order, generate ``QGrids`` of the
+    same shapes, with proxies at the same positions. Such jobs are searched
+    only once: every other job reuses the cached ``QGrids``, re-bound to its
+    own ``QEventProxies``.
+
+    All of a job's ``QGrids`` are cached, rather than only the best, so that
+    any ``Heuristic`` selects the same ``QGrid`` as without a cache.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = ()
+
+    ### INITIALIZER ###
+
+    def __init__(self):
+        pass
+
+    ### SPECIAL METHODS ###
+
+    def __call__(
+        self, jobs: typing.Sequence, job_handler: _jobhandlers.JobHandler
+    ) -> list:
+        """
+        Calls job cache.
+
+        Fills ``jobs`` whose ``QGrids`` are cached, passes one job of each
+        group of uncached jobs with equal keys to ``job_handler``, caches its
+        ``QGrids`` and fills the other jobs of the group.
+        """
+        hit_jobs, groups = self._look_up_jobs(jobs, job_handler.returned_q_grid_count)
+        finished_jobs = job_handler([_[1][0] for _ in groups])
+        return hit_jobs + self._store_jobs(groups, finished_jobs)
+
+    ### PRIVATE METHODS ###
+
+    @abc.abstractmethod
+    def _get(self, key: tuple) -> bytes | None:
+        raise NotImplementedError
+
+    def _look_up_jobs(
+        self, jobs: typing.Sequence, returned_q_grid_count: int | None = None
+    ) -> tuple[list, list[tuple[tuple | None, list]]]:
+        # Splits jobs into jobs filled from the cache and groups of uncached
+        # jobs with equal keys, in order of first appearance. Jobs without a
+        # key form groups of their own. Results of job handlers which return
+        # only the best QGrids are keyed apart from complete results.
+        hit_jobs: list = []
+        groups: list[tuple[tuple | None, list]] = []
+        groups_by_key: dict[tuple, list] = {}
+        for job in jobs:
+            key = None
+            if isinstance(job, _quantizationjob.QuantizationJob):
+                key = job._get_cache_key(returned_q_grid_count)
+            if key is None:
+                groups.append((None, [job]))
+                continue
+            if key in groups_by_key:
+                groups_by_key[key].append(job)
+                continue
+            result = self._get(key)
+            if result is not None:
+                hit_jobs.append(_jobhandlers._load_result(result, job))
+                continue
+            groups_by_key[key] = [job]
+            groups.append((key, groups_by_key[key]))
+        return hit_jobs, groups
+
+    @abc.abstractmethod
+    def _set(self, key: tuple, result: bytes) -> None:
+        raise NotImplementedError
+
+    def _store_jobs(
+        self,
+        groups: typing.Sequence[tuple[tuple | None, list]],
+        finished_jobs: typing.Sequence,
+    ) -> list:
+        # Caches the result of the finished first job of each group and fills
+        # the group's other jobs. Finished jobs are matched to groups by job
+        # ID, since job handlers may return copies of jobs, in any order.
+        finished_jobs_by_id = {_.job_id: _ for _ in finished_jobs}
+        jobs = list(finished_jobs)
+        for key, group in groups:
+            if key is None:
+                continue
+            result = _jobhandlers._dump_result(finished_jobs_by_id[group[0].job_id])
+            self._set(key, result)
+            for job in group[1:]:
+                jobs.append(_jobhandlers._load_result(result, job))
+        return jobs
+
+    ### PUBLIC METHODS ###
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """
+        Clears job cache.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def info(self) -> dict[str, int]:
+        """
+        Gets hits, misses, maximum size and current size of job cache.
+        """
+        raise NotImplementedError
+
+
+class MemoryJobCache(JobCache):
+    r"""
+    Memory job cache.
+
+    Keeps the ``QGrids`` of the most recently used jobs in memory.
+
+    ..  container:: example
+
+        Rhythmically repetitive input is searched once per distinct beat:
+
+        >>> durations = [250, 250, 500] * 8
+        >>> q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        ...     durations
+        ... )
+        >>> job_cache = nauert.MemoryJobCache()
+        >>> voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+        >>> job_cache.info()
+        {'hits': 0, 'misses': 2, 'maxsize': 4096, 'size': 2}
+
+        The cache may be shared between calls:
+
+        >>> voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+        >>> job_cache.info()
+        {'hits': 8, 'misses': 2, 'maxsize': 4096, 'size': 2}
+
+        >>> string = abjad.lilypond(voice)
+        >>> print(string)
+        \new Voice
+        {
+            {
+                %%% \time 4/4 %%%
+                \tempo 4=60
+                c'16
+                c'16
+                c'8
+                c'16
+                c'16
+                c'8
+                c'16
+                c'16
+                c'8
+                c'16
+                c'16
+                c'8
+            }
+            {
+                c'16
+                c'16
+                c'8
+                c'16
+                c'16
+                c'8
+                c'16
+                c'16
+                c'8
+                c'16
+                c'16
+                c'8
+            }
+        }
+
+    Misses count jobs searched and hits count jobs filled from results cached
+    by earlier calls. Repeated jobs within one call are searched only once.
+
+    Safe to share between threads.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_hits", "_lock", "_maxsize", "_misses", "_results")
+
+    ### INITIALIZER ###
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        assert isinstance(maxsize, int) and 0 < maxsize, repr(maxsize)
+        self._hits = 0
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._misses = 0
+        self._results: collections.OrderedDict[tuple, bytes] = collections.OrderedDict()
+
+    ### SPECIAL METHODS ###
+
+    def __len__(self) -> int:
+        """
+        Gets number of cached jobs.
+        """
+        with self._lock:
+            return len(self._results)
+
+    def __repr__(self) -> str:
+        """
+        Gets repr.
+        """
+        return f"{type(self).__name__}(maxsize={self.maxsize!r})"
+
+    ### PRIVATE METHODS ###
+
+    def _get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._results.move_to_end(key)
+            return result
+
+    def _set(self, key: tuple, result: bytes) -> None:
+        with self._lock:
+            self._results[key] = result
+            while self._maxsize < len(self._results):
+                self._results.popitem(last=False)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Gets maximum number of cached jobs.
+        """
+        return self._maxsize
+
+    ### PUBLIC METHODS ###
+
+    def clear(self) -> None:
+        """
+        Clears memory job cache.
+        """
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> dict[str, int]:
+        """
+        Gets hits, misses, maximum size and current size of memory job cache.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "maxsize": self._maxsize,
+                "size": len(self._results),
+            }
+
+
+class SqliteJobCache(JobCache):
+    r"""
+    Sqlite job cache.
+
+    Keeps the ``QGrids`` of the most recently used jobs in a sqlite database
+    file, so that batch runs over the same corpus skip the search entirely.
+
+    ..  container:: example
+
+        >>> import pathlib
+        >>> import tempfile
+        >>> directory = tempfile.TemporaryDirectory()
+        >>> path = pathlib.Path(directory.name) / "jobs.sqlite"
+        >>> q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        ...     [250, 250, 500] * 8
+        ... )
+        >>> with nauert.SqliteJobCache(path) as job_cache:
+        ...     voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+        ...     job_cache.info()
+        ...
+        {'hits': 0, 'misses': 2, 'maxsize': 65536, 'size': 2}
+
+        A later process opening the same file reuses its results:
+
+        >>> with nauert.SqliteJobCache(path) as job_cache:
+        ...     voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+        ...     job_cache.info()
+        ...
+        {'hits': 8, 'misses': 0, 'maxsize': 65536, 'size': 2}
+
+        >>> directory.cleanup()
+
+    Results are keyed by a digest of the job's cache key, which includes the
+    search tree's definition, so that changing a search tree never reuses
+    results of another. The file records the version of its format and of
+    Nauert; a file written by another version is emptied when opened.
+
+    Once the file holds more than ``maxsize`` results, the least recently
+    used results are evicted.
+
+    Several threads and processes may share one file: sqlite serializes
+    writers, and each process opens its own connection, also after a fork or
+    when the cache is pickled to a worker process. Results are pickles, so
+    only open files written by trusted code.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = (
+        "_connection",
+        "_hits",
+        "_lock",
+        "_maxsize",
+        "_misses",
+        "_path",
+        "_pid",
+        "_timeout",
+    )
+
+    _format_version = 3
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        maxsize: int = 65536,
+        timeout: float = 30.0,
+    ) -> None:
+        assert isinstance(maxsize, int) and 0 < maxsize, repr(maxsize)
+        assert 0 < timeout, repr(timeout)
+        self._connection: sqlite3.Connection | None = None
+        self._hits = 0
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._misses = 0
+        self._path = os.fspath(path)
+        self._pid: int | None = None
+        self._timeout = timeout
+        with self._lock:
+            self._connect()
+
+    ### SPECIAL METHODS ###
+
+    def __enter__(self) -> "SqliteJobCache":
+        """
+        Enters sqlite job cache.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Exits sqlite job cache and closes its connection.
+        """
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Gets number of cached jobs.
+        """
+        with self._lock:
+            connection = self._connect()
+            return connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __reduce__(self) -> tuple:
+        """
+        Reduces sqlite job cache to its arguments, so that unpickled copies
+        open their own connection.
+        """
+        return (type(self), (self._path, self._maxsize, self._timeout))
+
+    def __repr__(self) -> str:
+        """
+        Gets repr.
+        """
+        return f"{type(self).__name__}(path={self._path!r}, maxsize={self._maxsize!r})"
+
+    ### PRIVATE METHODS ###
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opens the connection of this process, creating tables or emptying
+        # a file of another version as needed. Connections are not shared
+        # with forked processes.
+        pid = os.getpid()
+        if self._connection is not None and self._pid == pid:
+            return self._connection
+        connection = sqlite3.connect(
+            self._path,
+            timeout=self._timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._enable_write_ahead_logging(connection)
+        version = f"{self._format_version}:{_version.__version__}"
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata"
+                " (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results"
+                " (key TEXT PRIMARY KEY, result BLOB NOT NULL,"
+                " accessed INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+            row = connection.execute(
+                "SELECT value FROM metadata WHERE name = 'version'"
+            ).fetchone()
+            if row is None or row[0] != version:
+                connection.execute("DELETE FROM results")
+                connection.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES ('version', ?)",
+                    (version,),
+                )
+        self._connection, self._pid = connection, pid
+        return connection
+
+    @staticmethod
+    def _digest(key: tuple) -> str:
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def _enable_write_ahead_logging(self, connection: sqlite3.Connection) -> None:
+        # Switches the file to write-ahead logging, which persists in the
+        # file. The switch needs an exclusive lock, and sqlite may return
+        # SQLITE_BUSY without calling its busy handler when connections
+        # opening the file at the same time hold shared locks. The busy
+        # handler is therefore turned off during the switch, which is
+        # retried with a short backoff until the timeout.
+        deadline = time.monotonic() + self._timeout
+        delay = 0.001
+        connection.execute("PRAGMA busy_timeout = 0")
+        try:
+            while True:
+                try:
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    return
+                except sqlite3.OperationalError as error:
+                    code = error.sqlite_errorcode & 0xFF
+                    if code not in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED):
+                        raise
+                    if deadline < time.monotonic():
+                        raise
+                time.sleep(delay)
+                delay = min(2 * delay, 0.05)
+        finally:
+            milliseconds = int(self._timeout * 1000)
+            connection.execute(f"PRAGMA busy_timeout = {milliseconds}")
+
+    def _get(self, key: tuple) -> bytes | None:
+        digest = self._digest(key)
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT result FROM results WHERE key = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            with connection:
+                connection.execute(
+                    "UPDATE results SET accessed = ? WHERE key = ?",
+                    (time.time_ns(), digest),
+                )
+            return row[0]
+
+    def _set(self, key: tuple, result: bytes) -> None:
+        digest = self._digest(key)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    (digest, result, time.time_ns()),
+                )
+                connection.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results"
+                    " ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self._maxsize,),
+                )
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Gets maximum number of cached jobs.
+        """
+        return self._maxsize
+
+    @property
+    def path(self) -> str:
+        """
+        Gets path of sqlite database file.
+        """
+        return self._path
+
+    ### PUBLIC METHODS ###
+
+    def clear(self) -> None:
+        """
+        Clears sqlite job cache, for every process sharing its file.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM results")
+            self._hits = 0
+            self._misses = 0
+
+    def close(self) -> None:
+        """
+        Closes connection of sqlite job cache.
+
+        The connection is opened again when the cache is next used.
+        """
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection, self._pid = None, None
+
+    def info(self) -> dict[str, int]:
+        """
+        Gets hits and misses of this sqlite job cache, and maximum size and
+        current size of its file.
+        """
+        size = len(self)
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "maxsize": self._maxsize,
+                "size": size,
+            }
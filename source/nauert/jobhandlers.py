@@ -1,10 +1,138 @@
 import abc
+import concurrent.futures
+import functools
+import heapq
+import io
 import multiprocessing
 import pickle
 import typing
 
+import abjad
+
+from . import qeventproxy as _qeventproxy
+from . import qgrid as _qgrid
 from . import quantizationjob as _quantizationjob
 
+_CHUNKS_PER_PROCESS = 4
+
+
+class _QEventProxyPickler(pickle.Pickler):
+    # Pickles the job's own QEventProxies by index, so that they are not sent
+    # back to the process which already holds them.
+
+    def __init__(self, file, q_event_proxies) -> None:
+        pickle.Pickler.__init__(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.indices = {id(x): i for i, x in enumerate(q_event_proxies)}
+
+    def persistent_id(self, obj):
+        if isinstance(obj, _qeventproxy.QEventProxy):
+            return self.indices.get(id(obj))
+        return None
+
+
+class _QEventProxyUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, q_event_proxies) -> None:
+        pickle.Unpickler.__init__(self, file)
+        self.q_event_proxies = q_event_proxies
+
+    def persistent_load(self, pid):
+        return self.q_event_proxies[pid]
+
+
+def _estimate_job_cost(job) -> int:
+    if isinstance(job, _quantizationjob.QuantizationJob):
+        return job._estimate_cost()
+    return 1
+
+
+def _chunk_jobs(jobs, chunk_count: int) -> list[list[tuple[int, typing.Any]]]:
+    # Orders jobs by estimated cost, largest first, and groups them into about
+    # chunk_count chunks of similar cost: costly jobs travel alone, while
+    # cheap jobs are batched to save queue and pickle overhead.
+    costs = [_estimate_job_cost(job) for job in jobs]
+    chunk_cost = max(1, sum(costs) // max(1, chunk_count))
+    chunks: list[list[tuple[int, typing.Any]]] = []
+    chunk: list[tuple[int, typing.Any]] = []
+    cost = 0
+    for index in sorted(range(len(jobs)), key=lambda i: -costs[i]):
+        chunk.append((index, jobs[index]))
+        cost += costs[index]
+        if chunk_cost <= cost:
+            chunks.append(chunk)
+            chunk, cost = [], 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _encode_q_grid_node(node):
+    if isinstance(node, _qgrid.QGridContainer):
+        return (node.pair(), tuple(_encode_q_grid_node(_) for _ in node))
+    return (node.pair(), tuple(node.q_event_proxies), node.is_divisible)
+
+
+def _decode_q_grid_node(encoding):
+    if len(encoding) == 2:
+        pair, children = encoding
+        return _qgrid.QGridContainer(pair, [_decode_q_grid_node(_) for _ in children])
+    pair, q_event_proxies, is_divisible = encoding
+    return _qgrid.QGridLeaf(abjad.Duration(*pair), q_event_proxies, is_divisible)
+
+
+def _select_q_grids(job, returned_q_grid_count: int | None) -> tuple:
+    # Keeps the returned_q_grid_count best QGrids of job, ranked by the job's
+    # q_grid_key, earliest first among equals, in the order job generated them.
+    q_grids = job.q_grids
+    if returned_q_grid_count is None or len(q_grids) <= returned_q_grid_count:
+        return q_grids
+    q_grid_key = job.q_grid_key
+    ranks = [(q_grid_key(_), i) for i, _ in enumerate(q_grids)]
+    ranks = heapq.nsmallest(returned_q_grid_count, ranks)
+    return tuple(q_grids[_[1]] for _ in sorted(ranks, key=lambda _: _[1]))
+
+
+def _dump_result(job, returned_q_grid_count: int | None = None) -> bytes:
+    # A finished QuantizationJob is reduced to its QGrids, or to the
+    # returned_q_grid_count best of them, each QGrid to nested tuples, the
+    # number of QGrids it generated and the name of the budget it exhausted,
+    # if any; any other job is sent back whole.
+    if not isinstance(job, _quantizationjob.QuantizationJob):
+        return pickle.dumps(job, protocol=pickle.HIGHEST_PROTOCOL)
+    q_grids = [
+        (
+            (_encode_q_grid_node(_.root_node), _encode_q_grid_node(_.next_downbeat))
+            if isinstance(_, _qgrid.QGrid)
+            else _
+        )
+        for _ in _select_q_grids(job, returned_q_grid_count)
+    ]
+    file = io.BytesIO()
+    _QEventProxyPickler(file, job.q_event_proxies).dump(
+        (q_grids, job.q_grid_count, job.exhausted_budget)
+    )
+    return file.getvalue()
+
+
+def _load_result(result: bytes, job):
+    if not isinstance(job, _quantizationjob.QuantizationJob):
+        return pickle.loads(result)
+    file = io.BytesIO(result)
+    q_grids, q_grid_count, exhausted_budget = _QEventProxyUnpickler(
+        file, job.q_event_proxies
+    ).load()
+    job._q_grids = tuple(
+        (
+            _qgrid.QGrid(_decode_q_grid_node(_[0]), _decode_q_grid_node(_[1]))
+            if isinstance(_, tuple)
+            else _
+        )
+        for _ in q_grids
+    )
+    job._q_grid_count = q_grid_count
+    job._exhausted_budget = exhausted_budget
+    return job
+
 
 class JobHandler(abc.ABC):
     """
@@ -32,6 +160,17 @@ class JobHandler(abc.ABC):
         """
         raise NotImplementedError
 
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def returned_q_grid_count(self) -> int | None:
+        """
+        Gets number of best ``QGrids`` returned for each job.
+
+        None when job handler returns every ``QGrid`` of each job.
+        """
+        return None
+
 
 class ParallelJobHandlerWorker(multiprocessing.Process):
     """
@@ -46,12 +185,18 @@ class ParallelJobHandlerWorker(multiprocessing.Process):
 
     ### INITIALIZER ###
 
-    def __init__(self, job_queue=None, result_queue=None) -> None:
+    def __init__(
+        self,
+        job_queue=None,
+        result_queue=None,
+        returned_q_grid_count: int | None = None,
+    ) -> None:
         multiprocessing.Process.__init__(self)
         job_queue = job_queue or ()
         result_queue = result_queue or ()
         self.job_queue = job_queue
         self.result_queue = result_queue
+        self.returned_q_grid_count = returned_q_grid_count
 
     ### PUBLIC METHODS ###
 
@@ -70,11 +215,11 @@ class ParallelJobHandlerWorker(multiprocessing.Process):
                 self.job_queue.task_done()
                 break
             # print '{}: {!r}'.format(process_name, job)
-            job = pickle.loads(job)
-            job()
+            chunk = pickle.loads(job)
+            results = _run_chunk(chunk, self.returned_q_grid_count)
             self.job_queue.task_done()
             assert hasattr(self.result_queue, "put")
-            self.result_queue.put(pickle.dumps(job, protocol=0))
+            self.result_queue.put(results)
         return
 
 
@@ -84,11 +229,37 @@ class ParallelJobHandler(JobHandler):
 
     Processes ``QuantizationJob`` instances in parallel, based on the number of
     CPUs available.
+
+    Jobs are ordered by estimated cost, largest first, and sent to worker
+    processes in chunks of similar cost, so that cheap jobs share queue and
+    pickle overhead while costly jobs start early and are picked up by
+    whichever worker is free.
+
+    Jobs are sent to worker processes with the highest pickle protocol.
+    Workers send back only the ``QGrids`` of each job, with references to
+    the job's ``QEventProxies`` in place of copies. Finished jobs are
+    returned in the order they were given.
+
+    Set ``returned_q_grid_count`` to have workers send back only that many
+    of each job's best ``QGrids``, ranked by the heuristic's per-``QGrid``
+    key, rather than every ``QGrid``. The heuristic then selects from fewer
+    ``QGrids``; with ``returned_q_grid_count=1`` and ``DistanceHeuristic`` it
+    selects the same ``QGrid`` as from all of them. Heuristics which only rank
+    a beat's ``QGrids`` together cannot be used with
+    ``returned_q_grid_count``.
     """
 
     ### CLASS VARIABLES ###
 
-    __slots__ = ()
+    __slots__ = ("_returned_q_grid_count",)
+
+    ### INITIALIZER ###
+
+    def __init__(self, returned_q_grid_count: int | None = None) -> None:
+        if returned_q_grid_count is not None:
+            assert isinstance(returned_q_grid_count, int)
+            assert 0 < returned_q_grid_count
+        self._returned_q_grid_count = returned_q_grid_count
 
     ### SPECIAL METHODS ###
 
@@ -96,19 +267,26 @@ class ParallelJobHandler(JobHandler):
         """
         Calls parallel job handler.
         """
-        finished_jobs = []
+        finished_jobs = list(jobs)
+        if not jobs:
+            return finished_jobs
+        process_count = multiprocessing.cpu_count() * 2
+        chunks = _chunk_jobs(jobs, process_count * _CHUNKS_PER_PROCESS)
         job_queue = multiprocessing.JoinableQueue()
         result_queue = multiprocessing.Queue()
         workers = [
-            ParallelJobHandlerWorker(job_queue, result_queue)
-            for i in range(multiprocessing.cpu_count() * 2)
+            ParallelJobHandlerWorker(
+                job_queue, result_queue, self.returned_q_grid_count
+            )
+            for i in range(min(process_count, len(chunks)))
         ]
         for worker in workers:
             worker.start()
-        for job in jobs:
-            job_queue.put(pickle.dumps(job, protocol=0))
-        for i in range(len(jobs)):
-            finished_jobs.append(pickle.loads(result_queue.get()))
+        for chunk in chunks:
+            job_queue.put(pickle.dumps(chunk, protocol=pickle.HIGHEST_PROTOCOL))
+        for i in range(len(chunks)):
+            for index, result in result_queue.get():
+                finished_jobs[index] = _load_result(result, jobs[index])
         for worker in workers:
             job_queue.put(None)
         job_queue.join()
@@ -118,6 +296,159 @@ class ParallelJobHandler(JobHandler):
             worker.join()
         return finished_jobs
 
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def returned_q_grid_count(self) -> int | None:
+        """
+        Gets number of best ``QGrids`` returned for each job.
+        """
+        return self._returned_q_grid_count
+
+
+def _run_chunk(
+    chunk, returned_q_grid_count: int | None = None
+) -> list[tuple[int, bytes]]:
+    results = []
+    for index, job in chunk:
+        job()
+        results.append((index, _dump_result(job, returned_q_grid_count)))
+    return results
+
+
+class PooledJobHandler(JobHandler):
+    """
+    Pooled job-handler.
+
+    Processes ``QuantizationJob`` instances in parallel, using a pool of
+    worker processes which persists across calls.
+
+    ..  container:: example
+
+        >>> with nauert.PooledJobHandler(2) as job_handler:
+        ...     staff = abjad.Staff()
+        ...     for durations in ([1000, 1000], [500, 500, 1000]):
+        ...         sequence = nauert.QEventSequence.from_millisecond_durations(
+        ...             durations
+        ...         )
+        ...         voice = nauert.quantize(sequence, job_handler=job_handler)
+        ...         staff.extend(voice)
+        ...
+        >>> job_handler.process_count
+        2
+
+    The pool is started on first call and reused by subsequent calls, so that
+    quantizing many short sequences does not pay the cost of starting worker
+    processes each time. Call ``shutdown()``, or use the job handler as a
+    context manager, to stop the workers. A job handler which has been shut
+    down starts a new pool when called again. As with ``ParallelJobHandler``,
+    jobs are dispatched largest first in chunks of similar estimated cost, and
+    workers send back only the ``QGrids`` of each job, or only
+    ``returned_q_grid_count`` of the best of them.
+
+    ``process_count`` defaults to the number of CPUs available.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_pool", "_process_count", "_returned_q_grid_count")
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        process_count: int | None = None,
+        returned_q_grid_count: int | None = None,
+    ) -> None:
+        if process_count is None:
+            process_count = multiprocessing.cpu_count()
+        assert isinstance(process_count, int) and 0 < process_count
+        if returned_q_grid_count is not None:
+            assert isinstance(returned_q_grid_count, int)
+            assert 0 < returned_q_grid_count
+        self._pool: typing.Any = None
+        self._process_count = process_count
+        self._returned_q_grid_count = returned_q_grid_count
+
+    ### SPECIAL METHODS ###
+
+    def __call__(self, jobs):
+        """
+        Calls pooled job handler.
+        """
+        if not jobs:
+            return []
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.process_count)
+        finished_jobs = list(jobs)
+        chunks = _chunk_jobs(jobs, self.process_count * _CHUNKS_PER_PROCESS)
+        function = functools.partial(
+            _run_chunk, returned_q_grid_count=self.returned_q_grid_count
+        )
+        for results in self._pool.imap_unordered(function, chunks):
+            for index, result in results:
+                finished_jobs[index] = _load_result(result, jobs[index])
+        return finished_jobs
+
+    def __enter__(self) -> "PooledJobHandler":
+        """
+        Enters pooled job handler.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Exits pooled job handler and shuts down its pool.
+        """
+        self.shutdown()
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Is true when the pool of worker processes has been started and not
+        shut down.
+        """
+        return self._pool is not None
+
+    @property
+    def process_count(self) -> int:
+        """
+        Gets number of worker processes.
+        """
+        return self._process_count
+
+    @property
+    def returned_q_grid_count(self) -> int | None:
+        """
+        Gets number of best ``QGrids`` returned for each job.
+        """
+        return self._returned_q_grid_count
+
+    ### PUBLIC METHODS ###
+
+    def resize(self, process_count: int) -> None:
+        """
+        Resizes pool to ``process_count`` worker processes.
+
+        A running pool is shut down; the next call starts a pool of the new
+        size.
+        """
+        assert isinstance(process_count, int) and 0 < process_count
+        if process_count != self._process_count:
+            self.shutdown()
+            self._process_count = process_count
+
+    def shutdown(self) -> None:
+        """
+        Shuts down pool, waiting for its worker processes to exit.
+        """
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            pool.close()
+            pool.join()
+
 
 class SerialJobHandler(JobHandler):
     """
@@ -139,3 +470,67 @@ class SerialJobHandler(JobHandler):
         for job in jobs:
             job()
         return jobs
+
+
+def _call_job(job):
+    job()
+    return job
+
+
+class ThreadedJobHandler(JobHandler):
+    """
+    Threaded job-handler.
+
+    Processes ``QuantizationJob`` instances in a pool of threads.
+
+    ..  container:: example
+
+        >>> sequence = nauert.QEventSequence.from_millisecond_durations(
+        ...     [500, 500, 250, 250, 500]
+        ... )
+        >>> job_handler = nauert.ThreadedJobHandler(2)
+        >>> voice = nauert.quantize(sequence, job_handler=job_handler)
+        >>> job_handler.thread_count
+        2
+
+    Like ``SerialJobHandler``, and unlike the process-based job handlers, jobs
+    are called in place and never pickled. Jobs run concurrently on
+    free-threaded builds of Python; elsewhere they take turns holding the
+    global interpreter lock. Jobs are started largest first, by estimated
+    cost.
+
+    ``thread_count`` defaults to the number of CPUs available.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_thread_count",)
+
+    ### INITIALIZER ###
+
+    def __init__(self, thread_count: int | None = None) -> None:
+        if thread_count is None:
+            thread_count = multiprocessing.cpu_count()
+        assert isinstance(thread_count, int) and 0 < thread_count
+        self._thread_count = thread_count
+
+    ### SPECIAL METHODS ###
+
+    def __call__(self, jobs):
+        """
+        Calls threaded job handler.
+        """
+        ordered_jobs = sorted(jobs, key=_estimate_job_cost, reverse=True)
+        with concurrent.futures.ThreadPoolExecutor(self.thread_count) as executor:
+            for _ in executor.map(_call_job, ordered_jobs):
+                pass
+        return jobs
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def thread_count(self) -> int:
+        """
+        Gets number of threads.
+        """
+        return self._thread_count
@@ -1,3 +1,5 @@
+import typing
+
 import abjad
 
 from . import qevents as _qevents
@@ -83,6 +85,35 @@ class QEventProxy:
         string = f"{class_name}(q_event={self.q_event!r}, offset={self.offset()!r})"
         return string
 
+    ### PRIVATE METHODS ###
+
+    @classmethod
+    def _from_q_events(
+        class_,
+        q_events: typing.Sequence[_qevents.QEvent],
+        minimum: abjad.Offset,
+        maximum: abjad.Offset,
+    ) -> list["QEventProxy"]:
+        """
+        Makes one q-event proxy for each of ``q_events`` in a single pass.
+
+        Equivalent to calling ``QEventProxy(q_event, minimum, maximum)`` for
+        each q-event, with the range checked once for the whole batch.
+        """
+        assert isinstance(minimum, abjad.Offset), repr(minimum)
+        assert isinstance(maximum, abjad.Offset), repr(maximum)
+        assert all(isinstance(_, _qevents.QEvent) for _ in q_events)
+        start, span = minimum.fraction, maximum.fraction - minimum.fraction
+        fractions = [(_.offset().fraction - start) / span for _ in q_events]
+        assert not fractions or 0 <= min(fractions) and max(fractions) <= 1
+        q_event_proxies = []
+        for q_event, fraction in zip(q_events, fractions):
+            q_event_proxy = object.__new__(class_)
+            q_event_proxy._q_event = q_event
+            q_event_proxy._offset = abjad.Offset(fraction)
+            q_event_proxies.append(q_event_proxy)
+        return q_event_proxies
+
     ### PUBLIC PROPERTIES ###
 
     @property
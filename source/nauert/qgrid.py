@@ -1,5 +1,8 @@
 import bisect
+import collections
 import copy
+import math
+import threading
 import typing
 
 import abjad
@@ -8,6 +11,171 @@ import uqbar.graphs
 
 from . import qeventproxy as _qeventproxy
 
+_MAXIMUM_DENOMINATOR = 2**63 - 1
+
+_LeafOffsetTable = tuple[tuple[int, ...], tuple[int, ...], int]
+
+
+class _LeafOffsetTableCache:
+    # Process-wide, size-bounded LRU cache of leaf offset tables, keyed by the
+    # RTM format of a q-grid's root node. Each table holds the offset
+    # numerators of the leaves and of the next downbeat, the duration
+    # numerators of the leaves and their common denominator. A lock guards
+    # the ordered dictionary, which is not safe to reorder from several
+    # threads at once.
+
+    __slots__ = ("hits", "lock", "maxsize", "misses", "tables")
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.maxsize = maxsize
+        self.misses = 0
+        self.tables: collections.OrderedDict[str, _LeafOffsetTable] = (
+            collections.OrderedDict()
+        )
+
+    def clear(self, maxsize: int | None = None) -> None:
+        with self.lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            self.tables.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key: str) -> _LeafOffsetTable | None:
+        with self.lock:
+            table = self.tables.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.tables.move_to_end(key)
+            return table
+
+    def info(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "maxsize": self.maxsize,
+                "size": len(self.tables),
+            }
+
+    def set(self, key: str, table: _LeafOffsetTable):
+        with self.lock:
+            self.tables[key] = table
+            while self.maxsize < len(self.tables):
+                self.tables.popitem(last=False)
+
+
+_leaf_offset_table_cache = _LeafOffsetTableCache()
+
+
+def _fit_integer_offsets(
+    numerators: typing.Sequence[int],
+    denominator: int,
+    q_event_proxies: typing.Iterable[_qeventproxy.QEventProxy],
+) -> list[int]:
+    # Finds the index of the nearest offset numerator / denominator for each
+    # proxy, preferring the earlier offset on ties. Proxy offsets are compared
+    # by cross-multiplication, so only ints are allocated unless the
+    # denominator is too large, in which case fractions are compared instead.
+    indices = []
+    if _MAXIMUM_DENOMINATOR < denominator:
+        offsets = [abjad.Fraction(_, denominator) for _ in numerators]
+        for q_event_proxy in q_event_proxies:
+            fraction = q_event_proxy.offset().fraction
+            index = bisect.bisect_left(offsets, fraction)
+            if fraction != offsets[index]:
+                if not offsets[index] - fraction < fraction - offsets[index - 1]:
+                    index -= 1
+            indices.append(index)
+        return indices
+    for q_event_proxy in q_event_proxies:
+        numerator, proxy_denominator = (
+            q_event_proxy.offset().fraction.as_integer_ratio()
+        )
+        target = numerator * denominator
+        index = bisect.bisect_left(numerators, -(-target // proxy_denominator))
+        right_difference = numerators[index] * proxy_denominator - target
+        if right_difference:
+            left_difference = target - numerators[index - 1] * proxy_denominator
+            if not right_difference < left_difference:
+                index -= 1
+        indices.append(index)
+    return indices
+
+
+def _integer_distance(
+    numerators: typing.Sequence[int],
+    denominator: int,
+    q_event_proxies: typing.Sequence[_qeventproxy.QEventProxy],
+    leaf_indices: typing.Sequence[int],
+) -> abjad.Duration | None:
+    # Averages the distance of each proxy to the offset of its leaf. The sum
+    # is kept as a single int over the shared denominator of the leaf offsets
+    # and the proxy offsets, falling back to fractions if that is too large.
+    if not q_event_proxies:
+        return None
+    pairs = [_.offset().fraction.as_integer_ratio() for _ in q_event_proxies]
+    common_denominator = math.lcm(*(_[1] for _ in pairs))
+    if _MAXIMUM_DENOMINATOR < denominator * common_denominator:
+        fraction = abjad.Fraction(0)
+        for (numerator, proxy_denominator), index in zip(
+            pairs, leaf_indices, strict=True
+        ):
+            fraction += abs(
+                abjad.Fraction(numerator, proxy_denominator)
+                - abjad.Fraction(numerators[index], denominator)
+            )
+        fraction /= len(pairs)
+        return abjad.Duration(fraction.numerator, fraction.denominator)
+    total = 0
+    for (numerator, proxy_denominator), index in zip(pairs, leaf_indices, strict=True):
+        difference = numerator * denominator - numerators[index] * proxy_denominator
+        total += abs(difference) * (common_denominator // proxy_denominator)
+    return abjad.Duration(total, denominator * common_denominator * len(pairs))
+
+
+def _count_mutations(method: typing.Callable) -> typing.Callable:
+    # Wraps a mutating list method so that it bumps the list's version.
+
+    def wrapper(self, *arguments, **keywords):
+        self._version += 1
+        return method(self, *arguments, **keywords)
+
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+class _QEventProxyList(list):
+    # List of a q-grid leaf's proxies that counts its mutations, so that the
+    # leaf can tell whether its cached partition is still valid, whichever
+    # way the list was changed.
+
+    __slots__ = ("_version",)
+
+    def __init__(self, *arguments) -> None:
+        list.__init__(self, *arguments)
+        self._version = 0
+
+    def __reduce__(self):
+        return (type(self), (list(self),), (None, {"_version": self._version}))
+
+    __delitem__ = _count_mutations(list.__delitem__)
+    __iadd__ = _count_mutations(list.__iadd__)
+    __imul__ = _count_mutations(list.__imul__)
+    __setitem__ = _count_mutations(list.__setitem__)
+    append = _count_mutations(list.append)
+    clear = _count_mutations(list.clear)
+    extend = _count_mutations(list.extend)
+    insert = _count_mutations(list.insert)
+    pop = _count_mutations(list.pop)
+    remove = _count_mutations(list.remove)
+    reverse = _count_mutations(list.reverse)
+    sort = _count_mutations(list.sort)
+
 
 class QGridLeaf(abjad.rhythmtrees.RhythmTreeNode, uqbar.containers.UniqueTreeNode):
     """
@@ -37,7 +205,10 @@ class QGridLeaf(abjad.rhythmtrees.RhythmTreeNode, uqbar.containers.UniqueTreeNod
         assert isinstance(is_divisible, bool), repr(is_divisible)
         uqbar.containers.UniqueTreeNode.__init__(self)
         abjad.rhythmtrees.RhythmTreeNode.__init__(self, preprolated_duration.pair())
-        self._q_event_proxies = list(q_event_proxies)
+        self._q_event_proxies = _QEventProxyList(q_event_proxies)
+        self._q_event_proxy_partition: (
+            tuple[tuple[_qeventproxy.QEventProxy, ...], int, int] | None
+        ) = None
         self._is_divisible = is_divisible
 
     ### SPECIAL METHODS ###
@@ -72,6 +243,61 @@ class QGridLeaf(abjad.rhythmtrees.RhythmTreeNode, uqbar.containers.UniqueTreeNod
         string += f" is_divisible={self.is_divisible!r})"
         return string
 
+    ### PRIVATE METHODS ###
+
+    def _append_q_event_proxy(
+        self, q_event_proxy: _qeventproxy.QEventProxy, comparison: int
+    ) -> None:
+        # Appends proxy, whose offset compares to the leaf's offset with the
+        # sign of comparison, and files it in the partition.
+        preceding, aligned_count = self._get_q_event_proxy_partition()
+        self._q_event_proxies.append(q_event_proxy)
+        if comparison < 0:
+            preceding += (q_event_proxy,)
+        elif comparison == 0:
+            aligned_count += 1
+        self._set_q_event_proxy_partition(preceding, aligned_count)
+
+    def _get_q_event_proxy_partition(
+        self,
+    ) -> tuple[tuple[_qeventproxy.QEventProxy, ...], int]:
+        # Gets the proxies before the leaf's offset and the number of proxies
+        # exactly on it. QGrid files proxies as it fits and moves them, so the
+        # partition is only recomputed when the proxy list has been changed
+        # from outside, which bumps the list's version.
+        if not self._q_event_proxies:
+            return (), 0
+        partition = self._q_event_proxy_partition
+        if partition is not None and partition[2] == self._q_event_proxies._version:
+            return partition[0], partition[1]
+        start_offset = self.start_offset()
+        preceding, aligned_count = [], 0
+        for q_event_proxy in self._q_event_proxies:
+            offset = q_event_proxy.offset()
+            if offset < start_offset:
+                preceding.append(q_event_proxy)
+            elif offset == start_offset:
+                aligned_count += 1
+        self._set_q_event_proxy_partition(tuple(preceding), aligned_count)
+        return tuple(preceding), aligned_count
+
+    def _remove_preceding_q_event_proxies(self) -> list[_qeventproxy.QEventProxy]:
+        # Removes and returns the proxies before the leaf's offset.
+        preceding, aligned_count = self._get_q_event_proxy_partition()
+        if preceding:
+            identifiers = {id(_) for _ in preceding}
+            self._q_event_proxies[:] = [
+                _ for _ in self._q_event_proxies if id(_) not in identifiers
+            ]
+            self._set_q_event_proxy_partition((), aligned_count)
+        return list(preceding)
+
+    def _set_q_event_proxy_partition(
+        self, preceding: tuple[_qeventproxy.QEventProxy, ...], aligned_count: int
+    ) -> None:
+        version = self._q_event_proxies._version
+        self._q_event_proxy_partition = (preceding, aligned_count, version)
+
     ### PRIVATE PROPERTIES ###
 
     @property
@@ -99,7 +325,7 @@ class QGridLeaf(abjad.rhythmtrees.RhythmTreeNode, uqbar.containers.UniqueTreeNod
         """
         Gets preceding q-event proxies of q-grid leaf.
         """
-        return [x for x in self._q_event_proxies if x.offset() < self.start_offset()]
+        return list(self._get_q_event_proxy_partition()[0])
 
     @property
     def q_event_proxies(self) -> list[_qeventproxy.QEventProxy]:
@@ -121,7 +347,11 @@ class QGridLeaf(abjad.rhythmtrees.RhythmTreeNode, uqbar.containers.UniqueTreeNod
         """
         Gets succeeding q-event proxies of q-grid leaf.
         """
-        return [x for x in self._q_event_proxies if self.start_offset() <= x.offset()]
+        preceding, _ = self._get_q_event_proxy_partition()
+        if not preceding:
+            return list(self._q_event_proxies)
+        identifiers = {id(_) for _ in preceding}
+        return [_ for _ in self._q_event_proxies if id(_) not in identifiers]
 
 
 class QGridContainer(abjad.rhythmtrees.RhythmTreeContainer):
@@ -195,7 +425,13 @@ class QGrid:
 
     ### CLASS VARIABLES ###
 
-    __slots__ = ("_next_downbeat", "_root_node")
+    __slots__ = (
+        "_leaf_offset_table",
+        "_leaves",
+        "_next_downbeat",
+        "_offsets",
+        "_root_node",
+    )
 
     ### INITIALIZATION ###
 
@@ -217,6 +453,9 @@ class QGrid:
         self._next_downbeat = next_downbeat
         self._next_downbeat._offset = abjad.Offset(abjad.Fraction(1))
         self._next_downbeat._offsets_are_current = True
+        self._leaf_offset_table: _LeafOffsetTable | None = None
+        self._leaves: tuple[QGridLeaf, ...] | None = None
+        self._offsets: tuple[abjad.Offset, ...] | None = None
 
     ### SPECIAL METHODS ###
 
@@ -286,6 +525,152 @@ class QGrid:
         string += f" next_downbeat={self.next_downbeat!r})"
         return string
 
+    ### PRIVATE METHODS ###
+
+    def _copy_and_subdivide_leaves(
+        self, pairs: typing.Sequence[tuple[int, tuple[int, ...]]]
+    ) -> tuple["QGrid", list[_qeventproxy.QEventProxy]]:
+        """
+        Copies q-grid and subdivides the leaves of the copy described by
+        ``pairs``.
+
+        Equivalent to deep-copying the q-grid and calling ``subdivide_leaves()``
+        on the copy, but builds the new tree in a single pass without copying
+        the q-event proxies, which are shared between both q-grids.
+
+        Returns the copy together with the ``QEventProxies`` which need to be
+        refitted onto it.
+        """
+        subdivisions = dict(pairs)
+        leaves = self.leaves
+        indices = {id(leaf): i for i, leaf in enumerate(leaves)}
+        new_leaves: list[QGridLeaf] = []
+        proxy_lists = [list(leaf.q_event_proxies) for leaf in leaves]
+        partitions = [leaf._get_q_event_proxy_partition() for leaf in leaves]
+        q_event_proxies = []
+        for index in sorted(subdivisions):
+            q_event_proxies.extend(proxy_lists[index])
+            preceding, aligned_count = partitions[index + 1]
+            if preceding:
+                q_event_proxies.extend(preceding)
+                identifiers = {id(_) for _ in preceding}
+                proxy_lists[index + 1] = [
+                    _ for _ in proxy_lists[index + 1] if id(_) not in identifiers
+                ]
+                partitions[index + 1] = ((), aligned_count)
+
+        def make_leaf(leaf, index):
+            new_leaf = QGridLeaf(
+                abjad.Duration(*leaf.pair()), proxy_lists[index], leaf.is_divisible
+            )
+            if proxy_lists[index]:
+                new_leaf._set_q_event_proxy_partition(*partitions[index])
+            new_leaves.append(new_leaf)
+            return new_leaf
+
+        def recurse(node):
+            if isinstance(node, QGridContainer):
+                return QGridContainer(node.pair(), [recurse(_) for _ in node])
+            index = indices[id(node)]
+            if index in subdivisions:
+                durations = [
+                    _ if isinstance(_, abjad.Duration) else abjad.Duration(_)
+                    for _ in subdivisions[index]
+                ]
+                children = [QGridLeaf(preprolated_duration=_) for _ in durations]
+                new_leaves.extend(children)
+                return QGridContainer(node.pair(), children)
+            return make_leaf(node, index)
+
+        root_node = recurse(self._root_node)
+        next_downbeat = make_leaf(self._next_downbeat, len(leaves) - 1)
+        q_grid = type(self)(root_node, next_downbeat)
+        q_grid._leaves = tuple(new_leaves)
+        return q_grid, q_event_proxies
+
+    def _get_distance_table(
+        self,
+    ) -> tuple[tuple[int, ...], int, list[_qeventproxy.QEventProxy], list[int]]:
+        """
+        Gets the leaf offset numerators, their denominator, the q-event
+        proxies of the q-grid and the index of the leaf holding each proxy.
+        """
+        numerators, _, denominator = self._get_leaf_offset_table()
+        q_event_proxies, leaf_indices = [], []
+        for index, leaf in enumerate(self.leaves):
+            q_event_proxies.extend(leaf.q_event_proxies)
+            leaf_indices.extend([index] * len(leaf.q_event_proxies))
+        return numerators, denominator, q_event_proxies, leaf_indices
+
+    def _get_leaf_offset_table(self) -> _LeafOffsetTable:
+        """
+        Gets the offsets of all of the leaf nodes in the q-grid, including the
+        next downbeat, and the durations of the leaves of the q-grid's tree as
+        numerators over their least common denominator.
+
+        Tables are cached by RTM format, so that q-grids of the same shape walk
+        their tree only once, and on the q-grid until its tree changes.
+        """
+        if self._leaf_offset_table is not None:
+            return self._leaf_offset_table
+        key = self._root_node.rtm_format()
+        table = _leaf_offset_table_cache.get(key)
+        if table is not None:
+            self._leaf_offset_table = table
+            return table
+        fractions = []
+
+        def recurse(node, start, duration):
+            if isinstance(node, QGridLeaf):
+                fractions.append(start)
+                return start + duration
+            ratios = [abjad.Fraction(*_.pair()) for _ in node]
+            total = sum(ratios)
+            for child, ratio in zip(node, ratios, strict=True):
+                start = recurse(child, start, duration * ratio / total)
+            return start
+
+        recurse(self._root_node, abjad.Fraction(0), abjad.Fraction(1))
+        fractions.append(abjad.Fraction(1))
+        denominator = math.lcm(*(_.denominator for _ in fractions))
+        numerators = tuple(
+            _.numerator * (denominator // _.denominator) for _ in fractions
+        )
+        durations = tuple(b - a for a, b in zip(numerators, numerators[1:]))
+        table = (numerators, durations, denominator)
+        _leaf_offset_table_cache.set(key, table)
+        self._leaf_offset_table = table
+        return table
+
+    def _invalidate_leaves(self) -> None:
+        """
+        Clears the leaves, offsets and leaf offset table cached on the q-grid.
+
+        Called whenever the q-grid changes its own tree.
+        """
+        self._leaf_offset_table = None
+        self._leaves = None
+        self._offsets = None
+
+    def _partition_q_event_proxies(
+        self,
+    ) -> list[tuple[tuple[_qeventproxy.QEventProxy, ...], int, int]]:
+        """
+        Gets the preceding ``QEventProxies`` of each leaf in the q-grid,
+        including the next downbeat, together with the number of succeeding
+        ``QEventProxies`` and the number of those exactly on the leaf's
+        offset.
+
+        Leaves partition their ``QEventProxies`` as they are fitted, so this
+        does not compare offsets.
+        """
+        partitions = []
+        for leaf in self.leaves:
+            preceding, aligned_count = leaf._get_q_event_proxy_partition()
+            succeeding_count = len(leaf.q_event_proxies) - len(preceding)
+            partitions.append((preceding, succeeding_count, aligned_count))
+        return partitions
+
     ### PUBLIC PROPERTIES ###
 
     @property
@@ -347,28 +732,23 @@ class QGrid:
             Duration(numerator=1, denominator=8)
 
         """
-        count = 0
-        absolute_distance = abjad.Duration(0)
-        for leaf, offset in zip(self.leaves, self.offsets, strict=True):
-            for q_event_proxy in leaf.q_event_proxies:
-                absolute_distance += abs(q_event_proxy.offset() - offset)
-                count += 1
-        if count:
-            duration = absolute_distance / count
-            # return abjad.Duration(fraction)
-            assert isinstance(duration, abjad.Duration)
-            return duration
-        return None
+        return _integer_distance(*self._get_distance_table())
 
     @property
     def leaves(self) -> tuple[QGridLeaf, ...]:
         """
         Gets all of the leaf nodes in the QGrid, including the next downbeat's
         node.
+
+        Leaves are cached until ``subdivide_leaf()``, ``subdivide_leaves()`` or
+        ``regroup_leaves_with_unencessary_divisions()`` changes the tree.
         """
-        if isinstance(self._root_node, QGridLeaf):
-            return (self._root_node, self._next_downbeat)
-        return self._root_node.leaves + (self._next_downbeat,)
+        if self._leaves is None:
+            if isinstance(self._root_node, QGridLeaf):
+                self._leaves = (self._root_node, self._next_downbeat)
+            else:
+                self._leaves = self._root_node.leaves + (self._next_downbeat,)
+        return self._leaves
 
     @property
     def next_downbeat(self) -> QGridLeaf:
@@ -383,10 +763,12 @@ class QGrid:
         """
         Gets the offsets between 0 and 1 of all of the leaf nodes in the QGrid.
         """
-        return tuple(
-            [x.start_offset() for x in self.leaves[:-1]]
-            + [abjad.Offset(abjad.Fraction(1))]
-        )
+        if self._offsets is None:
+            numerators, _, denominator = self._get_leaf_offset_table()
+            self._offsets = tuple(
+                abjad.Offset(abjad.Fraction(_, denominator)) for _ in numerators
+            )
+        return self._offsets
 
     def pretty_rtm_format(self) -> str:
         """
@@ -409,6 +791,18 @@ class QGrid:
 
     ### PUBLIC METHODS ###
 
+    @staticmethod
+    def clear_leaf_offset_cache(maxsize: int | None = None) -> None:
+        """
+        Clears the process-wide cache of leaf offset tables and resets its
+        hit and miss counters.
+
+        Set ``maxsize`` to change the number of RTM shapes the cache holds.
+        """
+        if maxsize is not None:
+            assert isinstance(maxsize, int) and 0 <= maxsize, repr(maxsize)
+        _leaf_offset_table_cache.clear(maxsize)
+
     def fit_q_events(
         self, q_event_proxies: typing.Sequence[_qeventproxy.QEventProxy]
     ) -> None:
@@ -417,43 +811,83 @@ class QGrid:
         ``QGridLeaf`` whose offset is nearest.
         """
         assert all(isinstance(x, _qeventproxy.QEventProxy) for x in q_event_proxies)
-        leaves, offsets = self.leaves, self.offsets
-        for q_event_proxy in q_event_proxies:
-            idx = bisect.bisect_left(offsets, q_event_proxy.offset())
-            if q_event_proxy.offset() == offsets[idx]:
-                leaves[idx].q_event_proxies.append(q_event_proxy)
-            else:
-                left, right = offsets[idx - 1], offsets[idx]
-                left_diff = abs(left - q_event_proxy.offset())
-                right_diff = abs(right - q_event_proxy.offset())
-                if right_diff < left_diff:
-                    leaves[idx].q_event_proxies.append(q_event_proxy)
-                else:
-                    leaves[idx - 1].q_event_proxies.append(q_event_proxy)
+        leaves = self.leaves
+        numerators, _, denominator = self._get_leaf_offset_table()
+        indices = _fit_integer_offsets(numerators, denominator, q_event_proxies)
+        for q_event_proxy, index in zip(q_event_proxies, indices, strict=True):
+            numerator, proxy_denominator = (
+                q_event_proxy.offset().fraction.as_integer_ratio()
+            )
+            comparison = numerator * denominator - numerators[index] * proxy_denominator
+            leaves[index]._append_q_event_proxy(q_event_proxy, comparison)
+
+    @staticmethod
+    def leaf_offset_cache_info() -> dict[str, int]:
+        r"""
+        Gets hits, misses, maximum size and current size of the process-wide
+        cache of leaf offset tables.
+
+        ..  container:: example
+
+            >>> nauert.QGrid.clear_leaf_offset_cache()
+            >>> for _ in range(2):
+            ...     q_grid = nauert.QGrid()
+            ...     q_grid.fit_q_events(q_grid.subdivide_leaves([(0, (1, 1, 1))]))
+            ...
+            >>> q_grid.offsets
+            (Offset(Fraction(0, 1)), Offset(Fraction(1, 3)), Offset(Fraction(2, 3)), Offset(Fraction(1, 1)))
+
+            >>> nauert.QGrid().offsets
+            (Offset(Fraction(0, 1)), Offset(Fraction(1, 1)))
+
+            >>> nauert.QGrid.leaf_offset_cache_info()
+            {'hits': 1, 'misses': 2, 'maxsize': 4096, 'size': 2}
+
+        QGrids are keyed by the RTM format of their root node, so that all
+        QGrids of the same shape share one table. Each QGrid looks up its table
+        once and keeps it until its tree changes.
+        """
+        return _leaf_offset_table_cache.info()
 
     def regroup_leaves_with_unencessary_divisions(self) -> None:
         """
         Regroups leaves that belong to the same parent in which only the first
         leaf contains q_event_prox[y|ies].
+
+        Containers below the root node are regrouped bottom-up in a single
+        pass, so that regrouping a container may let its parent be regrouped
+        in turn.
         """
-        index = 0
-        while True:
-            leaf = self.leaves[index]
-            parent = leaf.parent
-            if isinstance(parent, QGridContainer):
-                leaves = parent.leaves
-                if len(leaves) > 1 and all(
-                    [_leaf.q_event_proxies == [] for _leaf in leaves[1:]]
-                ):
-                    new_leaf = QGridLeaf(
-                        preprolated_duration=abjad.Duration(*parent.pair()),
-                        q_event_proxies=leaves[0].q_event_proxies,
-                    )
-                    index = parent.parent.index(parent)
-                    parent.parent[index] = [new_leaf]
-            index += 1
-            if index == len(self.leaves):
-                break
+        changed = False
+
+        def recurse(node):
+            # Returns the first leaf of node and whether all of its other
+            # leaves are empty.
+            nonlocal changed
+            if isinstance(node, QGridLeaf):
+                return node, True
+            first_leaf, rest_are_empty = None, True
+            for index, child in enumerate(tuple(node)):
+                leaf, child_rest_is_empty = recurse(child)
+                if index == 0:
+                    first_leaf = leaf
+                elif leaf.q_event_proxies:
+                    rest_are_empty = False
+                rest_are_empty = rest_are_empty and child_rest_is_empty
+            if rest_are_empty and 1 < len(node) and node is not self._root_node:
+                new_leaf = QGridLeaf(
+                    preprolated_duration=abjad.Duration(*node.pair()),
+                    q_event_proxies=first_leaf.q_event_proxies,
+                )
+                parent = node.parent
+                parent[parent.index(node)] = [new_leaf]
+                changed = True
+                return new_leaf, True
+            return first_leaf, rest_are_empty
+
+        recurse(self._root_node)
+        if changed:
+            self._invalidate_leaves()
 
     def sort_q_events_by_index(self) -> None:
         """
@@ -496,10 +930,11 @@ class QGrid:
         # otherwise, our root node if just a QGridLeaf
         else:
             self._root_node = container
+        self._invalidate_leaves()
         return leaf.q_event_proxies
 
     def subdivide_leaves(
-        self, pairs: typing.Sequence[tuple[int, tuple[int, int]]]
+        self, pairs: typing.Sequence[tuple[int, tuple[int, ...]]]
     ) -> list[_qeventproxy.QEventProxy]:
         r"""
         Given a sequence of leaf-index:subdivision-ratio pairs ``pairs``,
@@ -514,17 +949,346 @@ class QGrid:
         leaf_indices = [pair[0] for pair in pairs]
         subdivisions = [pair[1] for pair in pairs]
         all_leaves = self.leaves
-        leaves_to_subdivide = [all_leaves[idx] for idx in leaf_indices]
         q_event_proxies = []
-        for i, leaf in enumerate(leaves_to_subdivide):
-            next_leaf = all_leaves[all_leaves.index(leaf) + 1]
-            if next_leaf is self.next_downbeat:
-                next_leaf_offset = abjad.Offset(abjad.Fraction(1))
-            else:
-                next_leaf_offset = next_leaf.start_offset()
-            q_event_proxies.extend(self.subdivide_leaf(leaf, subdivisions[i]))
-            for q_event_proxy in tuple(next_leaf.q_event_proxies):
-                if q_event_proxy.offset() < next_leaf_offset:
-                    idx = next_leaf.q_event_proxies.index(q_event_proxy)
-                    q_event_proxies.append(next_leaf.q_event_proxies.pop(idx))
+        for leaf_index, subdivision in zip(leaf_indices, subdivisions, strict=True):
+            next_leaf = all_leaves[leaf_index + 1]
+            preceding = next_leaf._remove_preceding_q_event_proxies()
+            q_event_proxies.extend(
+                self.subdivide_leaf(all_leaves[leaf_index], subdivision)
+            )
+            q_event_proxies.extend(preceding)
         return q_event_proxies
+
+
+class CompactQGrid:
+    r"""
+    Compact q-grid.
+
+    Array-backed stand-in for ``QGrid`` used during the search phase of a
+    ``QuantizationJob``.
+
+    ..  container:: example
+
+        Instead of a rhythm tree, ``CompactQGrids`` store the start offset of
+        each leaf as an integer numerator over a common denominator, the
+        parentage ratios of each leaf, and the index of the leaf onto which
+        each ``QEventProxy`` is fitted:
+
+        >>> q_event_a = nauert.PitchedQEvent(abjad.duration.offset(250), [0])
+        >>> q_event_b = nauert.PitchedQEvent(abjad.duration.offset(750), [1])
+        >>> proxy_a = nauert.QEventProxy(q_event_a, abjad.duration.offset(1, 4))
+        >>> proxy_b = nauert.QEventProxy(q_event_b, abjad.duration.offset(3, 4))
+        >>> compact_q_grid = nauert.CompactQGrid([proxy_a, proxy_b])
+        >>> compact_q_grid.numerators, compact_q_grid.denominator
+        ((0, 1), 1)
+
+        >>> compact_q_grid.leaf_indices
+        (0, 1)
+
+        Subdividing leaves returns a new ``CompactQGrid``:
+
+        >>> compact_q_grid = compact_q_grid.subdivide_leaves([(0, (1, 1, 1))])
+        >>> compact_q_grid.numerators, compact_q_grid.denominator
+        ((0, 1, 2, 3), 3)
+
+        >>> compact_q_grid.leaf_indices
+        (1, 2)
+
+        >>> compact_q_grid.distance
+        Duration(numerator=1, denominator=12)
+
+    ..  container:: example
+
+        ``CompactQGrids`` convert to ``QGrids`` on demand:
+
+        >>> q_grid = compact_q_grid.to_q_grid()
+        >>> print(q_grid.rtm_format())
+        (1 (1 1 1))
+
+        >>> q_grid.distance
+        Duration(numerator=1, denominator=12)
+
+    Used internally by ``QuantizationJob``.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = (
+        "_commands",
+        "_denominator",
+        "_leaf_indices",
+        "_numerators",
+        "_parentage_ratios",
+        "_q_event_proxies",
+    )
+
+    ### INITIALIZATION ###
+
+    def __init__(
+        self, q_event_proxies: typing.Sequence[_qeventproxy.QEventProxy] = ()
+    ) -> None:
+        assert all(isinstance(x, _qeventproxy.QEventProxy) for x in q_event_proxies)
+        self._commands: tuple[tuple[tuple[int, tuple[int, ...]], ...], ...] = ()
+        self._denominator = 1
+        self._numerators: tuple[int, ...] = (0, 1)
+        self._parentage_ratios: tuple[tuple[tuple[int, int], ...], ...] = (((1, 1),),)
+        self._q_event_proxies = tuple(q_event_proxies)
+        self._leaf_indices = self._fit_q_events()
+
+    ### SPECIAL METHODS ###
+
+    def __eq__(self, argument) -> bool:
+        """
+        Is true when `argument` is a compact q-grid with subdivision commands
+        and q-event proxies equal to those of this compact q-grid. Otherwise
+        false.
+        """
+        if type(self) is type(argument):
+            if self.commands == argument.commands:
+                if self.q_event_proxies == argument.q_event_proxies:
+                    return True
+        return False
+
+    def __hash__(self) -> int:
+        """
+        Hashes compact q-grid.
+
+        Required to be explicitly redefined on Python 3 if __eq__ changes.
+        """
+        return super(CompactQGrid, self).__hash__()
+
+    def __repr__(self) -> str:
+        """
+        Gets repr.
+        """
+        string = f"{type(self).__name__}({self.rtm_format()!r},"
+        string += f" numerators={self.numerators!r},"
+        string += f" denominator={self.denominator!r},"
+        string += f" leaf_indices={self.leaf_indices!r})"
+        return string
+
+    ### PRIVATE METHODS ###
+
+    def _find_divisible_leaf_indices(self) -> list[int]:
+        numerators, denominator = self._numerators, self._denominator
+        next_downbeat_index = len(numerators) - 1
+        indices = set()
+        for q_event_proxy, index in zip(
+            self._q_event_proxies, self._leaf_indices, strict=True
+        ):
+            numerator, proxy_denominator = (
+                q_event_proxy.offset().fraction.as_integer_ratio()
+            )
+            difference = numerator * denominator - numerators[index] * proxy_denominator
+            if difference < 0:
+                indices.add(index - 1)
+            elif 0 < difference and index < next_downbeat_index:
+                indices.add(index)
+        return sorted(indices)
+
+    def _fit_q_events(self) -> tuple[int, ...]:
+        return tuple(
+            _fit_integer_offsets(
+                self._numerators, self._denominator, self._q_event_proxies
+            )
+        )
+
+    def _get_distance_table(
+        self,
+    ) -> tuple[
+        tuple[int, ...],
+        int,
+        tuple[_qeventproxy.QEventProxy, ...],
+        tuple[int, ...],
+    ]:
+        return (
+            self._numerators,
+            self._denominator,
+            self._q_event_proxies,
+            self._leaf_indices,
+        )
+
+    def _get_subdivided_shape(
+        self,
+        subdivisions: typing.Mapping[int, tuple[int, ...]],
+        child_ratios: typing.Mapping[tuple[int, ...], tuple[tuple[int, int], ...]],
+    ) -> tuple[tuple[int, ...], int, tuple[tuple[tuple[int, int], ...], ...]]:
+        # Gets the leaf offset numerators, their denominator and the parentage
+        # ratios of the compact q-grid with leaves subdivided by subdivisions.
+        numerators = self._numerators
+        factor = 1
+        for index, ratio in subdivisions.items():
+            duration, total = numerators[index + 1] - numerators[index], sum(ratio)
+            factor = math.lcm(factor, total // math.gcd(duration, total))
+        new_numerators, parentage_ratios = [], []
+        for index, parentage in enumerate(self._parentage_ratios):
+            numerator = numerators[index] * factor
+            if index not in subdivisions:
+                new_numerators.append(numerator)
+                parentage_ratios.append(parentage)
+                continue
+            ratio = subdivisions[index]
+            step = (numerators[index + 1] - numerators[index]) * factor // sum(ratio)
+            for part, child_ratio in zip(ratio, child_ratios[ratio], strict=True):
+                new_numerators.append(numerator)
+                parentage_ratios.append(parentage + (child_ratio,))
+                numerator += part * step
+        new_numerators.append(self._denominator * factor)
+        divisor = math.gcd(*new_numerators)
+        return (
+            tuple(_ // divisor for _ in new_numerators),
+            self._denominator * factor // divisor,
+            tuple(parentage_ratios),
+        )
+
+    def _make_subdivided_q_grid(
+        self,
+        commands: tuple[tuple[tuple[int, tuple[int, ...]], ...], ...],
+        shape: tuple[tuple[int, ...], int, tuple[tuple[tuple[int, int], ...], ...]],
+    ) -> "CompactQGrid":
+        # Makes the compact q-grid with the given subdivision commands and
+        # shape, and fits the compact q-grid's proxies onto it.
+        compact_q_grid = object.__new__(type(self))
+        compact_q_grid._commands = commands
+        compact_q_grid._numerators = shape[0]
+        compact_q_grid._denominator = shape[1]
+        compact_q_grid._parentage_ratios = shape[2]
+        compact_q_grid._q_event_proxies = self._q_event_proxies
+        compact_q_grid._leaf_indices = compact_q_grid._fit_q_events()
+        return compact_q_grid
+
+    def _subdivide_leaves(
+        self,
+        pairs: typing.Sequence[tuple[int, tuple[int, ...]]],
+        child_ratios: typing.Mapping[tuple[int, ...], tuple[tuple[int, int], ...]],
+    ) -> "CompactQGrid":
+        subdivisions = dict(pairs)
+        commands = self._commands + (tuple(sorted(subdivisions.items())),)
+        shape = self._get_subdivided_shape(subdivisions, child_ratios)
+        return self._make_subdivided_q_grid(commands, shape)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def commands(self) -> tuple[tuple[tuple[int, tuple[int, ...]], ...], ...]:
+        """
+        Gets the subdivision commands which derive the compact q-grid from a
+        single-leaf q-grid, in order.
+        """
+        return self._commands
+
+    @property
+    def denominator(self) -> int:
+        """
+        Gets the common denominator of the leaf offsets.
+        """
+        return self._denominator
+
+    @property
+    def distance(self) -> abjad.Duration | None:
+        """
+        Gets the same distance as ``QGrid.distance``.
+        """
+        return _integer_distance(*self._get_distance_table())
+
+    @property
+    def leaf_indices(self) -> tuple[int, ...]:
+        """
+        Gets the index of the leaf onto which each ``QEventProxy`` is fitted.
+
+        The index of the next downbeat is equal to the number of leaves in the
+        compact q-grid's tree.
+        """
+        return self._leaf_indices
+
+    @property
+    def numerators(self) -> tuple[int, ...]:
+        """
+        Gets the numerators of the leaf offsets, including the next downbeat.
+        """
+        return self._numerators
+
+    @property
+    def offsets(self) -> tuple[abjad.Offset, ...]:
+        """
+        Gets the same offsets as ``QGrid.offsets``.
+        """
+        denominator = self._denominator
+        return tuple(
+            abjad.Offset(abjad.Fraction(_, denominator)) for _ in self._numerators
+        )
+
+    @property
+    def parentage_ratios(self) -> tuple[tuple[tuple[int, int], ...], ...]:
+        """
+        Gets the parentage ratios of each leaf, excluding the next downbeat.
+        """
+        return self._parentage_ratios
+
+    @property
+    def q_event_proxies(self) -> tuple[_qeventproxy.QEventProxy, ...]:
+        """
+        Gets q-event proxies of compact q-grid.
+        """
+        return self._q_event_proxies
+
+    ### PUBLIC METHODS ###
+
+    def rtm_format(self) -> str:
+        """
+        Gets the RTM format of the compact q-grid.
+        """
+
+        def recurse(node):
+            if len(node) == 1:
+                return str(node[0])
+            string = " ".join(recurse(_) for _ in node[1])
+            return f"({node[0]} ({string}))"
+
+        root: list = [1]
+        leaves = [root]
+        for command in self._commands:
+            subdivisions = dict(command)
+            new_leaves = []
+            for index, leaf in enumerate(leaves):
+                if index in subdivisions:
+                    children = [[_] for _ in subdivisions[index]]
+                    leaf.append(children)
+                    new_leaves.extend(children)
+                else:
+                    new_leaves.append(leaf)
+            leaves = new_leaves
+        return recurse(root)
+
+    def subdivide_leaves(
+        self, pairs: typing.Sequence[tuple[int, tuple[int, ...]]]
+    ) -> "CompactQGrid":
+        """
+        Given a sequence of leaf-index:subdivision-ratio pairs ``pairs``,
+        subdivides the leaves described by the indices and refits the
+        ``QEventProxies``.
+
+        Returns new compact q-grid.
+        """
+        pairs = [(index, tuple(ratio)) for index, ratio in pairs]
+        child_ratios = {}
+        for _, ratio in pairs:
+            total = sum(ratio)
+            child_ratios[ratio] = tuple(
+                abjad.Fraction(_, total).as_integer_ratio() for _ in ratio
+            )
+        return self._subdivide_leaves(pairs, child_ratios)
+
+    def to_q_grid(self) -> QGrid:
+        """
+        Converts compact q-grid to an equivalent ``QGrid``.
+
+        Replays the compact q-grid's subdivision commands, so that the
+        ``QEventProxies`` attached to each leaf and their order are identical
+        to those found by searching with ``QGrids`` directly.
+        """
+        q_grid = QGrid()
+        q_grid.fit_q_events(self._q_event_proxies)
+        for command in self._commands:
+            q_grid.fit_q_events(q_grid.subdivide_leaves(command))
+        return q_grid
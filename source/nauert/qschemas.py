@@ -1,6 +1,7 @@
 import abc
 import bisect
 import copy
+import typing
 
 import abjad
 
@@ -30,7 +31,7 @@ class QSchema(abc.ABC):
 
     ### CLASS VARIABLES ###
 
-    __slots__ = ("_items", "_lookups")
+    __slots__ = ("_breakpoints", "_items", "_lookups")
 
     _keyword_argument_names: tuple[str, ...] = ()
 
@@ -67,6 +68,9 @@ class QSchema(abc.ABC):
             assert 0 <= min(items)
         self._items = dict(items)
         self._lookups = self._create_lookups()
+        self._breakpoints = {
+            field: tuple(sorted(lookup)) for field, lookup in self._lookups.items()
+        }
 
     ### SPECIAL METHODS ###
 
@@ -75,16 +79,7 @@ class QSchema(abc.ABC):
         Calls QSchema on ``duration``.
         """
         assert isinstance(duration, abjad.Duration), repr(duration)
-        target_items = []
-        idx, current_offset = 0, abjad.Offset(abjad.Fraction(0))
-        # while current_offset.fraction < duration:
-        while current_offset.duration() < duration:
-            lookup = self[idx]
-            lookup["offset_in_ms"] = current_offset
-            target_item = self.target_item_class(**lookup)
-            target_items.append(target_item)
-            current_offset += target_item.duration_in_ms
-            idx += 1
+        target_items = list(self.iterate_target_items(duration))
         return self.target_class(target_items)
 
     def __getitem__(self, argument: int) -> dict:
@@ -93,18 +88,11 @@ class QSchema(abc.ABC):
         """
         assert isinstance(argument, int) and 0 <= argument
         result = {}
-        for field in self._lookups:
-            lookup = self._lookups[field].get(argument)
-            if lookup is not None:
-                result[field] = lookup
-            else:
-                keys = sorted(self._lookups[field].keys())
-                idx = bisect.bisect(keys, argument)
-                if len(keys) == idx:
-                    key = keys[-1]
-                elif argument < keys[idx]:
-                    key = keys[idx - 1]
-                result[field] = self._lookups[field][key]
+        for field, lookup in self._lookups.items():
+            # every field has a breakpoint at 0, which holds its default
+            breakpoints = self._breakpoints[field]
+            key = breakpoints[bisect.bisect(breakpoints, argument) - 1]
+            result[field] = lookup[key]
         return result
 
     ### PRIVATE METHODS ###
@@ -165,6 +153,40 @@ class QSchema(abc.ABC):
         """
         return self._tempo
 
+    ### PUBLIC METHODS ###
+
+    def iterate_target_items(
+        self, duration: abjad.Duration | None = None
+    ) -> typing.Iterator[_qtargetitems.QTargetItem]:
+        r"""
+        Iterates target items of q-schema, one time-step at a time, until
+        ``duration`` in milliseconds is covered.
+
+        ..  container:: example
+
+            >>> q_schema = nauert.MeasurewiseQSchema(
+            ...     {2: {"time_signature": abjad.TimeSignature((3, 4))}},
+            ... )
+            >>> for item in q_schema.iterate_target_items(abjad.Duration(10000)):
+            ...     print(item.offset_in_ms.fraction, item.time_signature.pair)
+            ...
+            0 (4, 4)
+            4000 (4, 4)
+            8000 (3, 4)
+
+        Items are created on demand; iteration never stops when ``duration``
+        is none.
+        """
+        assert duration is None or isinstance(duration, abjad.Duration)
+        index, current_offset = 0, abjad.Offset(abjad.Fraction(0))
+        while duration is None or current_offset.duration() < duration:
+            lookup = self[index]
+            lookup["offset_in_ms"] = current_offset
+            target_item = self.target_item_class(**lookup)
+            yield target_item
+            current_offset += target_item.duration_in_ms
+            index += 1
+
 
 class BeatwiseQSchema(QSchema):
     r"""
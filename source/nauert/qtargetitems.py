@@ -1,4 +1,5 @@
 import abc
+import typing
 
 import abjad
 
@@ -77,34 +78,49 @@ class QTargetBeat(QTargetItem):
         assert isinstance(tempo, abjad.MetronomeMark), repr(tempo)
         assert not tempo.is_imprecise()
         q_events: list[_qevents.QEvent] = []
-        q_grids: tuple[_qgrid.QGrid, ...] = ()
+        q_grids: tuple[_qgrid.QGrid | _qgrid.CompactQGrid, ...] = ()
         self._beatspan = beatspan
         self._offset_in_ms = offset_in_ms
         self._q_events = q_events
-        self._q_grid: _qgrid.QGrid | None = None
+        self._q_grid: _qgrid.QGrid | _qgrid.CompactQGrid | None = None
         self._q_grids = q_grids
         self._search_tree = search_tree
         self._tempo = tempo
 
     ### SPECIAL METHODS ###
 
-    def __call__(self, job_id: int) -> _quantizationjob.QuantizationJob | None:
+    def __call__(
+        self,
+        job_id: int,
+        compact_q_grids: bool = False,
+        best_first: bool = False,
+        retained_q_grid_count: int | None = None,
+        max_q_grid_count: int | None = None,
+        max_expansion_depth: int | None = None,
+        time_limit: float | None = None,
+        q_grid_key: typing.Callable | None = None,
+    ) -> _quantizationjob.QuantizationJob | None:
         """
         Calls q-target beat.
         """
         if not self.q_events:
             return None
-        assert all(isinstance(x, _qevents.QEvent) for x in self.q_events)
-        q_event_proxies = []
-        for q_event in self.q_events:
-            q_event_proxy = _qeventproxy.QEventProxy(
-                q_event,
-                self.offset_in_ms,
-                self.offset_in_ms + self.duration_in_ms,
-            )
-            q_event_proxies.append(q_event_proxy)
+        q_event_proxies = _qeventproxy.QEventProxy._from_q_events(
+            self.q_events,
+            self.offset_in_ms,
+            self.offset_in_ms + self.duration_in_ms,
+        )
         return _quantizationjob.QuantizationJob(
-            job_id, self.search_tree, q_event_proxies
+            job_id,
+            self.search_tree,
+            q_event_proxies,
+            compact_q_grids=compact_q_grids,
+            best_first=best_first,
+            retained_q_grid_count=retained_q_grid_count,
+            max_q_grid_count=max_q_grid_count,
+            max_expansion_depth=max_expansion_depth,
+            time_limit=time_limit,
+            q_grid_key=q_grid_key,
         )
 
     def __repr__(self) -> str:
@@ -201,14 +217,20 @@ class QTargetBeat(QTargetItem):
         """
         The ``QGrid`` instance selected by a ``Heuristic``.
 
+        A selected ``CompactQGrid`` is converted to a ``QGrid`` on first
+        access.
+
         Used internally by the ``quantize`` function.
         """
+        if isinstance(self._q_grid, _qgrid.CompactQGrid):
+            self._q_grid = self._q_grid.to_q_grid()
         return self._q_grid
 
     @property
-    def q_grids(self) -> tuple[_qgrid.QGrid, ...]:
+    def q_grids(self) -> tuple[_qgrid.QGrid | _qgrid.CompactQGrid, ...]:
         """
-        A tuple of ``QGrids`` generated by a ``QuantizationJob``.
+        A tuple of ``QGrids`` or ``CompactQGrids`` generated by a
+        ``QuantizationJob``.
 
         Used internally by the ``quantize`` function.
         """
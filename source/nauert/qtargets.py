@@ -1,18 +1,52 @@
 import abc
+import asyncio
 import bisect
+import concurrent.futures
 import copy
+import time
 import typing
 
 import abjad
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
 from . import attackpointoptimizers as _attackpointoptimizers
 from . import gracehandlers as _gracehandlers
 from . import heuristics as _heuristics
+from . import jobcaches as _jobcaches
 from . import jobhandlers as _jobhandlers
 from . import qeventproxy as _qeventproxy
 from . import qevents as _qevents
 from . import qeventsequence as _qeventsequence
 from . import qtargetitems as _qtargetitems
+from . import quantizationjob as _quantizationjob
+from . import quantizationreport as _quantizationreport
+
+
+def _get_beat_indices(
+    beat_offsets: typing.Sequence[abjad.Offset],
+    q_event_offsets: typing.Sequence[abjad.Offset],
+) -> list[int]:
+    """
+    Gets index of beat containing each q-event offset.
+
+    Searches float offsets with NumPy when NumPy is available. Float
+    conversion is monotonic, so a float search can only differ from the exact
+    rational search when a q-event offset rounds onto its beat's offset; those
+    q-event offsets are bisected exactly.
+    """
+    if numpy is None or not q_event_offsets:
+        return [bisect.bisect(beat_offsets, _) - 1 for _ in q_event_offsets]
+    beat_floats = numpy.array([float(_.fraction) for _ in beat_offsets])
+    q_event_floats = numpy.array([float(_.fraction) for _ in q_event_offsets])
+    indices = numpy.searchsorted(beat_floats, q_event_floats, side="right") - 1
+    ties = numpy.flatnonzero(beat_floats[indices] == q_event_floats)
+    for i in ties.tolist():
+        indices[i] = bisect.bisect(beat_offsets, q_event_offsets[i]) - 1
+    return indices.tolist()
 
 
 class QTarget(abc.ABC):
@@ -55,10 +89,70 @@ class QTarget(abc.ABC):
             _attackpointoptimizers.AttackPointOptimizer | None
         ) = None,
         attach_tempos: bool = True,
+        compact_q_grids: bool = False,
+        best_first: bool = False,
+        retained_q_grid_count: int | None = None,
+        max_q_grid_count: int | None = None,
+        max_expansion_depth: int | None = None,
+        time_limit: float | None = None,
+        job_cache: _jobcaches.JobCache | None = None,
+        report: _quantizationreport.QuantizationReport | None = None,
     ):
         """
         Calls q-target.
         """
+        grace_handler, heuristic, attack_point_optimizer = self._check_arguments(
+            q_event_sequence, grace_handler, heuristic, attack_point_optimizer
+        )
+        if job_handler is None:
+            job_handler = _jobhandlers.SerialJobHandler()
+        assert isinstance(job_handler, _jobhandlers.JobHandler)
+        if report is not None:
+            assert isinstance(report, _quantizationreport.QuantizationReport)
+            report._clear()
+        jobs = self._make_jobs(
+            q_event_sequence,
+            heuristic,
+            compact_q_grids=compact_q_grids,
+            best_first=best_first,
+            retained_q_grid_count=retained_q_grid_count,
+            max_q_grid_count=max_q_grid_count,
+            max_expansion_depth=max_expansion_depth,
+            time_limit=time_limit,
+            returned_q_grid_count=job_handler.returned_q_grid_count,
+            report=report,
+        )
+        start = time.perf_counter()
+        if job_cache is None:
+            jobs = job_handler(jobs)
+        else:
+            assert isinstance(job_cache, _jobcaches.JobCache)
+            jobs = job_cache(jobs, job_handler)
+        if report is not None:
+            report._lap("search", start)
+            report._record_jobs(jobs)
+        return self._finish(
+            jobs,
+            heuristic,
+            grace_handler,
+            attack_point_optimizer,
+            attach_tempos=attach_tempos,
+            report=report,
+        )
+
+    ### PRIVATE METHODS ###
+
+    def _check_arguments(
+        self,
+        q_event_sequence: _qeventsequence.QEventSequence,
+        grace_handler: _gracehandlers.GraceHandler | None,
+        heuristic: _heuristics.Heuristic | None,
+        attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer | None,
+    ) -> tuple[
+        _gracehandlers.GraceHandler,
+        _heuristics.Heuristic,
+        _attackpointoptimizers.AttackPointOptimizer,
+    ]:
         assert isinstance(q_event_sequence, _qeventsequence.QEventSequence)
         if grace_handler is None:
             grace_handler = _gracehandlers.ConcatenatingGraceHandler()
@@ -66,9 +160,6 @@ class QTarget(abc.ABC):
         if heuristic is None:
             heuristic = _heuristics.DistanceHeuristic()
         assert isinstance(heuristic, _heuristics.Heuristic)
-        if job_handler is None:
-            job_handler = _jobhandlers.SerialJobHandler()
-        assert isinstance(job_handler, _jobhandlers.JobHandler)
         if attack_point_optimizer is None:
             attack_point_optimizer = _attackpointoptimizers.NaiveAttackPointOptimizer()
         assert isinstance(
@@ -82,44 +173,109 @@ class QTarget(abc.ABC):
                 self.__class__.__name__, attack_point_optimizer.__class__.__name__
             )
             raise TypeError(message)
-        # parcel QEvents out to each beat
+        return grace_handler, heuristic, attack_point_optimizer
+
+    def _finish(
+        self,
+        jobs: typing.Sequence[_quantizationjob.QuantizationJob],
+        heuristic: _heuristics.Heuristic,
+        grace_handler: _gracehandlers.GraceHandler,
+        attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer,
+        attach_tempos: bool = True,
+        report: _quantizationreport.QuantizationReport | None = None,
+    ) -> abjad.Voice:
+        start = time.perf_counter()
         beats = self.beats
-        offsets = sorted([beat.offset_in_ms for beat in beats])
-        for q_event in q_event_sequence:
-            index = bisect.bisect(offsets, q_event.offset()) - 1
-            beat = beats[index]
-            beat.q_events.append(q_event)
-        # generate QuantizationJobs and process with the JobHandler
-        jobs = [beat(i) for i, beat in enumerate(beats)]
-        jobs = [job for job in jobs if job]
-        jobs = job_handler(jobs)
         for job in jobs:
             assert job is not None
             beats[job.job_id]._q_grids = job.q_grids
         # select the best QGrid for each beat, according to the Heuristic
         beats = heuristic(beats)
+        if report is not None:
+            report._record_beats(beats)
+            start = report._lap("select_q_grids", start)
         # shift QEvents attached to each QGrid's "next downbeat"
         # over to the next QGrid's first leaf - the real downbeat
         orphaned_q_events_proxies = self._shift_downbeat_q_events_to_next_q_grid()
+        if report is not None:
+            start = report._lap("shift_downbeats", start)
         # TODO: handle a final QGrid with QEvents attached to its next_downbeat
         # TODO: remove a final QGrid with no QEvents
         self._regroup_q_grid_with_unnecessary_divisions()
+        if report is not None:
+            start = report._lap("regroup", start)
+            nested_time = report._stage_times["handle_graces"]
+            nested_time += report._stage_times["optimize_attack_points"]
         # convert the QGrid representation into notation,
         # handling grace-note behavior with the GraceHandler
         notation = self._notate(
             attach_tempos=attach_tempos,
             attack_point_optimizer=attack_point_optimizer,
             grace_handler=grace_handler,
+            report=report,
         )
+        if report is not None:
+            nested_time -= report._stage_times["handle_graces"]
+            nested_time -= report._stage_times["optimize_attack_points"]
+            report._add_stage_time("notate", nested_time)
+            start = report._lap("notate", start)
         handle_orphaned_q_events = getattr(
             grace_handler, "handle_orphaned_q_event_proxies", None
         )
         if callable(handle_orphaned_q_events) and orphaned_q_events_proxies:
             last_leaf = abjad.get.leaf(notation, -1)
             handle_orphaned_q_events(last_leaf, orphaned_q_events_proxies)
+        if report is not None:
+            report._lap("handle_graces", start)
         return notation
 
-    ### PRIVATE METHODS ###
+    def _make_jobs(
+        self,
+        q_event_sequence: _qeventsequence.QEventSequence,
+        heuristic: _heuristics.Heuristic,
+        compact_q_grids: bool = False,
+        best_first: bool = False,
+        retained_q_grid_count: int | None = None,
+        max_q_grid_count: int | None = None,
+        max_expansion_depth: int | None = None,
+        time_limit: float | None = None,
+        returned_q_grid_count: int | None = None,
+        report: _quantizationreport.QuantizationReport | None = None,
+    ) -> list[_quantizationjob.QuantizationJob]:
+        q_grid_key = None
+        if retained_q_grid_count is not None:
+            q_grid_key = _heuristics._get_retaining_q_grid_key(heuristic)
+        elif returned_q_grid_count is not None:
+            q_grid_key = _heuristics._get_retaining_q_grid_key(
+                heuristic, "returned_q_grid_count"
+            )
+        # parcel QEvents out to each beat
+        start = time.perf_counter()
+        beats = self.beats
+        offsets = sorted([beat.offset_in_ms for beat in beats])
+        q_events = list(q_event_sequence)
+        indices = _get_beat_indices(offsets, [_.offset() for _ in q_events])
+        for index, q_event in zip(indices, q_events):
+            beats[index].q_events.append(q_event)
+        if report is not None:
+            start = report._lap("assign_beats", start)
+        # generate QuantizationJobs
+        jobs = [
+            beat(
+                i,
+                compact_q_grids=compact_q_grids,
+                best_first=best_first,
+                retained_q_grid_count=retained_q_grid_count,
+                max_q_grid_count=max_q_grid_count,
+                max_expansion_depth=max_expansion_depth,
+                time_limit=time_limit,
+                q_grid_key=q_grid_key,
+            )
+            for i, beat in enumerate(beats)
+        ]
+        if report is not None:
+            report._lap("make_jobs", start)
+        return [job for job in jobs if job]
 
     @abc.abstractmethod
     def _notate(
@@ -127,20 +283,27 @@ class QTarget(abc.ABC):
         grace_handler: _gracehandlers.GraceHandler,
         attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer,
         attach_tempos: bool = True,
+        report: _quantizationreport.QuantizationReport | None = None,
     ) -> abjad.Voice:
         raise NotImplementedError
 
     def _notate_leaves(
         self,
         grace_handler: _gracehandlers.GraceHandler,
-        voice: abjad.Voice | None = None,
+        voice: abjad.Container | None = None,
+        report: _quantizationreport.QuantizationReport | None = None,
     ):
         for leaf in abjad.iterate.leaves(voice):
             duration = leaf.written_duration()
             if abjad.get.has_indicator(leaf, dict):
                 annotation = abjad.get.indicator(leaf, dict)
                 q_events = annotation["q_events"]
-                pitches, attachments, grace_container = grace_handler(q_events)
+                if report is None:
+                    pitches, attachments, grace_container = grace_handler(q_events)
+                else:
+                    start = time.perf_counter()
+                    pitches, attachments, grace_container = grace_handler(q_events)
+                    report._lap("handle_graces", start)
                 new_leaf: abjad.Leaf
                 if not pitches:
                     new_leaf = abjad.Rest.from_duration(duration)
@@ -234,6 +397,94 @@ class QTarget(abc.ABC):
         """
         return self._items
 
+    ### PUBLIC METHODS ###
+
+    async def call_async(
+        self,
+        q_event_sequence: _qeventsequence.QEventSequence,
+        grace_handler: _gracehandlers.GraceHandler | None = None,
+        heuristic: _heuristics.Heuristic | None = None,
+        executor: concurrent.futures.Executor | None = None,
+        attack_point_optimizer: (
+            _attackpointoptimizers.AttackPointOptimizer | None
+        ) = None,
+        attach_tempos: bool = True,
+        compact_q_grids: bool = False,
+        best_first: bool = False,
+        retained_q_grid_count: int | None = None,
+        max_q_grid_count: int | None = None,
+        max_expansion_depth: int | None = None,
+        time_limit: float | None = None,
+        job_cache: _jobcaches.JobCache | None = None,
+        report: _quantizationreport.QuantizationReport | None = None,
+    ) -> abjad.Voice:
+        """
+        Calls q-target without blocking the running event loop.
+
+        Each ``QuantizationJob`` is run in ``executor``, largest first, and
+        awaited in turn, so that the event loop runs between beats. Cancelling
+        the call cancels every job not yet started. ``executor`` defaults to
+        the event loop's default executor; executors may be shared between
+        concurrent calls.
+
+        Selecting ``QGrids`` and notating the voice run in the event loop's
+        default executor, which shares the q-target's beats with the event
+        loop's thread rather than copying them to another process.
+        """
+        grace_handler, heuristic, attack_point_optimizer = self._check_arguments(
+            q_event_sequence, grace_handler, heuristic, attack_point_optimizer
+        )
+        if report is not None:
+            assert isinstance(report, _quantizationreport.QuantizationReport)
+            report._clear()
+        jobs = self._make_jobs(
+            q_event_sequence,
+            heuristic,
+            compact_q_grids=compact_q_grids,
+            best_first=best_first,
+            retained_q_grid_count=retained_q_grid_count,
+            max_q_grid_count=max_q_grid_count,
+            max_expansion_depth=max_expansion_depth,
+            time_limit=time_limit,
+            report=report,
+        )
+        start = time.perf_counter()
+        hit_jobs: list[_quantizationjob.QuantizationJob] = []
+        groups: list[tuple[tuple | None, list]] = []
+        if job_cache is not None:
+            assert isinstance(job_cache, _jobcaches.JobCache)
+            hit_jobs, groups = job_cache._look_up_jobs(jobs)
+            jobs = [_[1][0] for _ in groups]
+        jobs.sort(key=_jobhandlers._estimate_job_cost, reverse=True)
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(executor, _jobhandlers._call_job, job) for job in jobs
+        ]
+        finished_jobs = []
+        try:
+            for future in asyncio.as_completed(futures):
+                finished_jobs.append(await future)
+        finally:
+            for future in futures:
+                future.cancel()
+
+        def finish(finished_jobs):
+            if job_cache is not None:
+                finished_jobs = hit_jobs + job_cache._store_jobs(groups, finished_jobs)
+            if report is not None:
+                report._lap("search", start)
+                report._record_jobs(finished_jobs)
+            return self._finish(
+                finished_jobs,
+                heuristic,
+                grace_handler,
+                attack_point_optimizer,
+                attach_tempos=attach_tempos,
+                report=report,
+            )
+
+        return await loop.run_in_executor(None, finish, finished_jobs)
+
 
 class BeatwiseQTarget(QTarget):
     """
@@ -262,6 +513,7 @@ class BeatwiseQTarget(QTarget):
         grace_handler: _gracehandlers.GraceHandler,
         attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer,
         attach_tempos: bool = True,
+        report: _quantizationreport.QuantizationReport | None = None,
     ) -> abjad.Voice:
         voice = abjad.Voice()
         # generate the first
@@ -288,9 +540,12 @@ class BeatwiseQTarget(QTarget):
                 tempo = copy.deepcopy(beat_two.tempo)
                 abjad.attach(tempo, attachment_target)
         # apply logical ties, pitches, grace containers
-        self._notate_leaves(grace_handler=grace_handler, voice=voice)
+        self._notate_leaves(grace_handler=grace_handler, voice=voice, report=report)
         # partition logical ties in voice
+        start = time.perf_counter()
         attack_point_optimizer(voice)
+        if report is not None:
+            report._lap("optimize_attack_points", start)
         return voice
 
     ### PUBLIC PROPERTIES ###
@@ -332,66 +587,76 @@ class MeasurewiseQTarget(QTarget):
 
     ### PRIVATE METHODS ###
 
-    def _notate(
+    def _make_measure(
         self,
-        grace_handler: _gracehandlers.GraceHandler,
-        attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer,
+        q_target_measure: _qtargetitems.QTargetMeasure,
+        previous_q_target_measure: _qtargetitems.QTargetMeasure | None = None,
         attach_tempos: bool = True,
-    ) -> abjad.Voice:
-        voice = abjad.Voice()
-        # generate the first
-        q_target_measure = self._items[0]
-        assert isinstance(q_target_measure, _qtargetitems.QTargetMeasure)
-        time_signature = q_target_measure.time_signature
+    ) -> abjad.Container:
+        # time signature and tempo are attached to the first measure, and to
+        # any later measure whose time signature or tempo changes
         measure = abjad.Container()
         for beat in q_target_measure.beats:
-            components = beat.q_grid(beat.beatspan)
-            measure.extend(components)
-        voice.append(measure)
+            measure.extend(beat.q_grid(beat.beatspan))
         leaf = abjad.get.leaf(measure, 0)
         assert leaf is not None
-        abjad.attach(time_signature, leaf)
-        if attach_tempos:
+        if (
+            previous_q_target_measure is None
+            or q_target_measure.time_signature
+            != previous_q_target_measure.time_signature
+        ):
+            abjad.attach(q_target_measure.time_signature, leaf)
+        if attach_tempos and (
+            previous_q_target_measure is None
+            or q_target_measure.tempo != previous_q_target_measure.tempo
+        ):
             tempo = copy.deepcopy(q_target_measure.tempo)
-            leaf = abjad.get.leaf(measure, 0)
-            assert leaf is not None
             abjad.attach(tempo, leaf)
-        # generate the rest pairwise, comparing tempi
-        pairs = abjad.sequence.nwise(self.items)
-        for q_target_measure_one, q_target_measure_two in pairs:
-            measure = abjad.Container()
+        return measure
+
+    def _notate(
+        self,
+        grace_handler: _gracehandlers.GraceHandler,
+        attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer,
+        attach_tempos: bool = True,
+        report: _quantizationreport.QuantizationReport | None = None,
+    ) -> abjad.Voice:
+        voice = abjad.Voice()
+        previous_q_target_measure = None
+        for q_target_measure in self.items:
+            assert isinstance(q_target_measure, _qtargetitems.QTargetMeasure)
+            measure = self._make_measure(
+                q_target_measure,
+                previous_q_target_measure,
+                attach_tempos=attach_tempos,
+            )
             voice.append(measure)
-            for beat in q_target_measure_two.beats:
-                measure.extend(beat.q_grid(beat.beatspan))
-            if (
-                q_target_measure_two.time_signature
-                != q_target_measure_one.time_signature
-            ):
-                time_signature = q_target_measure_two.time_signature
-                leaf = abjad.get.leaf(measure, 0)
-                assert leaf is not None
-                abjad.attach(time_signature, leaf)
-            if (
-                q_target_measure_two.tempo != q_target_measure_one.tempo
-            ) and attach_tempos:
-                tempo = copy.deepcopy(q_target_measure_two.tempo)
-                leaf = abjad.get.leaf(measure, 0)
-                assert leaf is not None
-                abjad.attach(tempo, leaf)
+            previous_q_target_measure = q_target_measure
         # apply logical ties, pitches, grace containers
-        self._notate_leaves(grace_handler=grace_handler, voice=voice)
+        self._notate_leaves(grace_handler=grace_handler, voice=voice, report=report)
         # partition logical ties in each measure
+        start = time.perf_counter()
         for index, measure in enumerate(voice):
-            if isinstance(
-                attack_point_optimizer,
-                _attackpointoptimizers.MeasurewiseAttackPointOptimizer,
-            ):
-                # then we need to pass the time signature of each measure
-                attack_point_optimizer(measure, self.items[index].time_signature)
-            else:
-                attack_point_optimizer(measure)
+            self._optimize_measure(measure, self.items[index], attack_point_optimizer)
+        if report is not None:
+            report._lap("optimize_attack_points", start)
         return voice
 
+    def _optimize_measure(
+        self,
+        measure: abjad.Container,
+        q_target_measure: _qtargetitems.QTargetMeasure,
+        attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer,
+    ) -> None:
+        if isinstance(
+            attack_point_optimizer,
+            _attackpointoptimizers.MeasurewiseAttackPointOptimizer,
+        ):
+            # then we need to pass the time signature of each measure
+            attack_point_optimizer(measure, q_target_measure.time_signature)
+        else:
+            attack_point_optimizer(measure)
+
     ### PUBLIC PROPERTIES ###
 
     @property
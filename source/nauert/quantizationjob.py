@@ -1,10 +1,33 @@
+import heapq
+import time
 import typing
 
+import abjad
+
 from . import qeventproxy as _qeventproxy
 from . import qgrid as _qgrid
 from . import searchtrees as _searchtrees
 
 
+def _get_distance_key(q_grid):
+    return (q_grid.distance, len(q_grid.offsets))
+
+
+class _RetainedQGrid:
+    # Orders retained QGrids worst first, so that a heap of them evicts the
+    # worst QGrid. Later QGrids rank worse than earlier QGrids with equal keys.
+
+    __slots__ = ("index", "key", "q_grid")
+
+    def __init__(self, key, index, q_grid):
+        self.index = index
+        self.key = key
+        self.q_grid = q_grid
+
+    def __lt__(self, argument) -> bool:
+        return (argument.key, argument.index) < (self.key, self.index)
+
+
 class QuantizationJob:
     r"""
     Quantization job.
@@ -42,13 +65,121 @@ class QuantizationJob:
         (1 (1 1))
         (1 ((1 (1 1)) (1 (1 1))))
 
+    ..  container:: example
+
+        Set ``compact_q_grids`` to search with ``CompactQGrids`` instead of
+        ``QGrids``:
+
+        >>> job = nauert.QuantizationJob(
+        ...     1, search_tree, [proxy_a, proxy_b, proxy_c], compact_q_grids=True
+        ... )
+        >>> job()
+        >>> for q_grid in job.q_grids:
+        ...     print(q_grid.rtm_format())
+        1
+        (1 (1 1 1 1 1))
+        (1 (1 1 1))
+        (1 (1 1))
+        (1 ((1 (1 1)) (1 (1 1))))
+
+        ``CompactQGrids`` are much cheaper to generate than ``QGrids`` and are
+        converted to ``QGrids`` only once selected by a ``Heuristic``.
+
+    ..  container:: example
+
+        Set ``best_first`` to search only for the ``QGrid`` which
+        ``DistanceHeuristic`` would select:
+
+        >>> job = nauert.QuantizationJob(
+        ...     1, search_tree, [proxy_a, proxy_b, proxy_c], best_first=True
+        ... )
+        >>> job()
+        >>> for q_grid in job.q_grids:
+        ...     print(q_grid.rtm_format())
+        (1 ((1 (1 1)) (1 (1 1))))
+
+        Candidates are expanded in order of a lower bound on the distance they
+        and their descendants can reach. Subtrees which cannot beat the best
+        ``QGrid`` found so far are pruned. Ties are broken as if all
+        ``QGrids`` had been generated, so the result is identical to that of
+        an exhaustive search.
+
+    ..  container:: example
+
+        Set ``retained_q_grid_count`` to keep only that many of the best
+        ``QGrids``:
+
+        >>> job = nauert.QuantizationJob(
+        ...     1, search_tree, [proxy_a, proxy_b, proxy_c], retained_q_grid_count=2
+        ... )
+        >>> job()
+        >>> for q_grid in job.q_grids:
+        ...     print(q_grid.rtm_format())
+        (1 (1 1 1 1 1))
+        (1 ((1 (1 1)) (1 (1 1))))
+
+        ``QGrids`` are ranked by ``q_grid_key``, which defaults to the ranking
+        of ``DistanceHeuristic``, and are kept in a bounded heap as they are
+        generated. Retained ``QGrids`` keep the order in which they were
+        generated.
+
+    ..  container:: example
+
+        Set ``max_q_grid_count``, ``max_expansion_depth`` or ``time_limit`` to
+        bound the search:
+
+        >>> job = nauert.QuantizationJob(
+        ...     1, search_tree, [proxy_a, proxy_b, proxy_c], max_q_grid_count=3
+        ... )
+        >>> job()
+        >>> for q_grid in job.q_grids:
+        ...     print(q_grid.rtm_format())
+        1
+        (1 (1 1 1 1 1))
+        (1 (1 1 1))
+
+        >>> job.exhausted_budget
+        'max_q_grid_count'
+
+        A job which runs out of budget keeps the ``QGrids`` it found so far,
+        so that a ``Heuristic`` selects the best of them, and names the budget
+        which cut the search short in ``exhausted_budget``:
+
+        >>> job = nauert.QuantizationJob(
+        ...     1, search_tree, [proxy_a, proxy_b, proxy_c], max_expansion_depth=1
+        ... )
+        >>> job()
+        >>> for q_grid in job.q_grids:
+        ...     print(q_grid.rtm_format())
+        1
+        (1 (1 1 1 1 1))
+        (1 (1 1 1))
+        (1 (1 1))
+
+        >>> job.exhausted_budget
+        'max_expansion_depth'
+
     ``QuantizationJob`` is intended to be useful in multiprocessing-enabled
     environments.
     """
 
     ### CLASS VARIABLES ###
 
-    __slots__ = ("_job_id", "_q_event_proxies", "_q_grids", "_search_tree")
+    __slots__ = (
+        "_best_first",
+        "_compact_q_grids",
+        "_exhausted_budget",
+        "_job_id",
+        "_max_expansion_depth",
+        "_max_q_grid_count",
+        "_q_event_proxies",
+        "_q_grid_count",
+        "_q_grid_key",
+        "_q_grids",
+        "_retained_q_grid_count",
+        "_search_tree",
+        "_time_limit",
+    )
 
     ### INITIALIZER ###
 
@@ -57,21 +188,54 @@ class QuantizationJob:
         job_id: int = 1,
         search_tree: _searchtrees.SearchTree | None = None,
         q_event_proxies: typing.Sequence[_qeventproxy.QEventProxy] | None = None,
-        q_grids: typing.Sequence[_qgrid.QGrid] | None = None,
+        q_grids: typing.Sequence[_qgrid.QGrid | _qgrid.CompactQGrid] | None = None,
+        compact_q_grids: bool = False,
+        best_first: bool = False,
+        retained_q_grid_count: int | None = None,
+        q_grid_key: typing.Callable | None = None,
+        max_q_grid_count: int | None = None,
+        max_expansion_depth: int | None = None,
+        time_limit: float | None = None,
     ):
         search_tree = search_tree or _searchtrees.UnweightedSearchTree()
         q_event_proxies = q_event_proxies or []
         assert isinstance(search_tree, _searchtrees.SearchTree)
         assert all(isinstance(x, _qeventproxy.QEventProxy) for x in q_event_proxies)
+        self._best_first = bool(best_first)
+        self._compact_q_grids = bool(compact_q_grids)
         self._job_id = job_id
         self._search_tree = search_tree
         self._q_event_proxies = tuple(q_event_proxies)
-        self._q_grids: tuple[_qgrid.QGrid, ...]
+        if retained_q_grid_count is not None:
+            assert isinstance(retained_q_grid_count, int)
+            assert 0 < retained_q_grid_count
+        self._retained_q_grid_count = retained_q_grid_count
+        if q_grid_key is None:
+            q_grid_key = _get_distance_key
+        assert callable(q_grid_key)
+        self._q_grid_key = q_grid_key
+        if max_q_grid_count is not None:
+            assert isinstance(max_q_grid_count, int)
+            assert 0 < max_q_grid_count
+        self._max_q_grid_count = max_q_grid_count
+        if max_expansion_depth is not None:
+            assert isinstance(max_expansion_depth, int)
+            assert 0 <= max_expansion_depth
+        self._max_expansion_depth = max_expansion_depth
+        if time_limit is not None:
+            assert isinstance(time_limit, (int, float))
+            assert 0 < time_limit
+        self._time_limit = time_limit
+        self._exhausted_budget: str | None = None
+        self._q_grids: tuple[_qgrid.QGrid | _qgrid.CompactQGrid, ...]
         if q_grids is None:
             self._q_grids = ()
         else:
-            assert all(isinstance(x, _qgrid.QGrid) for x in q_grids)
+            assert all(
+                isinstance(x, (_qgrid.QGrid, _qgrid.CompactQGrid)) for x in q_grids
+            )
             self._q_grids = tuple(q_grids)
+        self._q_grid_count = len(self._q_grids)
 
     ### SPECIAL METHODS ###
 
@@ -79,25 +243,34 @@ class QuantizationJob:
         """
         Calls quantization job.
         """
-        # print('XXX')
-        # print(format(self.q_event_proxies[0]))
-        q_grid = _qgrid.QGrid()
-        q_grid.fit_q_events(self.q_event_proxies)
-        # print(format(q_grid))
-        old_q_grids = []
-        new_q_grids = [q_grid]
+        self._exhausted_budget = None
+        self._q_grid_count = 1
+        start = time.monotonic()
+        q_grid: _qgrid.QGrid | _qgrid.CompactQGrid
+        if self.compact_q_grids:
+            q_grid = _qgrid.CompactQGrid(self.q_event_proxies)
+        else:
+            q_grid = _qgrid.QGrid()
+            q_grid.fit_q_events(self.q_event_proxies)
+        if self.best_first:
+            self._q_grids = (self._search_best_first(q_grid, start),)
+            return
+        if self.retained_q_grid_count is not None:
+            self._q_grids = self._search_retaining_best(q_grid, start)
+            return
+        old_q_grids: list[_qgrid.QGrid | _qgrid.CompactQGrid] = []
+        new_q_grids: list[tuple[_qgrid.QGrid | _qgrid.CompactQGrid, int]] = [
+            (q_grid, 0)
+        ]
         while new_q_grids:
-            q_grid = new_q_grids.pop()
-            search_results = self.search_tree(q_grid)
-            # print q_grid.rtm_format()
-            # for x in search_results:
-            #    print '\t', x.rtm_format()
-            new_q_grids.extend(search_results)
+            if old_q_grids and self._is_out_of_budget(len(old_q_grids), start):
+                break
+            q_grid, depth = new_q_grids.pop()
+            if self._may_expand(q_grid, depth):
+                search_results = self.search_tree(q_grid)
+                self._q_grid_count += len(search_results)
+                new_q_grids.extend((_, depth + 1) for _ in search_results)
             old_q_grids.append(q_grid)
-        # for q_grid in old_q_grids:
-        #    print('\t', q_grid)
-        # print()
-
         self._q_grids = tuple(old_q_grids)
 
     def __eq__(self, argument) -> bool:
@@ -131,8 +304,170 @@ class QuantizationJob:
         string += f" q_event_proxies={self.q_event_proxies!r}, q_grids={self.q_grids})"
         return string
 
+    ### PRIVATE METHODS ###
+
+    def _estimate_cost(self) -> int:
+        # Rough relative cost of calling the job, used to schedule jobs
+        # largest first: grows with the number of QEventProxies and with the
+        # depth to which the search tree may subdivide.
+        subdivisions_by_path, _ = self.search_tree._get_subdivision_table()
+        depth = max(len(_) for _ in subdivisions_by_path)
+        return (1 + len(self.q_event_proxies)) * (1 + depth)
+
+    def _get_cache_key(self, returned_q_grid_count: int | None = None) -> tuple | None:
+        # Equal for all jobs whose searches generate QGrids of the same
+        # shapes, holding proxies at the same positions: jobs with the same
+        # search tree, options and proxy offsets, in proxy order. The ranking
+        # function counts only when QGrids are retained, or when a job handler
+        # returns only returned_q_grid_count of them, and is named rather
+        # than held, so that keys also compare equal across processes; jobs
+        # ranking with lambdas or local functions have no key. Jobs with a time
+        # limit have no key either, since their results depend on timing.
+        if self.time_limit is not None:
+            return None
+        q_grid_key = None
+        if self.retained_q_grid_count is not None or returned_q_grid_count:
+            function = getattr(self.q_grid_key, "__func__", self.q_grid_key)
+            q_grid_key = f"{function.__module__}.{function.__qualname__}"
+            if "<" in q_grid_key:
+                return None
+        return (
+            self.search_tree._get_definition_key(),
+            tuple(_.offset().fraction.as_integer_ratio() for _ in self.q_event_proxies),
+            self.compact_q_grids,
+            self.best_first,
+            self.retained_q_grid_count,
+            q_grid_key,
+            self.max_q_grid_count,
+            self.max_expansion_depth,
+            returned_q_grid_count,
+        )
+
+    def _is_out_of_budget(self, q_grid_count: int, start: float) -> bool:
+        # Is true when the search has found max_q_grid_count QGrids or has run
+        # past its time limit, and records which budget was exhausted.
+        if self.max_q_grid_count is not None and self.max_q_grid_count <= q_grid_count:
+            self._exhausted_budget = "max_q_grid_count"
+            return True
+        if self.time_limit is not None and self.time_limit <= time.monotonic() - start:
+            self._exhausted_budget = "time_limit"
+            return True
+        return False
+
+    def _may_expand(
+        self, q_grid: _qgrid.QGrid | _qgrid.CompactQGrid, depth: int
+    ) -> bool:
+        # Is true when q_grid, found after depth expansions, may be expanded
+        # further. Records the depth budget as exhausted only when q_grid
+        # could have been expanded.
+        if self.max_expansion_depth is None or depth < self.max_expansion_depth:
+            return True
+        if self._exhausted_budget is None:
+            find = self.search_tree._find_divisible_leaf_indices_and_subdivisions
+            if find(q_grid)[0]:
+                self._exhausted_budget = "max_expansion_depth"
+        return False
+
+    def _search_best_first(
+        self, q_grid: _qgrid.QGrid | _qgrid.CompactQGrid, start: float
+    ) -> _qgrid.QGrid | _qgrid.CompactQGrid:
+        # Candidates are ranked by (distance, number of offsets, order), where
+        # order is the position at which exhaustive search would have
+        # generated the candidate: exhaustive search is a depth-first search
+        # which visits children last to first, so a candidate comes after its
+        # ancestors and before the siblings preceding it.
+        search_tree = self.search_tree
+        lower_bound = search_tree._get_distance_lower_bound(q_grid)
+        order: tuple[int, ...] = ()
+        queue = [(lower_bound, len(q_grid.offsets), order, q_grid)]
+        best_q_grid, best_key = q_grid, None
+        q_grid_count = 0
+        while queue:
+            lower_bound, count, order, q_grid = heapq.heappop(queue)
+            if best_key is not None and best_key[:2] < (lower_bound, count):
+                break
+            if best_key is not None and self._is_out_of_budget(q_grid_count, start):
+                break
+            q_grid_count += 1
+            distance = q_grid.distance
+            if distance is None:
+                return q_grid
+            key = (abjad.Fraction(distance.numerator, distance.denominator), count)
+            if best_key is None or key + (order,) < best_key:
+                best_q_grid, best_key = q_grid, key + (order,)
+            if not self._may_expand(q_grid, len(order)):
+                continue
+            children: list[_qgrid.QGrid | _qgrid.CompactQGrid]
+            children = list(search_tree(q_grid))
+            self._q_grid_count += len(children)
+            for i, child in enumerate(children):
+                child_lower_bound = search_tree._get_distance_lower_bound(child)
+                child_count = len(child.offsets)
+                if best_key[:2] < (child_lower_bound, child_count):
+                    continue
+                child_order = order + (-i,)
+                heapq.heappush(
+                    queue, (child_lower_bound, child_count, child_order, child)
+                )
+        return best_q_grid
+
+    def _search_retaining_best(
+        self, q_grid: _qgrid.QGrid | _qgrid.CompactQGrid, start: float
+    ) -> tuple[_qgrid.QGrid | _qgrid.CompactQGrid, ...]:
+        count, q_grid_key = self.retained_q_grid_count, self.q_grid_key
+        assert count is not None
+        retained_q_grids: list[_RetainedQGrid] = []
+        new_q_grids: list[tuple[_qgrid.QGrid | _qgrid.CompactQGrid, int]] = [
+            (q_grid, 0)
+        ]
+        index = 0
+        while new_q_grids:
+            if index and self._is_out_of_budget(index, start):
+                break
+            q_grid, depth = new_q_grids.pop()
+            if self._may_expand(q_grid, depth):
+                search_results = self.search_tree(q_grid)
+                self._q_grid_count += len(search_results)
+                new_q_grids.extend((_, depth + 1) for _ in search_results)
+            retained_q_grid = _RetainedQGrid(q_grid_key(q_grid), index, q_grid)
+            index += 1
+            if len(retained_q_grids) < count:
+                heapq.heappush(retained_q_grids, retained_q_grid)
+            elif retained_q_grids[0] < retained_q_grid:
+                heapq.heapreplace(retained_q_grids, retained_q_grid)
+        retained_q_grids.sort(key=lambda x: x.index)
+        return tuple(x.q_grid for x in retained_q_grids)
+
     ### PUBLIC PROPERTIES ###
 
+    @property
+    def best_first(self) -> bool:
+        """
+        Is true when the ``QuantizationJob`` searches only for the ``QGrid``
+        with the smallest distance and fewest leaves.
+        """
+        return self._best_first
+
+    @property
+    def compact_q_grids(self) -> bool:
+        """
+        Is true when the ``QuantizationJob`` searches with ``CompactQGrids``.
+        """
+        return self._compact_q_grids
+
+    @property
+    def exhausted_budget(self) -> str | None:
+        """
+        Gets the name of the budget which cut the last search of the
+        ``QuantizationJob`` short: ``"max_q_grid_count"``,
+        ``"max_expansion_depth"`` or ``"time_limit"``.
+
+        None when the search was complete, or has not been run. The
+        ``QGrids`` of a job which ran out of budget are the best found before
+        the budget was exhausted.
+        """
+        return self._exhausted_budget
+
     @property
     def job_id(self) -> int:
         """
@@ -143,6 +478,26 @@ class QuantizationJob:
         """
         return self._job_id
 
+    @property
+    def max_expansion_depth(self) -> int | None:
+        """
+        Gets number of times the ``QuantizationJob`` may subdivide a ``QGrid``
+        in turn, starting from a ``QGrid`` of a single leaf.
+
+        Unbounded when none.
+        """
+        return self._max_expansion_depth
+
+    @property
+    def max_q_grid_count(self) -> int | None:
+        """
+        Gets number of candidate ``QGrids`` the ``QuantizationJob`` may find
+        before it stops searching.
+
+        Unbounded when none.
+        """
+        return self._max_q_grid_count
+
     @property
     def q_event_proxies(self) -> tuple[_qeventproxy.QEventProxy, ...]:
         r"""
@@ -173,7 +528,27 @@ class QuantizationJob:
         return self._q_event_proxies
 
     @property
-    def q_grids(self) -> tuple[_qgrid.QGrid, ...]:
+    def q_grid_count(self) -> int:
+        """
+        Gets number of candidate ``QGrids`` the ``QuantizationJob`` generated.
+
+        Counts every ``QGrid`` the search made, including those which best-first
+        search pruned and those which were not retained, so that it measures
+        the work of a search in any mode. Equals the number of ``QGrids`` of a
+        job which searched exhaustively.
+        """
+        return self._q_grid_count
+
+    @property
+    def q_grid_key(self) -> typing.Callable:
+        """
+        Gets key by which the ``QuantizationJob`` ranks ``QGrids`` when
+        retaining only the best of them; lower keys rank better.
+        """
+        return self._q_grid_key
+
+    @property
+    def q_grids(self) -> tuple[_qgrid.QGrid | _qgrid.CompactQGrid, ...]:
         r"""
         Gets generated ``QGrids``.
 
@@ -199,9 +574,29 @@ class QuantizationJob:
         """
         return self._q_grids
 
+    @property
+    def retained_q_grid_count(self) -> int | None:
+        """
+        Gets number of best ``QGrids`` the ``QuantizationJob`` retains.
+
+        All generated ``QGrids`` are retained when none.
+        """
+        return self._retained_q_grid_count
+
     @property
     def search_tree(self) -> _searchtrees.SearchTree:
         """
         Gets search tree ``QuantizationJob`` was instantiated with.
         """
         return self._search_tree
+
+    @property
+    def time_limit(self) -> float | None:
+        """
+        Gets number of seconds after which the ``QuantizationJob`` stops
+        searching.
+
+        Unbounded when none. The limit is checked between candidate
+        ``QGrids``, and the first ``QGrid`` is always found.
+        """
+        return self._time_limit
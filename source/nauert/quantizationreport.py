@@ -0,0 +1,216 @@
+import time
+
+
+class QuantizationReport:
+    """
+    Quantization report.
+
+    Records the wall time spent in each stage of a ``quantize`` call, counts
+    per beat of ``QGrids``, of ``QEventProxies`` and of the depth of the
+    selected ``QGrid``, and the beats whose search ran out of budget.
+
+    ..  container:: example
+
+        >>> q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        ...     [250, 250, 500, 333, 667, 1000]
+        ... )
+        >>> report = nauert.QuantizationReport()
+        >>> voice = nauert.quantize(q_event_sequence, report=report)
+        >>> list(report.stage_times)
+        ['assign_beats', 'make_jobs', 'search', 'select_q_grids', 'shift_downbeats', 'regroup', 'notate', 'handle_graces', 'optimize_attack_points']
+
+        >>> report.q_grid_counts
+        {0: 28, 1: 21, 2: 1, 3: 1}
+
+        >>> report.q_event_proxy_counts
+        {0: 3, 1: 2, 2: 1, 3: 1}
+
+        >>> report.q_grid_depths
+        {0: 2, 1: 1, 2: 0, 3: 0}
+
+        >>> report.max_q_grid_depth
+        2
+
+        >>> report.exhausted_budgets
+        {}
+
+        >>> voice = nauert.quantize(q_event_sequence, max_q_grid_count=8, report=report)
+        >>> report.exhausted_budgets
+        {0: 'max_q_grid_count', 1: 'max_q_grid_count'}
+
+    Stages are, in order:
+
+    * ``assign_beats``: parcelling ``QEvents`` out to beats;
+    * ``make_jobs``: making ``QuantizationJobs``;
+    * ``search``: running jobs in the job handler, and job cache if any;
+    * ``select_q_grids``: selecting one ``QGrid`` per beat by heuristic;
+    * ``shift_downbeats``: moving next-downbeat proxies to the next beat;
+    * ``regroup``: regrouping unnecessary divisions;
+    * ``notate``: making notation, excluding the two stages below;
+    * ``handle_graces``: calling the grace handler;
+    * ``optimize_attack_points``: calling the attack-point optimizer.
+
+    Counts are keyed by beat index. ``QGrid`` counts are the numbers of
+    candidate ``QGrids`` each job generated, as in
+    ``QuantizationJob.q_grid_count``, whether or not the job kept them for
+    the heuristic; only beats with ``QEvents`` have jobs. Exhausted budgets
+    are named for the beats whose job stopped searching early, as in
+    ``QuantizationJob.exhausted_budget``.
+
+    A report records the last call it was passed to. Quantizing without a
+    report costs one comparison per stage and per grace-handler call.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = (
+        "_exhausted_budgets",
+        "_q_event_proxy_counts",
+        "_q_grid_counts",
+        "_q_grid_depths",
+        "_stage_times",
+    )
+
+    _stages = (
+        "assign_beats",
+        "make_jobs",
+        "search",
+        "select_q_grids",
+        "shift_downbeats",
+        "regroup",
+        "notate",
+        "handle_graces",
+        "optimize_attack_points",
+    )
+
+    ### INITIALIZER ###
+
+    def __init__(self) -> None:
+        self._exhausted_budgets: dict[int, str] = {}
+        self._q_event_proxy_counts: dict[int, int] = {}
+        self._q_grid_counts: dict[int, int] = {}
+        self._q_grid_depths: dict[int, int] = {}
+        self._stage_times: dict[str, float] = {}
+        self._clear()
+
+    ### SPECIAL METHODS ###
+
+    def __repr__(self) -> str:
+        """
+        Gets repr.
+        """
+        string = f"{type(self).__name__}(total_time={self.total_time!r},"
+        string += f" beat_count={len(self._q_grid_depths)!r},"
+        string += f" max_q_grid_depth={self.max_q_grid_depth!r})"
+        return string
+
+    ### PRIVATE METHODS ###
+
+    def _add_stage_time(self, stage: str, seconds: float) -> None:
+        self._stage_times[stage] += seconds
+
+    def _clear(self) -> None:
+        self._exhausted_budgets.clear()
+        self._q_event_proxy_counts.clear()
+        self._q_grid_counts.clear()
+        self._q_grid_depths.clear()
+        self._stage_times.clear()
+        self._stage_times.update((_, 0.0) for _ in self._stages)
+
+    def _lap(self, stage: str, start: float) -> float:
+        # Adds the time since start to stage; returns the current time, to
+        # start the next lap.
+        now = time.perf_counter()
+        self._stage_times[stage] += now - start
+        return now
+
+    def _record_beats(self, beats) -> None:
+        for index, beat in enumerate(beats):
+            leaves = beat.q_grid.leaves[:-1]
+            self._q_grid_depths[index] = max(_.depth for _ in leaves)
+
+    def _record_jobs(self, jobs) -> None:
+        for job in sorted(jobs, key=lambda _: _.job_id):
+            self._q_event_proxy_counts[job.job_id] = len(job.q_event_proxies)
+            self._q_grid_counts[job.job_id] = job.q_grid_count
+            if job.exhausted_budget is not None:
+                self._exhausted_budgets[job.job_id] = job.exhausted_budget
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def exhausted_budgets(self) -> dict[int, str]:
+        """
+        Gets name of the budget exhausted by each beat's job, for jobs which
+        stopped searching early.
+        """
+        return dict(self._exhausted_budgets)
+
+    @property
+    def max_q_grid_depth(self) -> int | None:
+        """
+        Gets the greatest depth of any selected ``QGrid``.
+        """
+        return max(self._q_grid_depths.values(), default=None)
+
+    @property
+    def q_event_proxy_counts(self) -> dict[int, int]:
+        """
+        Gets number of ``QEventProxies`` of each beat's job.
+        """
+        return dict(self._q_event_proxy_counts)
+
+    @property
+    def q_grid_counts(self) -> dict[int, int]:
+        """
+        Gets number of candidate ``QGrids`` generated by each beat's job.
+        """
+        return dict(self._q_grid_counts)
+
+    @property
+    def q_grid_depths(self) -> dict[int, int]:
+        """
+        Gets depth of the ``QGrid`` selected for each beat.
+
+        A ``QGrid`` of a single leaf has depth 0.
+        """
+        return dict(self._q_grid_depths)
+
+    @property
+    def stage_times(self) -> dict[str, float]:
+        """
+        Gets wall time of each stage in seconds.
+        """
+        return dict(self._stage_times)
+
+    @property
+    def total_time(self) -> float:
+        """
+        Gets sum of stage times in seconds.
+        """
+        return sum(self._stage_times.values())
+
+    ### PUBLIC METHODS ###
+
+    def as_dict(self) -> dict:
+        """
+        Gets report as a dictionary of JSON-serializable values.
+
+        ..  container:: example
+
+            >>> report = nauert.QuantizationReport()
+            >>> sorted(report.as_dict())
+            ['exhausted_budgets', 'max_q_grid_depth', 'q_event_proxy_counts', 'q_grid_counts', 'q_grid_depths', 'stage_times', 'total_time']
+
+        Beat indices are kept as integer keys; ``json.dumps`` writes them as
+        strings.
+        """
+        return {
+            "exhausted_budgets": self.exhausted_budgets,
+            "max_q_grid_depth": self.max_q_grid_depth,
+            "q_event_proxy_counts": self.q_event_proxy_counts,
+            "q_grid_counts": self.q_grid_counts,
+            "q_grid_depths": self.q_grid_depths,
+            "stage_times": self.stage_times,
+            "total_time": self.total_time,
+        }
@@ -1,11 +1,25 @@
+import concurrent.futures
+
 import abjad
 
 from . import attackpointoptimizers as _attackpointoptimizers
 from . import gracehandlers as _gracehandlers
 from . import heuristics as _heuristics
+from . import jobcaches as _jobcaches
 from . import jobhandlers as _jobhandlers
 from . import qeventsequence as _qeventsequence
 from . import qschemas as _qschemas
+from . import quantizationreport as _quantizationreport
+
+
+def _make_q_target(q_event_sequence, q_schema):
+    # TODO: assert isinstance(q_event_sequence, QEventSequence)
+    q_event_sequence = _qeventsequence.QEventSequence(q_event_sequence)
+    if q_schema is None:
+        q_schema = _qschemas.MeasurewiseQSchema()
+    assert isinstance(q_schema, _qschemas.QSchema)
+    q_target = q_schema(q_event_sequence.duration_in_ms)
+    return q_event_sequence, q_target
 
 
 def quantize(
@@ -16,6 +30,14 @@ def quantize(
     job_handler: _jobhandlers.JobHandler | None = None,
     attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer | None = None,
     attach_tempos: bool = True,
+    compact_q_grids: bool = False,
+    best_first: bool = False,
+    retained_q_grid_count: int | None = None,
+    max_q_grid_count: int | None = None,
+    max_expansion_depth: int | None = None,
+    time_limit: float | None = None,
+    job_cache: _jobcaches.JobCache | None = None,
+    report: _quantizationreport.QuantizationReport | None = None,
 ) -> abjad.Voice:
     r"""
     Quantizer function.
@@ -263,25 +285,59 @@ def quantize(
 
         * ``job_handler``: a ``JobHandler`` instance controls whether or not
           parallel processing is used during the quantization process.
-          Options include the ``SerialJobHandler`` and ``ParallelJobHandler``
-          classes.
+          Options include the ``SerialJobHandler``, ``ParallelJobHandler``,
+          ``PooledJobHandler`` and ``ThreadedJobHandler`` classes. Process-based
+          job handlers made with ``returned_q_grid_count`` send back only that
+          many of each beat's best ``QGrids``, ranked as ``heuristic`` ranks
+          them, which must then be able to rank individual ``QGrids``.
 
         * ``attack_point_optimizer``: an ``AttackPointOptimizer`` instance
           controls whether and how logical ties are re-notated.
           Options currently include ``MeasurewiseAttackPointOptimizer``,
           ``NaiveAttackPointOptimizer`` and ``NullAttackPointOptimizer``.
 
+        * ``compact_q_grids``: when true, ``QuantizationJobs`` search with
+          ``CompactQGrids`` and only the ``QGrid`` selected for each beat is
+          built as a rhythm tree. The output is unchanged. With a search tree
+          made with ``precompiled=True`` in ``q_schema``, jobs also look up
+          the shapes of their ``CompactQGrids`` in the search tree's grid
+          dictionary.
+
+        * ``best_first``: when true, ``QuantizationJobs`` prune their search
+          and keep only the ``QGrid`` which ``DistanceHeuristic`` would
+          select. The output is unchanged when ``heuristic`` is a
+          ``DistanceHeuristic``, which is the default.
+
+        * ``retained_q_grid_count``: when set, ``QuantizationJobs`` keep only
+          that many ``QGrids``, ranked as ``heuristic`` ranks them. The output
+          is unchanged. ``heuristic`` must be able to rank individual
+          ``QGrids``, as ``DistanceHeuristic`` does; other heuristics raise
+          ``ValueError`` before any search starts.
+
+        * ``max_q_grid_count``, ``max_expansion_depth`` and ``time_limit``:
+          when set, each ``QuantizationJob`` stops searching once it has found
+          that many ``QGrids``, has subdivided ``QGrids`` that many times in
+          turn, or has run for that many seconds, and hands the ``QGrids``
+          found so far to ``heuristic``. The output may then differ. Jobs
+          name the budget they exhausted in ``exhausted_budget``, which
+          ``report`` records per beat. Jobs with a ``time_limit`` are not
+          cached by ``job_cache``.
+
+        * ``job_cache``: a ``JobCache`` instance memoizes the ``QGrids`` of
+          each distinct beat, so that repeated beats are searched only once,
+          in this call and in any other call sharing the cache. The output is
+          unchanged.
+
+        * ``report``: a ``QuantizationReport`` instance records the time spent
+          in each stage of the call, and counts of ``QGrids`` and
+          ``QEventProxies`` per beat. Nothing is recorded by default.
+
     Refer to the reference pages for ``BeatwiseQSchema`` and
     ``MeasurewiseQSchema`` for more information on controlling the ``quantize``
     function's output, and to the reference on ``SearchTree`` for information
     on controlling the rhythmic complexity of that same output.
     """
-    # TODO: assert isinstance(q_event_sequence, QEventSequence)
-    q_event_sequence = _qeventsequence.QEventSequence(q_event_sequence)
-    if q_schema is None:
-        q_schema = _qschemas.MeasurewiseQSchema()
-    assert isinstance(q_schema, _qschemas.QSchema)
-    q_target = q_schema(q_event_sequence.duration_in_ms)
+    q_event_sequence, q_target = _make_q_target(q_event_sequence, q_schema)
     notation = q_target(
         q_event_sequence,
         grace_handler=grace_handler,
@@ -289,5 +345,75 @@ def quantize(
         job_handler=job_handler,
         attack_point_optimizer=attack_point_optimizer,
         attach_tempos=attach_tempos,
+        compact_q_grids=compact_q_grids,
+        best_first=best_first,
+        retained_q_grid_count=retained_q_grid_count,
+        max_q_grid_count=max_q_grid_count,
+        max_expansion_depth=max_expansion_depth,
+        time_limit=time_limit,
+        job_cache=job_cache,
+        report=report,
+    )
+    return notation
+
+
+async def quantize_async(
+    q_event_sequence: _qeventsequence.QEventSequence,
+    q_schema: _qschemas.QSchema | None = None,
+    grace_handler: _gracehandlers.GraceHandler | None = None,
+    heuristic: _heuristics.Heuristic | None = None,
+    executor: concurrent.futures.Executor | None = None,
+    attack_point_optimizer: _attackpointoptimizers.AttackPointOptimizer | None = None,
+    attach_tempos: bool = True,
+    compact_q_grids: bool = False,
+    best_first: bool = False,
+    retained_q_grid_count: int | None = None,
+    max_q_grid_count: int | None = None,
+    max_expansion_depth: int | None = None,
+    time_limit: float | None = None,
+    job_cache: _jobcaches.JobCache | None = None,
+    report: _quantizationreport.QuantizationReport | None = None,
+) -> abjad.Voice:
+    r"""
+    Asynchronous quantizer function.
+
+    ..  container:: example
+
+        Awaits the same result as ``quantize``:
+
+        >>> import asyncio
+        >>> q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        ...     [500, 500, 250, 250, 500]
+        ... )
+        >>> result = asyncio.run(nauert.quantize_async(q_event_sequence))
+        >>> string = abjad.lilypond(result)
+        >>> string == abjad.lilypond(nauert.quantize(q_event_sequence))
+        True
+
+    ``QuantizationJobs`` run in ``executor`` instead of in a ``JobHandler``,
+    and the event loop runs between beats. ``executor`` defaults to the event
+    loop's default executor; a single executor may serve many concurrent
+    calls. Cancelling the call cancels every ``QuantizationJob`` not yet
+    started. Selecting ``QGrids`` and notating the result also run off the
+    event loop, in its default executor.
+
+    Other arguments, including ``report``, are as for ``quantize``.
+    """
+    q_event_sequence, q_target = _make_q_target(q_event_sequence, q_schema)
+    notation = await q_target.call_async(
+        q_event_sequence,
+        grace_handler=grace_handler,
+        heuristic=heuristic,
+        executor=executor,
+        attack_point_optimizer=attack_point_optimizer,
+        attach_tempos=attach_tempos,
+        compact_q_grids=compact_q_grids,
+        best_first=best_first,
+        retained_q_grid_count=retained_q_grid_count,
+        max_q_grid_count=max_q_grid_count,
+        max_expansion_depth=max_expansion_depth,
+        time_limit=time_limit,
+        job_cache=job_cache,
+        report=report,
     )
     return notation
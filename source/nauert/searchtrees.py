@@ -1,5 +1,7 @@
 import abc
-import copy
+import bisect
+import itertools
+import math
 
 import abjad
 
@@ -21,29 +23,66 @@ class SearchTree(abc.ABC):
 
     ### CLASS VARIABLES ###
 
-    __slots__ = ("_definition",)
+    __slots__ = (
+        "_definition",
+        "_grid_dictionary",
+        "_reachable_offsets",
+        "_subdivision_table",
+    )
+
+    _maximum_grid_dictionary_size = 65536
 
     ### INITIALIZER ###
 
-    def __init__(self, definition: dict | None = None):
+    def __init__(self, definition: dict | None = None, precompiled: bool = False):
         if definition is None:
             definition = self.default_definition
         else:
             assert self._is_valid_definition(definition)
         self._definition = definition
+        self._grid_dictionary: (
+            dict[
+                tuple[tuple[tuple[int, tuple[int, ...]], ...], ...],
+                tuple[tuple[int, ...], int, tuple[tuple[tuple[int, int], ...], ...]],
+            ]
+            | None
+        ) = None
+        if precompiled:
+            self._grid_dictionary = {}
+        self._reachable_offsets: dict[
+            tuple[int, ...], tuple[tuple[int, ...], int] | None
+        ] = {}
+        self._subdivision_table: (
+            tuple[
+                dict[tuple[int, ...], tuple[tuple[int, ...], ...]],
+                dict[tuple[int, ...], tuple[tuple[int, int], ...]],
+            ]
+            | None
+        ) = None
 
     ### SPECIAL METHODS ###
 
-    def __call__(self, q_grid: _qgrid.QGrid) -> list[_qgrid.QGrid]:
+    def __call__(
+        self, q_grid: _qgrid.QGrid | _qgrid.CompactQGrid
+    ) -> list[_qgrid.QGrid] | list[_qgrid.CompactQGrid]:
         """
         Calls search tree.
         """
-        assert isinstance(q_grid, _qgrid.QGrid)
-        new_q_grids = []
+        assert isinstance(q_grid, (_qgrid.QGrid, _qgrid.CompactQGrid))
         commands = self._generate_all_subdivision_commands(q_grid)
+        if isinstance(q_grid, _qgrid.CompactQGrid):
+            child_ratios = self._get_subdivision_table()[1]
+            if self._grid_dictionary is not None:
+                return [
+                    self._look_up_subdivided_q_grid(q_grid, command, child_ratios)
+                    for command in commands
+                ]
+            return [
+                q_grid._subdivide_leaves(command, child_ratios) for command in commands
+            ]
+        new_q_grids = []
         for command in commands:
-            new_q_grid = copy.deepcopy(q_grid)
-            q_events = new_q_grid.subdivide_leaves(command)
+            new_q_grid, q_events = q_grid._copy_and_subdivide_leaves(command)
             new_q_grid.fit_q_events(q_events)
             new_q_grids.append(new_q_grid)
         return new_q_grids
@@ -58,6 +97,23 @@ class SearchTree(abc.ABC):
                 return True
         return False
 
+    def __getstate__(self) -> dict:
+        """
+        Gets state of search tree for pickling and copying.
+
+        Leaves out the subdivision table, reachable offsets and grid
+        dictionary, which the copy compiles again on first use, so that they
+        are not sent along with every job.
+        """
+        state = {}
+        for class_ in type(self).__mro__:
+            for name in getattr(class_, "__slots__", ()):
+                if name not in state and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        del state["_reachable_offsets"], state["_subdivision_table"]
+        state["_grid_dictionary"] = {} if self.precompiled else None
+        return state
+
     def __hash__(self) -> int:
         """
         Hashes search tree.
@@ -72,35 +128,48 @@ class SearchTree(abc.ABC):
         """
         return f"{type(self).__name__}(definition={self.definition!r})"
 
+    def __setstate__(self, state: dict) -> None:
+        """
+        Sets state of search tree, with empty caches.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._reachable_offsets = {}
+        self._subdivision_table = None
+
     ### PRIVATE METHODS ###
 
     def _find_divisible_leaf_indices_and_subdivisions(
-        self, q_grid: _qgrid.QGrid
+        self, q_grid: _qgrid.QGrid | _qgrid.CompactQGrid
     ) -> tuple[list[int], list[tuple[tuple[int, ...], ...]]]:
-        # TODO: This should actually check for all QEvents which fall
-        # within the leaf's duration,
-        # including QEvents attached to the next leaf
-        # It may be prudent to actually store QEvents in two lists:
-        # before_offset and after_offset
+        if isinstance(q_grid, _qgrid.CompactQGrid):
+            indices, subdivisions = [], []
+            for i in q_grid._find_divisible_leaf_indices():
+                parentage_ratios = q_grid.parentage_ratios[i]
+                leaf_subdivisions = self._look_up_leaf_subdivisions(parentage_ratios)
+                if leaf_subdivisions:
+                    indices.append(i)
+                    subdivisions.append(leaf_subdivisions)
+            return indices, subdivisions
         indices, subdivisions = [], []
         leaves = list(q_grid.leaves)
+        partitions = q_grid._partition_q_event_proxies()
         i = 0
         for leaf_one, leaf_two in abjad.sequence.nwise(leaves):
             if leaf_one.is_divisible:
-                succeeding_proxies = leaf_one.succeeding_q_event_proxies
-                preceding_proxies = leaf_two.preceding_q_event_proxies
-                if not preceding_proxies and all(
-                    proxy.offset == leaf_one.start_offset()
-                    for proxy in succeeding_proxies
-                ):
+                _, succeeding_count, aligned_count = partitions[i]
+                preceding_proxies = partitions[i + 1][0]
+                if not preceding_proxies and aligned_count == succeeding_count:
                     # proxies align perfectly with this leaf
                     pass
-                elif preceding_proxies or succeeding_proxies:
+                elif preceding_proxies or succeeding_count:
                     parentage_ratios = leaf_one._get_parentage_ratios()
-                    leaf_subdivisions = self._find_leaf_subdivisions(parentage_ratios)
+                    leaf_subdivisions = self._look_up_leaf_subdivisions(
+                        parentage_ratios
+                    )
                     if leaf_subdivisions:
                         indices.append(i)
-                        subdivisions.append(tuple(leaf_subdivisions))
+                        subdivisions.append(leaf_subdivisions)
             i += 1
         return indices, subdivisions
 
@@ -111,21 +180,227 @@ class SearchTree(abc.ABC):
         raise NotImplementedError
 
     def _generate_all_subdivision_commands(
-        self, q_grid: _qgrid.QGrid
-    ) -> tuple[tuple[tuple[int, tuple[int, int]], ...], ...]:
+        self, q_grid: _qgrid.QGrid | _qgrid.CompactQGrid
+    ) -> tuple[tuple[tuple[int, tuple[int, ...]], ...], ...]:
         indices, subdivisions = self._find_divisible_leaf_indices_and_subdivisions(
             q_grid
         )
         if not indices:
             return ()
-        combinations = abjad.enumerate.outer_product(subdivisions)
-        combinations = [tuple(_) for _ in combinations]
-        return tuple(tuple(zip(indices, combo, strict=True)) for combo in combinations)
+        return tuple(
+            tuple(zip(indices, combination, strict=True))
+            for combination in itertools.product(*subdivisions)
+        )
+
+    def _get_definition_key(self) -> tuple:
+        """
+        Gets hashable key equal for all search trees which compare equal.
+        """
+
+        def freeze(value):
+            if isinstance(value, dict):
+                return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+            if isinstance(value, (list, tuple)):
+                return tuple(freeze(_) for _ in value)
+            return value
+
+        return (type(self).__name__, freeze(self._definition))
+
+    def _get_distance_lower_bound(
+        self, q_grid: _qgrid.QGrid | _qgrid.CompactQGrid
+    ) -> abjad.Fraction:
+        """
+        Gets a lower bound for the distance of ``q_grid`` and of every q-grid
+        the search tree can derive from it.
+
+        Subdividing a leaf only adds offsets within the span of that leaf, so
+        no derived q-grid can bring a ``QEventProxy`` closer than the nearest
+        offset reachable by subdividing the leaf whose span contains it.
+        """
+        if isinstance(q_grid, _qgrid.CompactQGrid):
+            numerators, denominator = q_grid.numerators, q_grid.denominator
+            q_event_proxies = q_grid.q_event_proxies
+            leaf_indices = q_grid.leaf_indices
+            parentage_ratios = q_grid.parentage_ratios
+        else:
+            numerators, _, denominator = q_grid._get_leaf_offset_table()
+            q_event_proxies = tuple(
+                _ for leaf in q_grid.leaves for _ in leaf.q_event_proxies
+            )
+            leaf_indices = tuple(
+                i for i, leaf in enumerate(q_grid.leaves) for _ in leaf.q_event_proxies
+            )
+            leaves = q_grid.leaves[:-1]
+        if not q_event_proxies:
+            return abjad.Fraction(0)
+        total = abjad.Fraction(0)
+        for q_event_proxy, index in zip(q_event_proxies, leaf_indices, strict=True):
+            numerator, proxy_denominator = (
+                q_event_proxy.offset().fraction.as_integer_ratio()
+            )
+            target = numerator * denominator - numerators[index] * proxy_denominator
+            if target < 0:
+                index -= 1
+                target = numerator * denominator - numerators[index] * proxy_denominator
+            if not target:
+                continue
+            if isinstance(q_grid, _qgrid.CompactQGrid):
+                path = tuple(_[1] for _ in parentage_ratios[index][1:])
+            else:
+                path = tuple(_[1] for _ in leaves[index]._get_parentage_ratios()[1:])
+            reachable_offsets = self._get_reachable_offsets(path)
+            if reachable_offsets is None:
+                continue
+            # scales the proxy's position within the leaf's span and the
+            # reachable offsets to integers over a shared denominator
+            offset_numerators, offset_denominator = reachable_offsets
+            width = (numerators[index + 1] - numerators[index]) * proxy_denominator
+            target *= offset_denominator
+            i = bisect.bisect_left(offset_numerators, -(-target // width))
+            difference = offset_numerators[i] * width - target
+            if 0 < i:
+                difference = min(difference, target - offset_numerators[i - 1] * width)
+            total += abjad.Fraction(
+                difference, proxy_denominator * offset_denominator * denominator
+            )
+        return total / len(q_event_proxies)
+
+    def _get_reachable_offsets(
+        self, path: tuple[int, ...]
+    ) -> tuple[tuple[int, ...], int] | None:
+        """
+        Gets every offset, relative to the span of a leaf with parentage path
+        ``path``, which the search tree can create by subdividing the leaf,
+        including the start and end of the span, as numerators over their
+        least common denominator.
+
+        Returns none when there are more than 65536 such offsets.
+        """
+        # Offsets are memoized by whole-value assignment of deterministic
+        # results, so threads sharing the search tree at worst compute the
+        # same entry twice.
+        if path in self._reachable_offsets:
+            return self._reachable_offsets[path]
+        fractions = {abjad.Fraction(0), abjad.Fraction(1)}
+        parentage_ratios = ((1, 1),) + tuple((1, _) for _ in path)
+        for subdivision in self._look_up_leaf_subdivisions(parentage_ratios):
+            total, start = sum(subdivision), 0
+            for part in subdivision:
+                child_path = path + (total // math.gcd(part, total),)
+                child_offsets = self._get_reachable_offsets(child_path)
+                if child_offsets is None:
+                    self._reachable_offsets[path] = None
+                    return None
+                child_numerators, child_denominator = child_offsets
+                scale = abjad.Fraction(part, total * child_denominator)
+                fractions.update(
+                    abjad.Fraction(start, total) + _ * scale for _ in child_numerators
+                )
+                start += part
+            if 65536 < len(fractions):
+                self._reachable_offsets[path] = None
+                return None
+        denominator = math.lcm(*(_.denominator for _ in fractions))
+        offsets = (
+            tuple(
+                sorted(_.numerator * (denominator // _.denominator) for _ in fractions)
+            ),
+            denominator,
+        )
+        self._reachable_offsets[path] = offsets
+        return offsets
+
+    def _get_subdivision_table(
+        self,
+    ) -> tuple[
+        dict[tuple[int, ...], tuple[tuple[int, ...], ...]],
+        dict[tuple[int, ...], tuple[tuple[int, int], ...]],
+    ]:
+        """
+        Gets the search tree's definition compiled into lookup tables.
+
+        The first table maps the parentage path of a leaf, given as the
+        denominators of its parentage ratios below the root, to the
+        subdivisions the search tree permits for that leaf. The second table
+        maps each of those subdivisions to the parentage ratios of the
+        children it creates.
+
+        Tables are compiled once, on first use, by expanding the definition
+        from the root. They are not pickled with the search tree, so each
+        process compiles them again for the search trees it receives.
+        """
+        # Tables are built locally and assigned once complete, so that threads
+        # sharing the search tree never see a partial table.
+        if self._subdivision_table is not None:
+            return self._subdivision_table
+        subdivisions_by_path: dict[tuple[int, ...], tuple[tuple[int, ...], ...]] = {}
+        child_ratios_by_subdivision: dict[
+            tuple[int, ...], tuple[tuple[int, int], ...]
+        ] = {}
+        paths: list[tuple[int, ...]] = [()]
+        while paths:
+            path = paths.pop()
+            parentage_ratios = ((1, 1),) + tuple((1, _) for _ in path)
+            subdivisions = tuple(self._find_leaf_subdivisions(parentage_ratios))
+            subdivisions_by_path[path] = subdivisions
+            for subdivision in subdivisions:
+                total = sum(subdivision)
+                child_ratios = tuple(
+                    (part // math.gcd(part, total), total // math.gcd(part, total))
+                    for part in subdivision
+                )
+                child_ratios_by_subdivision[subdivision] = child_ratios
+                for _, denominator in child_ratios:
+                    child_path = path + (denominator,)
+                    if child_path not in subdivisions_by_path:
+                        subdivisions_by_path[child_path] = ()
+                        paths.append(child_path)
+        self._subdivision_table = (subdivisions_by_path, child_ratios_by_subdivision)
+        return self._subdivision_table
 
     @abc.abstractmethod
     def _is_valid_definition(self, definition: dict) -> bool:
         raise NotImplementedError
 
+    def _look_up_subdivided_q_grid(
+        self,
+        q_grid: _qgrid.CompactQGrid,
+        command: tuple[tuple[int, tuple[int, ...]], ...],
+        child_ratios: dict[tuple[int, ...], tuple[tuple[int, int], ...]],
+    ) -> _qgrid.CompactQGrid:
+        """
+        Subdivides the leaves of ``q_grid`` described by ``command``, looking
+        up the shape of the new compact q-grid in the search tree's grid
+        dictionary.
+
+        The grid dictionary maps the subdivision commands which derive a shape
+        from a single-leaf q-grid to its leaf offsets and parentage ratios.
+        Shapes do not depend on ``QEventProxies``, so they are stored the first
+        time any q-grid reaches them, until the dictionary holds
+        ``_maximum_grid_dictionary_size`` shapes; later shapes are computed
+        each time.
+        """
+        # Shapes are memoized by whole-value assignment of deterministic
+        # results, so threads sharing the search tree at worst compute the
+        # same entry twice.
+        assert self._grid_dictionary is not None
+        commands = q_grid.commands + (command,)
+        shape = self._grid_dictionary.get(commands)
+        if shape is None:
+            shape = q_grid._get_subdivided_shape(dict(command), child_ratios)
+            if len(self._grid_dictionary) < self._maximum_grid_dictionary_size:
+                self._grid_dictionary[commands] = shape
+        return q_grid._make_subdivided_q_grid(commands, shape)
+
+    def _look_up_leaf_subdivisions(
+        self, parentage_ratios: tuple
+    ) -> tuple[tuple[int, ...], ...]:
+        path = tuple(_[1] for _ in parentage_ratios[1:])
+        subdivisions = self._get_subdivision_table()[0].get(path)
+        if subdivisions is None:
+            subdivisions = tuple(self._find_leaf_subdivisions(parentage_ratios))
+        return subdivisions
+
     ### PUBLIC PROPERTIES ###
 
     @abc.abstractproperty
@@ -142,6 +417,28 @@ class SearchTree(abc.ABC):
         """
         return self._definition
 
+    @property
+    def precompiled(self) -> bool:
+        """
+        Is true when the search tree keeps a grid dictionary of the q-grid
+        shapes it reaches.
+
+        The shapes a search tree can reach, and their leaf offsets, depend only
+        on its definition. A precompiled search tree stores each shape the
+        first time it derives it from a ``CompactQGrid``, so that later
+        searches, for any ``QEventProxies``, only look shapes up and fit their
+        ``QEventProxies`` onto them.
+
+        Only searches with ``CompactQGrids`` use the grid dictionary: pass a
+        precompiled search tree to ``quantize`` in its ``q_schema`` together
+        with ``compact_q_grids=True``. Searches with ``QGrids`` are
+        unaffected. Candidates are still made one by one when the search tree
+        is called, which looks up each candidate's shape. The grid dictionary
+        is not pickled with the search tree: each process that receives the
+        search tree, such as a job handler's worker, fills its own.
+        """
+        return self._grid_dictionary is not None
+
 
 class UnweightedSearchTree(SearchTree):
     r"""
@@ -213,6 +510,20 @@ class UnweightedSearchTree(SearchTree):
         (1 (1 1))
         (1 (1 1 1))
 
+    ..  container:: example
+
+        Set ``precompiled`` to keep a grid dictionary of the shapes the search
+        tree reaches when called with ``CompactQGrids``:
+
+        >>> search_tree = nauert.UnweightedSearchTree(definition, precompiled=True)
+        >>> compact_q_grid = nauert.CompactQGrid([proxy_a, proxy_b])
+        >>> for grid in search_tree(compact_q_grid):
+        ...     print(grid.rtm_format())
+        (1 (1 1))
+        (1 (1 1 1))
+
+        Later calls look up these shapes instead of computing them again.
+
     """
 
     ### CLASS VARIABLES ###
@@ -342,8 +653,8 @@ class WeightedSearchTree(SearchTree):
 
     ### INITIALIZER ###
 
-    def __init__(self, definition: dict | None = None):
-        SearchTree.__init__(self, definition)
+    def __init__(self, definition: dict | None = None, precompiled: bool = False):
+        SearchTree.__init__(self, definition, precompiled)
         self._compositions = self._precompute_compositions()
         all_compositions = []
         for value in list(self._compositions.values()):
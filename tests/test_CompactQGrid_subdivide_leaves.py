@@ -0,0 +1,87 @@
+import abjad
+
+import nauert
+
+
+def test_CompactQGrid_subdivide_leaves_01():
+    a = nauert.QEventProxy(
+        nauert.SilentQEvent(abjad.duration.offset(0), ["A"]),
+        abjad.duration.offset(0),
+    )
+    b = nauert.QEventProxy(
+        nauert.SilentQEvent(abjad.duration.offset(1, 20), ["B"]),
+        abjad.duration.offset(1, 20),
+    )
+    c = nauert.QEventProxy(
+        nauert.SilentQEvent(abjad.duration.offset(9, 20), ["C"]),
+        abjad.duration.offset(9, 20),
+    )
+    d = nauert.QEventProxy(
+        nauert.SilentQEvent(abjad.duration.offset(11, 20), ["D"]),
+        abjad.duration.offset(11, 20),
+    )
+    e = nauert.QEventProxy(
+        nauert.SilentQEvent(abjad.duration.offset(1), ["E"]),
+        abjad.duration.offset(1),
+    )
+    compact_q_grid = nauert.CompactQGrid([a, b, c, d, e])
+    assert compact_q_grid.rtm_format() == "1"
+    assert compact_q_grid.numerators == (0, 1)
+    assert compact_q_grid.leaf_indices == (0, 0, 0, 1, 1)
+    assert compact_q_grid._find_divisible_leaf_indices() == [0]
+
+    compact_q_grid = compact_q_grid.subdivide_leaves([(0, (1, 1))])
+    assert compact_q_grid.rtm_format() == "(1 (1 1))"
+    assert compact_q_grid.numerators == (0, 1, 2)
+    assert compact_q_grid.denominator == 2
+    assert compact_q_grid.leaf_indices == (0, 0, 1, 1, 2)
+    assert compact_q_grid.parentage_ratios == (((1, 1), (1, 2)), ((1, 1), (1, 2)))
+
+    compact_q_grid = compact_q_grid.subdivide_leaves([(1, (3, 4, 5))])
+    assert compact_q_grid.rtm_format() == "(1 (1 (1 (3 4 5))))"
+    assert compact_q_grid.numerators == (0, 12, 15, 19, 24)
+    assert compact_q_grid.denominator == 24
+    assert compact_q_grid.leaf_indices == (0, 0, 1, 1, 4)
+    assert compact_q_grid.parentage_ratios[1:] == (
+        ((1, 1), (1, 2), (1, 4)),
+        ((1, 1), (1, 2), (1, 3)),
+        ((1, 1), (1, 2), (5, 12)),
+    )
+    assert compact_q_grid.commands == (((0, (1, 1)),), ((1, (3, 4, 5)),))
+
+    q_grid = compact_q_grid.to_q_grid()
+    assert q_grid.rtm_format() == compact_q_grid.rtm_format()
+    assert q_grid.offsets == compact_q_grid.offsets
+    assert q_grid.distance == compact_q_grid.distance
+    assert [_.q_event_proxies for _ in q_grid.leaves] == [[a, b], [c, d], [], [], [e]]
+
+
+def test_CompactQGrid_subdivide_leaves_02():
+    offsets = [
+        abjad.Fraction(0),
+        abjad.Fraction(1, 2 * 3**40),
+        abjad.Fraction(3, 2 * 3**40) + abjad.Fraction(1, 3**41),
+        abjad.Fraction(1, 2),
+        abjad.Fraction(1),
+    ]
+    q_event_proxies = [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.Offset(_), [i]),
+            abjad.Offset(_),
+        )
+        for i, _ in enumerate(offsets)
+    ]
+    compact_q_grid = nauert.CompactQGrid(q_event_proxies)
+    for _ in range(40):
+        compact_q_grid = compact_q_grid.subdivide_leaves([(0, (1, 1, 1))])
+    assert compact_q_grid.denominator == 3**40
+    assert 2**63 < compact_q_grid.denominator
+    assert compact_q_grid.numerators[:3] == (0, 1, 2)
+    assert compact_q_grid.leaf_indices == (0, 0, 2, 79, 81)
+    fraction = (
+        abjad.Fraction(1, 2 * 3**40)
+        + abjad.Fraction(1, 2 * 3**40)
+        - abjad.Fraction(1, 3**41)
+        + abjad.Fraction(1, 6)
+    ) / 5
+    assert compact_q_grid.distance == abjad.Duration(*fraction.as_integer_ratio())
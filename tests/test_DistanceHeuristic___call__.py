@@ -1,6 +1,8 @@
 import abjad
+import pytest
 
 import nauert
+from nauert import heuristics
 
 
 def test_DistanceHeuristic___call___01():
@@ -45,3 +47,69 @@ def test_DistanceHeuristic___call___02():
     assert q_grid.distance == abjad.Duration(1, 15)
     rtm = q_grid.rtm_format()
     assert rtm == "(1 (1 1 1 1 1))"
+
+
+def test_DistanceHeuristic___call___03():
+    q_events = [
+        nauert.PitchedQEvent(abjad.duration.offset(_), [0])
+        for _ in (0, 110, 333, 500, 667, 901)
+    ]
+    q_event_proxies = nauert.QEventProxy._from_q_events(
+        q_events, abjad.duration.offset(0), abjad.duration.offset(1000)
+    )
+    definition = {2: {2: {2: None}, 3: None}, 3: {2: None}, 5: None, 7: None}
+    search_tree = nauert.UnweightedSearchTree(definition)
+    for compact_q_grids in (False, True):
+        job = nauert.QuantizationJob(
+            1, search_tree, q_event_proxies, compact_q_grids=compact_q_grids
+        )
+        job()
+        q_grids = job.q_grids
+        assert 10 < len(q_grids)
+        heuristic = nauert.DistanceHeuristic()
+        indices = sorted(
+            range(len(q_grids)),
+            key=lambda _: heuristic._get_q_grid_key(q_grids[_]),
+        )
+        assert heuristics._rank_q_grids(q_grids) == indices
+        for vectorized in (False, True):
+            q_target_beat = nauert.QTargetBeat()
+            q_target_beat._q_grids = q_grids
+            heuristic = nauert.DistanceHeuristic(vectorized=vectorized)
+            heuristic((q_target_beat,))
+            q_grid = q_grids[indices[0]]
+            assert q_target_beat.q_grid.rtm_format() == q_grid.rtm_format()
+            assert q_target_beat.q_grid.distance == q_grid.distance
+
+
+def test_DistanceHeuristic___call___04(monkeypatch):
+    durations = [100, 125, 250, 333, 90, 1000, 150] * 4
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    string = abjad.lilypond(nauert.quantize(q_event_sequence))
+    heuristic = nauert.DistanceHeuristic(vectorized=True)
+    voice = nauert.quantize(q_event_sequence, heuristic=heuristic)
+    assert abjad.lilypond(voice) == string
+    monkeypatch.setattr(heuristics, "numpy", None)
+    voice = nauert.quantize(q_event_sequence, heuristic=heuristic)
+    assert abjad.lilypond(voice) == string
+
+
+def test_DistanceHeuristic___call___05(monkeypatch):
+    pytest.importorskip("numpy")
+    rankings = []
+
+    def rank_q_grids(q_grids):
+        indices = rank_q_grids_(q_grids)
+        rankings.append(indices)
+        return indices
+
+    rank_q_grids_ = heuristics._rank_q_grids
+    monkeypatch.setattr(heuristics, "_rank_q_grids", rank_q_grids)
+    durations = [100, 125, 250, 333, 90, 1000, 150] * 4
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    string = abjad.lilypond(nauert.quantize(q_event_sequence))
+    assert not rankings
+    heuristic = nauert.DistanceHeuristic(vectorized=True)
+    voice = nauert.quantize(q_event_sequence, heuristic=heuristic)
+    assert abjad.lilypond(voice) == string
+    assert any(_ is not None for _ in rankings)
@@ -0,0 +1,55 @@
+import random
+
+import abjad
+import pytest
+
+import nauert
+
+
+def test_IncrementalQuantizer___call___01():
+    random_ = random.Random(1)
+    for time_signature in [(4, 4), (3, 4), (5, 8)]:
+        durations = [
+            random_.choice([125, 250, 333, 500, 750, 1500, 2500, -500])
+            for _ in range(24)
+        ]
+        q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+        q_schema = nauert.MeasurewiseQSchema(time_signature=time_signature)
+        string = abjad.lilypond(nauert.quantize(q_event_sequence, q_schema=q_schema))
+        for look_ahead_in_ms in (0, 1000):
+            quantizer = nauert.IncrementalQuantizer(
+                q_schema=q_schema, look_ahead_in_ms=look_ahead_in_ms
+            )
+            measures = list(quantizer(q_event_sequence))
+            assert abjad.lilypond(abjad.Voice(measures)) == string
+
+
+def test_IncrementalQuantizer___call___02():
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        [250, 250, 500, 1000, 750, 250, 2000, 1000, 1000, 500, 500, 4000, 1000]
+    )
+    string = abjad.lilypond(nauert.quantize(q_event_sequence))
+    q_events = list(q_event_sequence)
+    q_events[1], q_events[2] = q_events[2], q_events[1]
+    q_events[5], q_events[6] = q_events[6], q_events[5]
+    quantizer = nauert.IncrementalQuantizer(look_ahead_in_ms=1000)
+    counts, measures = [], []
+    for q_event in q_events:
+        new_measures = quantizer.push(q_event)
+        counts.append(len(new_measures))
+        measures.extend(new_measures)
+    assert counts == [0] * 12 + [1, 3]
+    assert abjad.lilypond(abjad.Voice(measures)) == string
+
+
+def test_IncrementalQuantizer___call___03():
+    class FirstQGridHeuristic(nauert.Heuristic):
+        def _process(self, q_target_beats):
+            for q_target_beat in q_target_beats:
+                q_target_beat._q_grid = (q_target_beat.q_grids or [nauert.QGrid()])[0]
+            return q_target_beats
+
+    heuristic = FirstQGridHeuristic()
+    nauert.IncrementalQuantizer(heuristic=heuristic)
+    with pytest.raises(ValueError):
+        nauert.IncrementalQuantizer(heuristic=heuristic, retained_q_grid_count=1)
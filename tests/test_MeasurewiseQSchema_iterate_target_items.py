@@ -0,0 +1,25 @@
+import itertools
+
+import abjad
+
+import nauert
+
+
+def test_MeasurewiseQSchema_iterate_target_items_01():
+    q_schema = nauert.MeasurewiseQSchema(
+        {
+            2: {"time_signature": abjad.TimeSignature((3, 4))},
+            4: {"tempo": abjad.MetronomeMark(abjad.Duration(1, 4), 120)},
+        },
+    )
+    q_target = q_schema(abjad.Duration(20000))
+    items = list(q_schema.iterate_target_items(abjad.Duration(20000)))
+    assert len(items) == len(q_target.items)
+    for item, target_item in zip(items, q_target.items):
+        assert item.offset_in_ms == target_item.offset_in_ms
+        assert item.time_signature == target_item.time_signature
+        assert item.tempo == target_item.tempo
+    items = list(itertools.islice(q_schema.iterate_target_items(), 100))
+    assert len(items) == 100
+    assert items[-1].time_signature.pair == (3, 4)
+    assert items[-1].tempo.units_per_minute == 120
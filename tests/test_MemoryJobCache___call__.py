@@ -0,0 +1,92 @@
+import asyncio
+
+import abjad
+
+import nauert
+
+
+def test_MemoryJobCache___call___01():
+    durations = [250, 250, 500, 333, 667, 1000] * 6 + [125, 875]
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    for compact_q_grids in (False, True):
+        string = abjad.lilypond(
+            nauert.quantize(q_event_sequence, compact_q_grids=compact_q_grids)
+        )
+        job_cache = nauert.MemoryJobCache()
+        for job_handler in (
+            nauert.SerialJobHandler(),
+            nauert.ParallelJobHandler(),
+            nauert.ThreadedJobHandler(),
+        ):
+            voice = nauert.quantize(
+                q_event_sequence,
+                job_handler=job_handler,
+                compact_q_grids=compact_q_grids,
+                job_cache=job_cache,
+            )
+            assert abjad.lilypond(voice) == string
+        info = job_cache.info()
+        assert info["misses"] == info["size"] == 4
+        assert info["hits"] == 2 * 20
+        voice = asyncio.run(
+            nauert.quantize_async(
+                q_event_sequence,
+                compact_q_grids=compact_q_grids,
+                job_cache=job_cache,
+            )
+        )
+        assert abjad.lilypond(voice) == string
+        assert job_cache.info()["hits"] == 3 * 20
+
+
+def test_MemoryJobCache___call___02():
+    q_events = [
+        nauert.PitchedQEvent(abjad.duration.offset(1000 * i + 250), [i])
+        for i in range(3)
+    ]
+    search_tree = nauert.UnweightedSearchTree()
+    jobs = []
+    for i, q_event in enumerate(q_events):
+        q_event_proxies = nauert.QEventProxy._from_q_events(
+            [q_event],
+            abjad.duration.offset(1000 * i),
+            abjad.duration.offset(1000 * (i + 1)),
+        )
+        jobs.append(nauert.QuantizationJob(i, search_tree, q_event_proxies))
+    job_cache = nauert.MemoryJobCache(maxsize=1)
+    jobs = job_cache(jobs, nauert.SerialJobHandler())
+    assert sorted(_.job_id for _ in jobs) == [0, 1, 2]
+    assert job_cache.info() == {"hits": 0, "misses": 1, "maxsize": 1, "size": 1}
+    rtm_formats = [_.rtm_format() for _ in jobs[0].q_grids]
+    for job in jobs:
+        assert [_.rtm_format() for _ in job.q_grids] == rtm_formats
+        for q_grid in job.q_grids:
+            for leaf in q_grid.leaves:
+                for q_event_proxy in leaf.q_event_proxies:
+                    assert q_event_proxy in job.q_event_proxies
+    job = nauert.QuantizationJob(3, nauert.UnweightedSearchTree({3: None}), [])
+    job_cache([job], nauert.SerialJobHandler())
+    assert len(job_cache) == 1
+    assert job_cache.info()["misses"] == 2
+    job_cache.clear()
+    assert job_cache.info() == {"hits": 0, "misses": 0, "maxsize": 1, "size": 0}
+
+
+def test_MemoryJobCache___call___03():
+    durations = [250, 250, 500, 333, 667, 1000] * 2
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    string = abjad.lilypond(nauert.quantize(q_event_sequence))
+    job_cache = nauert.MemoryJobCache()
+    sizes = []
+    for job_handler in (
+        nauert.ParallelJobHandler(returned_q_grid_count=1),
+        nauert.SerialJobHandler(),
+        nauert.ParallelJobHandler(returned_q_grid_count=2),
+    ):
+        voice = nauert.quantize(
+            q_event_sequence, job_handler=job_handler, job_cache=job_cache
+        )
+        assert abjad.lilypond(voice) == string
+        sizes.append(len(job_cache))
+    assert job_cache.info()["misses"] == sizes[-1]
+    assert sizes == [sizes[0], 2 * sizes[0], 3 * sizes[0]]
@@ -4,6 +4,17 @@ import pytest
 import nauert
 
 
+def make_q_event_proxies(offsets):
+    return [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.duration.offset(x, y), [x], index=i),
+            abjad.duration.offset(0),
+            abjad.duration.offset(1),
+        )
+        for i, (x, y) in enumerate(offsets)
+    ]
+
+
 class Job:
 
     def __init__(self, number):
@@ -54,3 +65,60 @@ def test_ParallelJobHandler___call___02():
     assert sorted(a_jobs[0].q_grids, key=lambda x: x.root_node.rtm_format()) == sorted(
         b_jobs[0].q_grids, key=lambda x: x.root_node.rtm_format()
     )
+
+
+def test_ParallelJobHandler___call___03():
+    definition = {2: {2: {2: None}, 3: None}, 5: None}
+    search_tree = nauert.UnweightedSearchTree(definition)
+    offsets = [(0, 1), (1, 5), (1, 3), (1, 2), (3, 4), (1, 1)]
+    q_event_proxies = make_q_event_proxies(offsets)
+    a_jobs = nauert.SerialJobHandler()(
+        [
+            nauert.QuantizationJob(i, search_tree, q_event_proxies[:i])
+            for i in range(1, 7)
+        ]
+    )
+    for compact_q_grids in (False, True):
+        jobs = [
+            nauert.QuantizationJob(
+                i, search_tree, q_event_proxies[:i], compact_q_grids=compact_q_grids
+            )
+            for i in range(1, 7)
+        ]
+        b_jobs = nauert.ParallelJobHandler()(jobs)
+        assert b_jobs == jobs
+        for a_job, b_job in zip(a_jobs, b_jobs, strict=True):
+            assert [x.rtm_format() for x in b_job.q_grids] == [
+                x.rtm_format() for x in a_job.q_grids
+            ]
+            for a_q_grid, b_q_grid in zip(a_job.q_grids, b_job.q_grids, strict=True):
+                if compact_q_grids:
+                    b_q_grid = b_q_grid.to_q_grid()
+                assert b_q_grid.offsets == a_q_grid.offsets
+                for a_leaf, b_leaf in zip(
+                    a_q_grid.leaves, b_q_grid.leaves, strict=True
+                ):
+                    assert b_leaf.is_divisible == a_leaf.is_divisible
+                    assert len(b_leaf.q_event_proxies) == len(a_leaf.q_event_proxies)
+                    for a_proxy, b_proxy in zip(
+                        a_leaf.q_event_proxies, b_leaf.q_event_proxies
+                    ):
+                        assert b_proxy is a_proxy
+
+
+def test_ParallelJobHandler___call___04():
+    search_tree = nauert.UnweightedSearchTree()
+    q_event_proxies = make_q_event_proxies([(i, 8) for i in range(8)])
+    jobs = [
+        nauert.QuantizationJob(i, search_tree, q_event_proxies[: i % 8])
+        for i in range(40)
+    ]
+    chunks = nauert.jobhandlers._chunk_jobs(jobs, 8)
+    indices = [index for chunk in chunks for index, job in chunk]
+    assert sorted(indices) == list(range(40))
+    costs = [jobs[index]._estimate_cost() for index in indices]
+    assert costs == sorted(costs, reverse=True)
+    assert len(chunks[0]) < len(chunks[-1])
+    finished_jobs = nauert.ParallelJobHandler()(jobs)
+    assert [job.job_id for job in finished_jobs] == list(range(40))
+    assert all(job.q_grids for job in finished_jobs)
@@ -0,0 +1,82 @@
+import abjad
+
+import nauert
+
+
+def make_q_event_proxies(offsets):
+    return [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.duration.offset(x, y), [x], index=i),
+            abjad.duration.offset(0),
+            abjad.duration.offset(1),
+        )
+        for i, (x, y) in enumerate(offsets)
+    ]
+
+
+class Job:
+
+    def __init__(self, number):
+        self.number = number
+
+    def __call__(self):
+        self.result = [
+            x for x in abjad.math.yield_all_compositions_of_integer(self.number)
+        ]
+
+
+def test_PooledJobHandler___call___01():
+    job_handler = nauert.PooledJobHandler(2)
+    assert not job_handler.is_running
+    with job_handler:
+        jobs = job_handler([Job(x) for x in range(1, 11)])
+        assert job_handler.is_running
+        assert [len(job.result) for job in jobs] == [2 ** (x - 1) for x in range(1, 11)]
+        job_handler.resize(1)
+        assert not job_handler.is_running
+        assert job_handler.process_count == 1
+        jobs = job_handler([Job(x) for x in range(1, 4)])
+        assert [job.number for job in jobs] == [1, 2, 3]
+    assert not job_handler.is_running
+
+
+def test_PooledJobHandler___call___02():
+    definition = {2: {2: {2: None}, 3: None}, 5: None}
+    search_tree = nauert.UnweightedSearchTree(definition)
+    offsets = [(0, 1), (1, 5), (1, 3), (1, 2), (3, 4), (1, 1)]
+    q_event_proxies = make_q_event_proxies(offsets)
+    a_jobs = nauert.SerialJobHandler()(
+        [nauert.QuantizationJob(1, search_tree, q_event_proxies)]
+    )
+    with nauert.PooledJobHandler(2) as job_handler:
+        for i in range(2):
+            b_jobs = job_handler(
+                [nauert.QuantizationJob(1, search_tree, q_event_proxies)]
+            )
+            a_q_grids, b_q_grids = a_jobs[0].q_grids, b_jobs[0].q_grids
+            assert [x.rtm_format() for x in b_q_grids] == [
+                x.rtm_format() for x in a_q_grids
+            ]
+            assert [x.distance for x in b_q_grids] == [x.distance for x in a_q_grids]
+
+
+def test_PooledJobHandler___call___03():
+    durations = [250, 250, 500, 333, 667, 1000, 100, 900]
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    string = abjad.lilypond(nauert.quantize(q_event_sequence))
+    with nauert.PooledJobHandler(2, returned_q_grid_count=1) as job_handler:
+        assert job_handler.returned_q_grid_count == 1
+        voice = nauert.quantize(q_event_sequence, job_handler=job_handler)
+        assert abjad.lilypond(voice) == string
+        q_target = nauert.MeasurewiseQSchema()(q_event_sequence.duration_in_ms)
+        jobs = q_target._make_jobs(
+            q_event_sequence, nauert.DistanceHeuristic(), returned_q_grid_count=1
+        )
+        q_grid_counts = [len(_.q_grids) for _ in nauert.SerialJobHandler()(jobs)]
+        jobs = q_target._make_jobs(
+            q_event_sequence, nauert.DistanceHeuristic(), returned_q_grid_count=1
+        )
+        jobs = job_handler(jobs)
+    assert any(1 < _ for _ in q_grid_counts)
+    assert [len(_.q_grids) for _ in jobs] == [1 for _ in q_grid_counts]
+    assert [_.q_grid_count for _ in jobs] == q_grid_counts
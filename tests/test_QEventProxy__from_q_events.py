@@ -0,0 +1,30 @@
+import abjad
+import pytest
+
+import nauert
+
+
+def test_QEventProxy__from_q_events_01():
+    minimum, maximum = abjad.duration.offset(100), abjad.duration.offset(1000)
+    q_events = [
+        nauert.PitchedQEvent(abjad.duration.offset(100), [0]),
+        nauert.PitchedQEvent(abjad.duration.offset(130), [0, 1, 4]),
+        nauert.SilentQEvent(abjad.duration.offset(1000, 3)),
+        nauert.TerminalQEvent(abjad.duration.offset(1000)),
+    ]
+    proxies = nauert.QEventProxy._from_q_events(q_events, minimum, maximum)
+    assert proxies == [nauert.QEventProxy(_, minimum, maximum) for _ in q_events]
+    assert [_.offset() for _ in proxies] == [
+        abjad.duration.offset(0),
+        abjad.duration.offset(1, 30),
+        abjad.duration.offset(7, 27),
+        abjad.duration.offset(1),
+    ]
+    assert nauert.QEventProxy._from_q_events([], minimum, maximum) == []
+
+
+def test_QEventProxy__from_q_events_02():
+    q_events = [nauert.PitchedQEvent(abjad.duration.offset(1100), [0])]
+    minimum, maximum = abjad.duration.offset(100), abjad.duration.offset(1000)
+    with pytest.raises(AssertionError):
+        nauert.QEventProxy._from_q_events(q_events, minimum, maximum)
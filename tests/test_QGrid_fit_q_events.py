@@ -42,3 +42,65 @@ def test_QGrid_fit_q_events_01():
     assert q_grid.leaves[0].q_event_proxies == [a, b]
     assert q_grid.leaves[1].q_event_proxies == [c, d, e]
     assert q_grid.leaves[2].q_event_proxies == [g, f]
+
+
+def test_QGrid_fit_q_events_02():
+    q_grid = nauert.QGrid()
+    a, b, c, d, e, f, g = [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.duration.offset(x, 20), [x]),
+            abjad.duration.offset(x, 20),
+        )
+        for x in (0, 1, 9, 10, 11, 19, 20)
+    ]
+    q_grid.fit_q_events([a, b, c, d, e, f, g])
+    assert q_grid.leaves[0].preceding_q_event_proxies == []
+    assert q_grid.leaves[0].succeeding_q_event_proxies == [a, b, c, d]
+    assert q_grid.leaves[1].preceding_q_event_proxies == [e, f]
+    assert q_grid.leaves[1].succeeding_q_event_proxies == [g]
+    assert q_grid._partition_q_event_proxies() == [
+        ((), 4, 1),
+        ((e, f), 1, 1),
+    ]
+
+    copied_q_grid, q_events = q_grid._copy_and_subdivide_leaves([(0, (1, 1))])
+    copied_q_grid.fit_q_events(q_events)
+    assert q_grid._partition_q_event_proxies() == [
+        ((), 4, 1),
+        ((e, f), 1, 1),
+    ]
+    assert copied_q_grid._partition_q_event_proxies() == [
+        ((), 2, 1),
+        ((c,), 2, 1),
+        ((f,), 1, 1),
+    ]
+
+    q_events = q_grid.subdivide_leaves([(0, (1, 1))])
+    q_grid.fit_q_events(q_events)
+    assert q_grid._partition_q_event_proxies() == [
+        ((), 2, 1),
+        ((c,), 2, 1),
+        ((f,), 1, 1),
+    ]
+    assert q_grid.leaves[2].q_event_proxies == [g, f]
+
+
+def test_QGrid_fit_q_events_03():
+    q_grid = nauert.QGrid()
+    a, b, c, d, e, f, g, h = [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.duration.offset(x, 20), [x]),
+            abjad.duration.offset(x, 20),
+        )
+        for x in (0, 1, 9, 10, 11, 19, 20, 20)
+    ]
+    q_grid.fit_q_events([a, b, c, d, e, f, g])
+    assert q_grid.leaves[1].preceding_q_event_proxies == [e, f]
+
+    q_grid.leaves[1].q_event_proxies[0] = h
+    assert q_grid.leaves[1].preceding_q_event_proxies == [f]
+    assert q_grid.leaves[1].succeeding_q_event_proxies == [h, g]
+    assert q_grid._partition_q_event_proxies() == [
+        ((), 4, 1),
+        ((f,), 2, 2),
+    ]
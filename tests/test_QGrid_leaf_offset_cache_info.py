@@ -0,0 +1,37 @@
+import abjad
+
+import nauert
+
+
+def test_QGrid_leaf_offset_cache_info_01():
+    nauert.QGrid.clear_leaf_offset_cache(maxsize=2)
+    try:
+        q_grid_a = nauert.QGrid()
+        q_grid_b = nauert.QGrid()
+        q_grid_b.subdivide_leaves([(0, (1, 1))])
+        q_grid_c = nauert.QGrid()
+        q_grid_c.subdivide_leaves([(0, (1, 1, 1))])
+        assert q_grid_a.offsets == (abjad.duration.offset(0), abjad.duration.offset(1))
+        assert q_grid_b.offsets[1] == abjad.duration.offset(1, 2)
+        assert nauert.QGrid().offsets == q_grid_a.offsets
+        assert nauert.QGrid.leaf_offset_cache_info() == {
+            "hits": 1,
+            "misses": 2,
+            "maxsize": 2,
+            "size": 2,
+        }
+        assert q_grid_c.offsets[1] == abjad.duration.offset(1, 3)
+        assert nauert.QGrid().offsets == q_grid_a.offsets
+        q_grid_d = nauert.QGrid()
+        q_grid_d.subdivide_leaves([(0, (1, 1))])
+        assert q_grid_d.offsets[1] == abjad.duration.offset(1, 2)
+        assert nauert.QGrid.leaf_offset_cache_info() == {
+            "hits": 2,
+            "misses": 4,
+            "maxsize": 2,
+            "size": 2,
+        }
+        q_grid_b.subdivide_leaves([(1, (1, 1))])
+        assert q_grid_b.offsets[2] == abjad.duration.offset(3, 4)
+    finally:
+        nauert.QGrid.clear_leaf_offset_cache(maxsize=4096)
@@ -0,0 +1,31 @@
+import abjad
+
+import nauert
+
+
+def test_QGrid_regroup_leaves_with_unencessary_divisions_01():
+    q_grid = nauert.QGrid()
+    q_grid.subdivide_leaves([(0, (1, 1))])
+    q_grid.subdivide_leaves([(0, (1, 1)), (1, (1, 1))])
+    q_grid.subdivide_leaves([(0, (1, 1))])
+    assert q_grid.rtm_format() == "(1 ((1 ((1 (1 1)) 1)) (1 (1 1))))"
+    a, b = [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.duration.offset(x, 8), [x]),
+            abjad.duration.offset(x, 8),
+        )
+        for x in (0, 6)
+    ]
+    q_grid.fit_q_events([a, b])
+    assert len(q_grid.leaves) == 6
+    q_grid.regroup_leaves_with_unencessary_divisions()
+    assert q_grid.rtm_format() == "(1 (1 (1 (1 1))))"
+    assert len(q_grid.leaves) == 4
+    assert q_grid.offsets == (
+        abjad.duration.offset(0),
+        abjad.duration.offset(1, 2),
+        abjad.duration.offset(3, 4),
+        abjad.duration.offset(1),
+    )
+    assert q_grid.leaves[0].q_event_proxies == [a]
+    assert q_grid.leaves[2].q_event_proxies == [b]
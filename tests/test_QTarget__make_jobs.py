@@ -0,0 +1,66 @@
+import bisect
+import random
+
+import abjad
+import pytest
+
+import nauert
+from nauert import qtargets
+
+
+def test_QTarget__make_jobs_01():
+    beat_offsets = [abjad.duration.offset(1000 * i, 3) for i in range(10)]
+    q_event_offsets = [
+        abjad.duration.offset(0),
+        abjad.duration.offset(1000, 3),
+        abjad.duration.offset(333333333333333, 1000000000000),
+        abjad.duration.offset(333333333333334, 1000000000000),
+        abjad.duration.offset(2000, 3) + abjad.Duration(1, 10**20),
+        abjad.duration.offset(5000),
+    ]
+    indices = [bisect.bisect(beat_offsets, _) - 1 for _ in q_event_offsets]
+    assert indices == [0, 1, 0, 1, 2, 9]
+    assert qtargets._get_beat_indices(beat_offsets, q_event_offsets) == indices
+
+
+def test_QTarget__make_jobs_02(monkeypatch):
+    random_ = random.Random(1)
+    durations = [random_.choice([100, 125, 250, 333]) for _ in range(64)]
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    tempo = abjad.MetronomeMark(abjad.Duration(1, 4), 90)
+    q_schema = nauert.MeasurewiseQSchema(tempo=tempo)
+    string = abjad.lilypond(nauert.quantize(q_event_sequence, q_schema=q_schema))
+    monkeypatch.setattr(qtargets, "numpy", None)
+    assert string == abjad.lilypond(
+        nauert.quantize(q_event_sequence, q_schema=q_schema)
+    )
+
+
+def test_QTarget__make_jobs_03():
+    class FirstQGridHeuristic(nauert.Heuristic):
+        def _process(self, q_target_beats):
+            for q_target_beat in q_target_beats:
+                q_target_beat._q_grid = (q_target_beat.q_grids or [nauert.QGrid()])[0]
+            return q_target_beats
+
+    durations = [250, 250, 500, 333, 667, 1000]
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    heuristic = nauert.DistanceHeuristic()
+    for keywords, retained_q_grid_count, q_grid_key in (
+        ({}, None, nauert.quantizationjob._get_distance_key),
+        ({"retained_q_grid_count": 3}, 3, heuristic._get_q_grid_key),
+        ({"returned_q_grid_count": 1}, None, heuristic._get_q_grid_key),
+    ):
+        q_target = nauert.MeasurewiseQSchema()(q_event_sequence.duration_in_ms)
+        jobs = q_target._make_jobs(q_event_sequence, heuristic, **keywords)
+        assert jobs
+        for job in jobs:
+            assert job.retained_q_grid_count == retained_q_grid_count
+            assert job.q_grid_key == q_grid_key
+    q_target = nauert.MeasurewiseQSchema()(q_event_sequence.duration_in_ms)
+    jobs = q_target._make_jobs(q_event_sequence, FirstQGridHeuristic())
+    assert all(_.retained_q_grid_count is None for _ in jobs)
+    with pytest.raises(ValueError, match="returned_q_grid_count"):
+        q_target._make_jobs(
+            q_event_sequence, FirstQGridHeuristic(), returned_q_grid_count=1
+        )
@@ -3,6 +3,17 @@ import abjad
 import nauert
 
 
+def make_q_event_proxies(offsets):
+    return [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.duration.offset(x, y), [x], index=i),
+            abjad.duration.offset(0),
+            abjad.duration.offset(1),
+        )
+        for i, (x, y) in enumerate(offsets)
+    ]
+
+
 def test_QuantizationJob___call___01():
     job_id = 1
     definition = {2: {2: {2: None}, 3: None}, 5: None}
@@ -82,3 +93,295 @@ def test_QuantizationJob___call___01():
         "(1 ((1 ((1 (1 1)) (1 (1 1)))) (1 (1 1 1))))",
         "(1 ((1 ((1 (1 1)) (1 (1 1)))) (1 ((1 (1 1)) (1 (1 1))))))",
     ], rtm_formats
+
+
+def test_QuantizationJob___call___02():
+    definition = {2: {2: {2: None}, 3: None}, 5: None}
+    search_tree = nauert.UnweightedSearchTree(definition)
+    offsets = [(0, 1), (1, 5), (1, 3), (1, 2), (3, 4), (1, 1)]
+    q_event_proxies = make_q_event_proxies(offsets)
+    job = nauert.QuantizationJob(1, search_tree, q_event_proxies)
+    job()
+    compact_job = nauert.QuantizationJob(
+        1, search_tree, q_event_proxies, compact_q_grids=True
+    )
+    compact_job()
+    assert compact_job.compact_q_grids is True
+    assert len(compact_job.q_grids) == len(job.q_grids)
+    for q_grid, compact_q_grid in zip(job.q_grids, compact_job.q_grids, strict=True):
+        assert isinstance(compact_q_grid, nauert.CompactQGrid)
+        assert compact_q_grid.rtm_format() == q_grid.rtm_format()
+        assert compact_q_grid.offsets == q_grid.offsets
+        assert compact_q_grid.distance == q_grid.distance
+        converted = compact_q_grid.to_q_grid()
+        assert converted.rtm_format() == q_grid.rtm_format()
+        for leaf, converted_leaf in zip(q_grid.leaves, converted.leaves, strict=True):
+            assert leaf.q_event_proxies == converted_leaf.q_event_proxies
+
+
+def test_QuantizationJob___call___03():
+    search_trees = [
+        nauert.UnweightedSearchTree(),
+        nauert.WeightedSearchTree(
+            {"divisors": (2, 3, 5), "max_depth": 2, "max_divisions": 2}
+        ),
+    ]
+    offsets = [(0, 1), (2, 11), (1, 3), (5, 12), (7, 9), (1, 1)]
+    q_event_proxies = make_q_event_proxies(offsets)
+    for search_tree in search_trees:
+        for compact_q_grids in (False, True):
+            job = nauert.QuantizationJob(
+                1, search_tree, q_event_proxies, compact_q_grids=compact_q_grids
+            )
+            job()
+            q_grids = sorted(job.q_grids, key=lambda x: (x.distance, len(x.offsets)))
+            best_first_job = nauert.QuantizationJob(
+                1,
+                search_tree,
+                q_event_proxies,
+                compact_q_grids=compact_q_grids,
+                best_first=True,
+            )
+            best_first_job()
+            assert best_first_job.best_first is True
+            assert len(best_first_job.q_grids) == 1
+            q_grid = best_first_job.q_grids[0]
+            assert q_grid.rtm_format() == q_grids[0].rtm_format()
+            assert q_grid.distance == q_grids[0].distance
+
+
+def test_QuantizationJob___call___04():
+    definition = {2: {2: {2: None}, 3: None}, 5: None}
+    search_tree = nauert.UnweightedSearchTree(definition)
+    offsets = [(0, 1), (1, 5), (1, 3), (1, 2), (3, 4), (1, 1)]
+    q_event_proxies = make_q_event_proxies(offsets)
+    job = nauert.QuantizationJob(1, search_tree, q_event_proxies)
+    job()
+    heuristic = nauert.DistanceHeuristic()
+    for count in (1, 3, len(job.q_grids), len(job.q_grids) + 1):
+        for compact_q_grids in (False, True):
+            retaining_job = nauert.QuantizationJob(
+                1,
+                search_tree,
+                q_event_proxies,
+                compact_q_grids=compact_q_grids,
+                retained_q_grid_count=count,
+                q_grid_key=heuristic._get_q_grid_key,
+            )
+            retaining_job()
+            assert retaining_job.retained_q_grid_count == count
+            indices = sorted(
+                range(len(job.q_grids)),
+                key=lambda i: heuristic._get_q_grid_key(job.q_grids[i]),
+            )[:count]
+            expected = [job.q_grids[i].rtm_format() for i in sorted(indices)]
+            actual = [x.rtm_format() for x in retaining_job.q_grids]
+            assert actual == expected
+
+
+def test_QuantizationJob___call___05():
+    definition = {2: {2: {2: None}, 3: None}, 5: None}
+    search_tree = nauert.UnweightedSearchTree(definition)
+    for offsets, rtm_formats in (
+        ([(0, 1), (1, 1)], ["1"]),
+        ([(0, 1), (0, 1), (1, 1)], ["1"]),
+        ([(0, 1), (1, 2), (1, 1)], ["1", "(1 (1 1 1 1 1))", "(1 (1 1))"]),
+        (
+            [(1, 4), (3, 4)],
+            [
+                "1",
+                "(1 (1 1 1 1 1))",
+                "(1 (1 1))",
+                "(1 ((1 (1 1 1)) (1 (1 1 1))))",
+                "(1 ((1 (1 1 1)) (1 (1 1))))",
+                "(1 ((1 (1 1)) (1 (1 1 1))))",
+                "(1 ((1 (1 1)) (1 (1 1))))",
+            ],
+        ),
+    ):
+        q_event_proxies = make_q_event_proxies(offsets)
+        for compact_q_grids in (False, True):
+            job = nauert.QuantizationJob(
+                1, search_tree, q_event_proxies, compact_q_grids=compact_q_grids
+            )
+            job()
+            assert [_.rtm_format() for _ in job.q_grids] == rtm_formats
+
+
+def test_QuantizationJob___call___06():
+    search_trees = [
+        nauert.UnweightedSearchTree(),
+        nauert.WeightedSearchTree(
+            {"divisors": (2, 3, 5), "max_depth": 2, "max_divisions": 2}
+        ),
+    ]
+    beats = [
+        [(0, 1), (2, 11), (1, 3), (5, 12), (7, 9), (1, 1)],
+        [(1, 7), (1, 2), (4, 5)],
+        [(0, 1), (2, 11), (1, 3), (5, 12), (7, 9), (1, 1)],
+    ]
+    for search_tree in search_trees:
+        precompiled_search_tree = type(search_tree)(
+            search_tree.definition, precompiled=True
+        )
+        assert not search_tree.precompiled
+        assert precompiled_search_tree.precompiled
+        assert precompiled_search_tree == search_tree
+        sizes = []
+        for offsets in beats:
+            q_event_proxies = make_q_event_proxies(offsets)
+            job = nauert.QuantizationJob(
+                1, search_tree, q_event_proxies, compact_q_grids=True
+            )
+            job()
+            precompiled_job = nauert.QuantizationJob(
+                1, precompiled_search_tree, q_event_proxies, compact_q_grids=True
+            )
+            precompiled_job()
+            assert precompiled_job.q_grids == job.q_grids
+            for q_grid, precompiled_q_grid in zip(
+                job.q_grids, precompiled_job.q_grids, strict=True
+            ):
+                assert precompiled_q_grid.numerators == q_grid.numerators
+                assert precompiled_q_grid.leaf_indices == q_grid.leaf_indices
+            sizes.append(len(precompiled_search_tree._grid_dictionary))
+        assert 0 < sizes[0]
+        assert sizes[1] == sizes[2]
+
+
+def test_QuantizationJob___call___07():
+    search_tree = nauert.UnweightedSearchTree()
+    offsets = [(0, 1), (2, 11), (1, 3), (5, 12), (7, 9), (1, 1)]
+    q_event_proxies = make_q_event_proxies(offsets)
+    options = [
+        {},
+        {"compact_q_grids": True},
+        {"best_first": True},
+        {"retained_q_grid_count": 4},
+    ]
+    for keywords in options:
+        job = nauert.QuantizationJob(1, search_tree, q_event_proxies, **keywords)
+        job()
+        assert job.exhausted_budget is None
+        bounded_job = nauert.QuantizationJob(
+            1, search_tree, q_event_proxies, time_limit=60, **keywords
+        )
+        bounded_job()
+        assert bounded_job.exhausted_budget is None
+        assert bounded_job._get_cache_key() is None
+        assert [_.rtm_format() for _ in bounded_job.q_grids] == [
+            _.rtm_format() for _ in job.q_grids
+        ]
+        bounded_job = nauert.QuantizationJob(
+            1, search_tree, q_event_proxies, max_q_grid_count=3, **keywords
+        )
+        bounded_job()
+        assert bounded_job.exhausted_budget == "max_q_grid_count"
+        assert 0 < len(bounded_job.q_grids) <= 3
+        bounded_job = nauert.QuantizationJob(
+            1, search_tree, q_event_proxies, max_expansion_depth=0, **keywords
+        )
+        bounded_job()
+        assert bounded_job.exhausted_budget == "max_expansion_depth"
+        assert [_.rtm_format() for _ in bounded_job.q_grids] == ["1"]
+        bounded_job = nauert.QuantizationJob(
+            1, search_tree, q_event_proxies, max_expansion_depth=1, **keywords
+        )
+        bounded_job()
+        assert bounded_job.exhausted_budget == "max_expansion_depth"
+        for q_grid in bounded_job.q_grids:
+            assert q_grid.rtm_format().count("(") <= 2
+    job = nauert.QuantizationJob(1, search_tree, q_event_proxies[:1])
+    job()
+    bounded_job = nauert.QuantizationJob(
+        1, search_tree, q_event_proxies[:1], max_q_grid_count=1
+    )
+    bounded_job()
+    assert len(job.q_grids) == 1
+    assert bounded_job.exhausted_budget is None
+
+
+def test_QuantizationJob___call___08():
+    durations = [250, 250, 500, 333, 667, 1000] * 2
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    string = abjad.lilypond(nauert.quantize(q_event_sequence))
+    job_cache = nauert.MemoryJobCache()
+    for job_handler in (nauert.SerialJobHandler(), nauert.ParallelJobHandler()):
+        report = nauert.QuantizationReport()
+        voice = nauert.quantize(
+            q_event_sequence,
+            job_handler=job_handler,
+            job_cache=job_cache,
+            max_expansion_depth=0,
+            report=report,
+        )
+        assert abjad.lilypond(voice) != string
+        assert report.exhausted_budgets
+        assert set(report.exhausted_budgets.values()) == {"max_expansion_depth"}
+        assert set(report.q_grid_counts.values()) == {1}
+
+
+def test_QuantizationJob___call___09():
+    search_tree = nauert.UnweightedSearchTree()
+    offsets = [(0, 1), (2, 11), (1, 3), (5, 12), (7, 9), (1, 1)]
+    q_event_proxies = make_q_event_proxies(offsets)
+    job = nauert.QuantizationJob(1, search_tree, q_event_proxies)
+    assert job.q_grid_count == 0
+    job()
+    assert job.q_grid_count == len(job.q_grids)
+    for keywords in ({"compact_q_grids": True}, {"retained_q_grid_count": 4}):
+        other_job = nauert.QuantizationJob(1, search_tree, q_event_proxies, **keywords)
+        other_job()
+        assert other_job.q_grid_count == job.q_grid_count
+    best_first_job = nauert.QuantizationJob(
+        1, search_tree, q_event_proxies, best_first=True
+    )
+    best_first_job()
+    assert len(best_first_job.q_grids) < best_first_job.q_grid_count
+    assert best_first_job.q_grid_count <= job.q_grid_count
+    durations = [250, 250, 500, 333, 667, 1000] * 2
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    report = nauert.QuantizationReport()
+    nauert.quantize(q_event_sequence, report=report)
+    for job_handler in (nauert.SerialJobHandler(), nauert.ParallelJobHandler()):
+        retaining_report = nauert.QuantizationReport()
+        nauert.quantize(
+            q_event_sequence,
+            job_handler=job_handler,
+            retained_q_grid_count=1,
+            report=retaining_report,
+        )
+        assert retaining_report.q_grid_counts == report.q_grid_counts
+
+
+def test_QuantizationJob___call___10():
+    # Leaves whose only proxies sit on their offsets are no longer subdivided,
+    # which changes the order of candidates and so breaks this tie of equal
+    # distance and equal offset count differently from before.
+    search_tree = nauert.UnweightedSearchTree()
+    q_event_proxies = make_q_event_proxies([(0, 1), (3, 10)])
+    selected_rtm_format = "(1 (1 (1 (1 1)) 1 1 1))"
+    tied_rtm_format = "(1 ((1 (1 1 1 1 1)) 1))"
+    for compact_q_grids in (False, True):
+        job = nauert.QuantizationJob(
+            1, search_tree, q_event_proxies, compact_q_grids=compact_q_grids
+        )
+        job()
+        rtm_formats = [_.rtm_format() for _ in job.q_grids]
+        selected_q_grid = job.q_grids[rtm_formats.index(selected_rtm_format)]
+        tied_q_grid = job.q_grids[rtm_formats.index(tied_rtm_format)]
+        assert selected_q_grid.distance == tied_q_grid.distance == 0
+        assert len(selected_q_grid.offsets) == len(tied_q_grid.offsets)
+        q_target_beat = nauert.QTargetBeat()
+        q_target_beat._q_grids = job.q_grids
+        nauert.DistanceHeuristic()((q_target_beat,))
+        assert q_target_beat.q_grid.rtm_format() == selected_rtm_format
+        best_first_job = nauert.QuantizationJob(
+            1,
+            search_tree,
+            q_event_proxies,
+            compact_q_grids=compact_q_grids,
+            best_first=True,
+        )
+        best_first_job()
+        assert best_first_job.q_grids[0].rtm_format() == selected_rtm_format
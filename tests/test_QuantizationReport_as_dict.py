@@ -0,0 +1,29 @@
+import json
+
+import abjad
+
+import nauert
+
+
+def test_QuantizationReport_as_dict_01():
+    durations = [20, 230, 250, 500, 333, 667, 1000, 1000, 4000, 125, 875]
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    for q_schema in (nauert.BeatwiseQSchema(), nauert.MeasurewiseQSchema()):
+        string = abjad.lilypond(nauert.quantize(q_event_sequence, q_schema=q_schema))
+        report = nauert.QuantizationReport()
+        for _ in range(2):
+            voice = nauert.quantize(q_event_sequence, q_schema=q_schema, report=report)
+            assert abjad.lilypond(voice) == string
+            dictionary = report.as_dict()
+            assert json.loads(json.dumps(dictionary))["max_q_grid_depth"] == 3
+            stage_times = dictionary["stage_times"]
+            assert all(0 <= _ for _ in stage_times.values())
+            assert 0 < stage_times["search"]
+            assert 0 < stage_times["handle_graces"]
+            assert abs(sum(stage_times.values()) - report.total_time) < 1e-9
+            q_grid_depths = report.q_grid_depths
+            assert list(q_grid_depths) == list(range(len(q_grid_depths)))
+            assert set(report.q_grid_counts) == set(report.q_event_proxy_counts)
+            assert set(report.q_grid_counts) < set(q_grid_depths)
+            assert report.q_event_proxy_counts[0] == 4
+            assert sum(report.q_event_proxy_counts.values()) == len(durations) + 1
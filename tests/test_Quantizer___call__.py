@@ -1,4 +1,5 @@
 import abjad
+import pytest
 
 import nauert
 
@@ -805,3 +806,17 @@ def test_Quantize_16():
         """
     ), print(string)
     assert_q_event_attachments(result, all_attachments[1:])
+
+
+def test_Quantize_17():
+    class FirstQGridHeuristic(nauert.Heuristic):
+        def _process(self, q_target_beats):
+            for q_target_beat in q_target_beats:
+                q_target_beat._q_grid = (q_target_beat.q_grids or [nauert.QGrid()])[0]
+            return q_target_beats
+
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations([500, 500])
+    heuristic = FirstQGridHeuristic()
+    nauert.quantize(q_event_sequence, heuristic=heuristic)
+    with pytest.raises(ValueError):
+        nauert.quantize(q_event_sequence, heuristic=heuristic, retained_q_grid_count=1)
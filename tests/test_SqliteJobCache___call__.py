@@ -0,0 +1,112 @@
+import multiprocessing
+import pickle
+import sqlite3
+import threading
+
+import abjad
+import pytest
+
+import nauert
+from nauert import jobcaches
+
+
+def _quantize(arguments):
+    path, durations = arguments
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations)
+    if path is None:
+        return abjad.lilypond(nauert.quantize(q_event_sequence))
+    with nauert.SqliteJobCache(path) as job_cache:
+        voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+    return abjad.lilypond(voice)
+
+
+def test_SqliteJobCache___call___01(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    durations = [
+        [250, 250, 500, 333, 667, 1000] * 4,
+        [125, 875, 250, 250, 500] * 4,
+        [500, 500, 200, 800] * 4,
+    ] * 2
+    strings = [_quantize((None, _)) for _ in durations[:3]] * 2
+    nauert.SqliteJobCache(path).close()
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(3) as pool:
+        assert pool.map(_quantize, [(path, _) for _ in durations]) == strings
+    job_cache = nauert.SqliteJobCache(path)
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(durations[0])
+    voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+    assert abjad.lilypond(voice) == strings[0]
+    assert job_cache.info()["misses"] == 0
+    assert 0 < job_cache.info()["hits"]
+    job_cache = pickle.loads(pickle.dumps(job_cache))
+    voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+    assert abjad.lilypond(voice) == strings[0]
+    assert job_cache.info()["misses"] == 0
+
+
+def test_SqliteJobCache___call___02(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        [100, 200, 300, 400, 500, 600, 700, 800, 900, 1000]
+    )
+    string = abjad.lilypond(nauert.quantize(q_event_sequence))
+    with nauert.SqliteJobCache(path, maxsize=3) as job_cache:
+        voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+        assert abjad.lilypond(voice) == string
+        assert 3 < job_cache.info()["misses"]
+        assert len(job_cache) == 3
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute("UPDATE metadata SET value = 'x' WHERE name = 'version'")
+    connection.close()
+    with nauert.SqliteJobCache(path) as job_cache:
+        assert len(job_cache) == 0
+        voice = nauert.quantize(q_event_sequence, job_cache=job_cache)
+        assert abjad.lilypond(voice) == string
+        assert len(job_cache) == job_cache.info()["misses"]
+        job_cache.clear()
+        assert job_cache.info() == {
+            "hits": 0,
+            "misses": 0,
+            "maxsize": 65536,
+            "size": 0,
+        }
+
+
+def test_SqliteJobCache___call___03(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.sqlite"
+    connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    connection.execute("CREATE TABLE other (value TEXT)")
+    connection.execute("BEGIN")
+    connection.execute("SELECT * FROM other").fetchall()
+    delays = []
+    sleep = jobcaches.time.sleep
+
+    def record_sleep(delay):
+        delays.append(delay)
+        sleep(delay)
+
+    monkeypatch.setattr(jobcaches.time, "sleep", record_sleep)
+    timer = threading.Timer(0.25, connection.execute, ["COMMIT"])
+    timer.start()
+    try:
+        with nauert.SqliteJobCache(path, timeout=10) as job_cache:
+            assert len(job_cache) == 0
+    finally:
+        timer.join()
+        connection.close()
+    assert delays
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    connection.close()
+
+
+def test_SqliteJobCache___call___04(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.execute("CREATE TABLE other (value TEXT)")
+    connection.execute("BEGIN")
+    connection.execute("SELECT * FROM other").fetchall()
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        nauert.SqliteJobCache(path, timeout=0.1)
+    connection.close()
@@ -0,0 +1,57 @@
+import abjad
+
+import nauert
+
+
+def make_q_event_proxies(offsets):
+    return [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.duration.offset(x, y), [x], index=i),
+            abjad.duration.offset(0),
+            abjad.duration.offset(1),
+        )
+        for i, (x, y) in enumerate(offsets)
+    ]
+
+
+def test_ThreadedJobHandler___call___01():
+    search_tree = nauert.UnweightedSearchTree()
+    offsets = [(0, 1), (1, 5), (1, 3), (1, 2), (3, 4), (5, 6)]
+    q_event_proxies = make_q_event_proxies(offsets)
+    for compact_q_grids in (False, True):
+        a_jobs = nauert.SerialJobHandler()(
+            [
+                nauert.QuantizationJob(
+                    i, search_tree, q_event_proxies[:i], compact_q_grids=compact_q_grids
+                )
+                for i in range(1, 7)
+            ]
+        )
+        jobs = [
+            nauert.QuantizationJob(
+                i, search_tree, q_event_proxies[:i], compact_q_grids=compact_q_grids
+            )
+            for i in range(1, 7)
+        ]
+        b_jobs = nauert.ThreadedJobHandler(4)(jobs)
+        assert b_jobs == jobs
+        for a_job, b_job in zip(a_jobs, b_jobs, strict=True):
+            assert [x.rtm_format() for x in b_job.q_grids] == [
+                x.rtm_format() for x in a_job.q_grids
+            ]
+            assert [x.distance for x in b_job.q_grids] == [
+                x.distance for x in a_job.q_grids
+            ]
+
+
+def test_ThreadedJobHandler___call___02():
+    nauert.QGrid.clear_leaf_offset_cache(maxsize=2)
+    try:
+        sequence = nauert.QEventSequence.from_millisecond_durations(
+            [100, 150, 200, 333, 250, 400, 125, 375, 500, 90, 410, 1000]
+        )
+        a_voice = nauert.quantize(sequence)
+        b_voice = nauert.quantize(sequence, job_handler=nauert.ThreadedJobHandler(8))
+        assert abjad.lilypond(b_voice) == abjad.lilypond(a_voice)
+    finally:
+        nauert.QGrid.clear_leaf_offset_cache(maxsize=4096)
@@ -1,3 +1,5 @@
+import copy
+
 import abjad
 
 import nauert
@@ -66,3 +68,38 @@ def test_UnweightedSearchTree___call___01():
     q_grids = search_tree(q_grid)
     assert q_grids[0].root_node.rtm_format() == "(1 (1 1))"
     assert q_grids[1].root_node.rtm_format() == "(1 (1 1 1 1 1))"
+
+
+def test_UnweightedSearchTree___call___02():
+    definition = {2: {2: None}, 3: None, 5: None}
+    search_tree = nauert.UnweightedSearchTree(definition)
+    q_grid = nauert.QGrid()
+    a = nauert.QEventProxy(
+        nauert.PitchedQEvent(abjad.duration.offset(0), [0], ["A"]),
+        abjad.duration.offset(0),
+    )
+    b = nauert.QEventProxy(
+        nauert.PitchedQEvent(abjad.duration.offset(1, 3), [1], ["B"]),
+        abjad.duration.offset(1, 3),
+    )
+    c = nauert.QEventProxy(
+        nauert.PitchedQEvent(abjad.duration.offset(3, 4), [2], ["C"]),
+        abjad.duration.offset(3, 4),
+    )
+    d = nauert.QEventProxy(
+        nauert.TerminalQEvent(abjad.duration.offset(1)),
+        abjad.duration.offset(1),
+    )
+    q_grid.fit_q_events([a, b, c, d])
+    q_grids = search_tree(q_grid)
+    commands = search_tree._generate_all_subdivision_commands(q_grid)
+    assert len(q_grids) == len(commands) == 3
+    for new_q_grid, command in zip(q_grids, commands, strict=True):
+        expected = copy.deepcopy(q_grid)
+        expected.fit_q_events(expected.subdivide_leaves(command))
+        assert new_q_grid.rtm_format() == expected.rtm_format()
+        for leaf, expected_leaf in zip(new_q_grid.leaves, expected.leaves, strict=True):
+            assert leaf.q_event_proxies == expected_leaf.q_event_proxies
+        proxies = [_ for leaf in new_q_grid.leaves for _ in leaf.q_event_proxies]
+        assert all(any(_ is x for x in (a, b, c, d)) for _ in proxies)
+    assert [_.q_event_proxies for _ in q_grid.leaves] == [[a, b], [c, d]]
@@ -0,0 +1,44 @@
+import pickle
+
+import abjad
+
+import nauert
+
+
+def test_UnweightedSearchTree__get_subdivision_table_01():
+    definition = {2: {2: {2: None}, 3: None}, 5: None}
+    search_tree = nauert.UnweightedSearchTree(definition)
+    subdivisions, child_ratios = search_tree._get_subdivision_table()
+    assert subdivisions == {
+        (): ((1, 1), (1, 1, 1, 1, 1)),
+        (2,): ((1, 1), (1, 1, 1)),
+        (2, 2): ((1, 1),),
+        (2, 2, 2): (),
+        (2, 3): (),
+        (5,): (),
+    }
+    assert child_ratios == {
+        (1, 1): ((1, 2), (1, 2)),
+        (1, 1, 1): ((1, 3), (1, 3), (1, 3)),
+        (1, 1, 1, 1, 1): ((1, 5), (1, 5), (1, 5), (1, 5), (1, 5)),
+    }
+    assert search_tree._get_subdivision_table() is search_tree._get_subdivision_table()
+
+    unpickled = pickle.loads(pickle.dumps(search_tree))
+    assert unpickled == search_tree
+    assert unpickled._subdivision_table is None
+    assert unpickled._get_subdivision_table() == search_tree._get_subdivision_table()
+
+    search_tree = nauert.UnweightedSearchTree(definition, precompiled=True)
+    proxies = [
+        nauert.QEventProxy(
+            nauert.SilentQEvent(abjad.duration.offset(x, 5), [x]),
+            abjad.duration.offset(x, 5),
+        )
+        for x in (0, 2, 5)
+    ]
+    search_tree(nauert.CompactQGrid(proxies))
+    assert search_tree._grid_dictionary
+    unpickled = pickle.loads(pickle.dumps(search_tree))
+    assert unpickled.precompiled
+    assert unpickled._grid_dictionary == {}
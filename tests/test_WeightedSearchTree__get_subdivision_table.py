@@ -0,0 +1,22 @@
+import nauert
+
+
+def test_WeightedSearchTree__get_subdivision_table_01():
+    definition = {"divisors": (2, 3), "max_depth": 2, "max_divisions": 2}
+    search_tree = nauert.WeightedSearchTree(definition)
+    subdivisions, child_ratios = search_tree._get_subdivision_table()
+    compositions = ((1, 1), (2, 1), (1, 2))
+    assert subdivisions == {
+        (): compositions,
+        (2,): compositions,
+        (3,): compositions,
+        (2, 2): (),
+        (2, 3): (),
+        (3, 2): (),
+        (3, 3): (),
+    }
+    assert child_ratios == {
+        (1, 1): ((1, 2), (1, 2)),
+        (2, 1): ((2, 3), (1, 3)),
+        (1, 2): ((1, 3), (2, 3)),
+    }
@@ -0,0 +1,63 @@
+import asyncio
+import concurrent.futures
+
+import abjad
+import pytest
+
+import nauert
+
+
+def test_quantize_async_01():
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        [100, 150, 200, 333, 250, 400, 125, 375, 500, 90, 410, 1000]
+    )
+    q_schemas = [nauert.BeatwiseQSchema(), nauert.MeasurewiseQSchema()]
+    strings = [
+        abjad.lilypond(nauert.quantize(q_event_sequence, q_schema=_)) for _ in q_schemas
+    ]
+
+    async def main(executor):
+        return await asyncio.gather(
+            *[
+                nauert.quantize_async(q_event_sequence, q_schema=_, executor=executor)
+                for _ in q_schemas
+            ]
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        results = asyncio.run(main(executor))
+    assert [abjad.lilypond(_) for _ in results] == strings
+
+
+def test_quantize_async_02():
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        [100, 150, 200, 333, 250, 400, 125, 375] * 8
+    )
+
+    async def main(executor):
+        task = asyncio.create_task(
+            nauert.quantize_async(q_event_sequence, executor=executor)
+        )
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        asyncio.run(main(executor))
+
+
+def test_quantize_async_03():
+    q_event_sequence = nauert.QEventSequence.from_millisecond_durations(
+        [100, 150, 200, 333, 250, 400, 125, 375, 500, 90, 410, 1000]
+    )
+    report = nauert.QuantizationReport()
+    string = abjad.lilypond(nauert.quantize(q_event_sequence, report=report))
+    async_report = nauert.QuantizationReport()
+    result = asyncio.run(nauert.quantize_async(q_event_sequence, report=async_report))
+    assert abjad.lilypond(result) == string
+    assert async_report.q_event_proxy_counts == report.q_event_proxy_counts
+    assert async_report.q_grid_counts == report.q_grid_counts
+    assert async_report.q_grid_depths == report.q_grid_depths
+    assert 0 < async_report.stage_times["search"]
+    assert 0 < async_report.stage_times["notate"]